@@ -5,9 +5,56 @@ import datetime
 import html
 from difflib import SequenceMatcher
 import glob
+import argparse
+import codecs
+import csv
+import hashlib
+import os
+import pickle
+import random
+import time
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 
 BATAS_KEMIRIPAN = 0.65
 
+# --- PARAMETER INDEKS MINHASH/LSH ---
+# 40 band x 3 baris -> ambang Jaccard kira-kira (1/40)^(1/3) ~ 0.29, cukup rendah
+# agar pasangan dengan rasio SequenceMatcher >= BATAS_KEMIRIPAN tetap jadi kandidat.
+UKURAN_SHINGLE = 5
+JUMLAH_BAND = 40
+BARIS_PER_BAND = 3
+JUMLAH_HASH = JUMLAH_BAND * BARIS_PER_BAND
+SEED_MINHASH = 2024
+_PRIMA_MERSENNE = np.uint64((1 << 61) - 1)
+_MASK_32 = np.uint64(0xFFFFFFFF)
+
+# --- CACHE INKREMENTAL ---
+FILE_CACHE = '.cache_komparasi.pkl'
+VERSI_CACHE = 3
+
+# --- FORMAT HASIL ---
+FORMAT_HASIL = ('teks', 'jsonl', 'csv', 'parquet')
+EKSTENSI_HASIL = {'teks': 'txt', 'jsonl': 'jsonl', 'csv': 'csv', 'parquet': 'parquet'}
+UKURAN_BATCH_TULIS = 5000
+PANJANG_CUPLIKAN = 200
+# Kolom tetap hasil terstruktur (nama, tipe Arrow): header CSV dan skema Parquet tidak bergantung pada isi batch
+KOLOM_HASIL = (
+    ('nomor', 'int64'), ('tanggal', 'int64'), ('tanggal_baca', 'string'),
+    ('jumlah_dalam_kelompok', 'int64'), ('semua_tanggal', 'string'), ('teks_asli', 'string'),
+    ('skor_kemiripan', 'float64'), ('id_blogger_terdekat', 'int64'), ('cuplikan_blogger_terdekat', 'string'),
+)
+
+# --- PEMBACA JSON STREAMING ---
+UKURAN_BACA = 1 << 20
+
+# --- EKSEKUSI PARALEL ---
+UKURAN_CHUNK = 200
+
 def cari_file_xml():
     file_xml = glob.glob('Blogger/Blogs/**/*.xml', recursive=True)
     file_xml.extend(glob.glob('Blogger/Blogs/**/*.atom', recursive=True))
@@ -16,7 +63,52 @@ def cari_file_xml():
 def cari_file_json():
     return glob.glob('Facebook/**/your_posts_*.json', recursive=True)
 
+class _TabelNormalisasi(dict):
+    """Tabel str.translate yang diisi saat karakter pertama kali ditemui.
+
+    Huruf dijadikan huruf kecil, angka dan tanda diakritik dipertahankan,
+    spasi/baris baru jadi spasi, tanda baca dan simbol lainnya dibuang.
+    """
+
+    def __missing__(self, kode):
+        karakter = chr(kode)
+        kategori = unicodedata.category(karakter)[0]
+        if kategori == 'L':
+            hasil = karakter.lower()
+        elif kategori in 'NM':
+            hasil = karakter
+        elif kategori == 'Z' or karakter.isspace():
+            hasil = ' '
+        else:
+            hasil = None
+        self[kode] = hasil
+        return hasil
+
+_TABEL_NORMALISASI = _TabelNormalisasi()
+_POLA_TAG = re.compile(r'<[^>]+>')
+
+def _perbaiki_mojibake(teks):
+    # Ekspor Facebook menyimpan UTF-8 sebagai karakter latin-1 ("Ã©" untuk "é")
+    try:
+        return teks.encode('latin-1').decode('utf-8')
+    except UnicodeError:
+        return teks
+
 def bersihkan_teks(teks):
+    # Sengaja per teks: biaya translate sebanding jumlah karakter, bukan jumlah panggilan, sehingga
+    # menggabung satu batch lalu memecahnya lagi hanya ~4% lebih cepat dan memutus pembacaan streaming
+    if not teks:
+        return ""
+    if not teks.isascii():
+        teks = _perbaiki_mojibake(teks)
+    if '&' in teks:
+        teks = html.unescape(teks)
+    if '<' in teks:
+        teks = _POLA_TAG.sub(' ', teks)
+    return ' '.join(teks.translate(_TABEL_NORMALISASI).split())
+
+def bersihkan_teks_ascii(teks):
+    # Normalisasi lama (hanya a-z0-9), disimpan sebagai pembanding benchmark
     if not teks:
         return ""
     teks = html.unescape(teks)
@@ -26,71 +118,592 @@ def bersihkan_teks(teks):
     teks = re.sub(r'\s+', ' ', teks).strip()
     return teks
 
+def benchmark_normalisasi(daftar_teks, ulang=3):
+    """Membandingkan waktu bersihkan_teks dengan normalisasi lama pada korpus yang sama."""
+    total_karakter = sum(len(teks) for teks in daftar_teks)
+    print(f"--> Benchmark normalisasi: {len(daftar_teks)} teks, {total_karakter} karakter, {ulang}x ulang")
+    for nama, fungsi in (('lama (ascii)', lambda daftar: [bersihkan_teks_ascii(t) for t in daftar]),
+                         ('baru (unicode)', lambda daftar: [bersihkan_teks(t) for t in daftar])):
+        terbaik = min(_ukur_waktu(fungsi, daftar_teks) for _ in range(ulang))
+        print(f"--> {nama:<15}: {terbaik:.3f} detik ({len(daftar_teks) / terbaik:.0f} teks/detik)")
+
+    hasil_lama = [bersihkan_teks_ascii(t) for t in daftar_teks]
+    hasil_baru = [bersihkan_teks(t) for t in daftar_teks]
+    lolos_lama = sum(1 for t in hasil_lama if len(t) > 10)
+    lolos_baru = sum(1 for t in hasil_baru if len(t) > 10)
+    print(f"--> Teks lolos batas panjang: lama {lolos_lama}, baru {lolos_baru}")
+
+def _ukur_waktu(fungsi, *args):
+    waktu_mulai = time.perf_counter()
+    fungsi(*args)
+    return time.perf_counter() - waktu_mulai
+
+# Entry Blogger yang dianggap postingan. Entry tanpa penanda jenis tetap diproses.
+JENIS_ENTRY_BLOGGER = {'post'}
+
+def _nama_lokal(tag):
+    return tag.rsplit('}', 1)[-1]
+
+def _jenis_entry(entry):
+    for child in entry:
+        nama = _nama_lokal(child.tag)
+        # Ekspor lama: <category scheme="...#kind" term=".../kind#post"/>
+        if nama == 'category' and child.get('scheme', '').endswith('#kind'):
+            return child.get('term', '').rsplit('#', 1)[-1].lower()
+        # Ekspor Takeout: <blogger:type>POST</blogger:type>
+        if nama == 'type' and child.text:
+            return child.text.strip().lower()
+    return None
+
+def iter_konten_blogger(nama_file):
+    """Membaca ekspor Blogger secara streaming dan menghasilkan teks bersih tiap postingan."""
+    konteks = ET.iterparse(nama_file, events=('start', 'end'))
+    _, root = next(konteks)
+    for event, elem in konteks:
+        if event != 'end' or _nama_lokal(elem.tag) != 'entry':
+            continue
+
+        jenis = _jenis_entry(elem)
+        if jenis is None or jenis in JENIS_ENTRY_BLOGGER:
+            for child in elem.iter():
+                if _nama_lokal(child.tag) == 'content':
+                    konten_kotor = "".join(child.itertext())
+                    if konten_kotor:
+                        teks_bersih = bersihkan_teks(konten_kotor)
+                        if len(teks_bersih) > 10:
+                            yield teks_bersih
+                    break
+
+        # Buang entry yang sudah diproses agar memori tidak ikut membesar
+        elem.clear()
+        root.clear()
+
 def muat_data_blogger(daftar_file):
     teks_blogger = []
     for nama_file in daftar_file:
         print(f"--> Membaca data Blogger dari: {nama_file}")
         try:
-            tree = ET.parse(nama_file)
-            root = tree.getroot()
-            
-            for entry in root.iter():
-                if entry.tag.endswith('entry'):
-                    for child in entry.iter():
-                        if child.tag.endswith('content'):
-                            konten_kotor = "".join(child.itertext())
-                            if konten_kotor:
-                                teks_bersih = bersihkan_teks(konten_kotor)
-                                if len(teks_bersih) > 10:
-                                    teks_blogger.append(teks_bersih)
-                            break
+            teks_blogger.extend(iter_konten_blogger(nama_file))
         except Exception as e:
             print(f"--> Error membaca XML Blogger {nama_file}: {e}")
     return teks_blogger
 
+def iter_item_array_json(nama_file, ukuran_baca=UKURAN_BACA):
+    """Membaca array JSON tingkat atas per elemen tanpa memuat seluruh file.
+
+    Menghasilkan (item, offset_byte, panjang_byte) sehingga item bisa dibaca ulang
+    langsung dari file dengan seek.
+    """
+    decoder = json.JSONDecoder()
+    pengurai = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, posisi_byte, habis = '', 0, 0, False
+
+    with open(nama_file, 'rb') as f:
+        def isi_ulang():
+            nonlocal buffer, pos, habis
+            potongan = f.read(ukuran_baca)
+            habis = not potongan
+            buffer = buffer[pos:] + pengurai.decode(potongan, final=habis)
+            pos = 0
+
+        def karakter_berikut():
+            # Lewati spasi; semua karakter spasi JSON berukuran 1 byte
+            nonlocal pos, posisi_byte
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                    posisi_byte += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if habis:
+                    return ''
+                isi_ulang()
+
+        if karakter_berikut() == '\ufeff':
+            pos += 1
+            posisi_byte += 3
+        if karakter_berikut() != '[':
+            raise ValueError("isi file bukan array JSON")
+        pos += 1
+        posisi_byte += 1
+
+        perlu_koma = setelah_koma = False
+        while True:
+            karakter = karakter_berikut()
+            if karakter == ']':
+                if setelah_koma:
+                    raise json.JSONDecodeError("koma berlebih sebelum ']'", buffer, pos)
+                return
+            if karakter == '':
+                raise ValueError("array JSON tidak lengkap")
+            if perlu_koma:
+                if karakter != ',':
+                    raise ValueError(f"pemisah array tidak valid di byte {posisi_byte}")
+                pos += 1
+                posisi_byte += 1
+                perlu_koma, setelah_koma = False, True
+                continue
+
+            while True:
+                try:
+                    item, akhir = decoder.raw_decode(buffer, pos)
+                    # Objek, array dan string selesai di penutupnya. Angka/literal bisa saja terpotong
+                    # di ujung buffer ("1." dari "1.5e10" terbaca 1), jadi baru diterima bila sudah
+                    # diikuti pemisah atau file habis
+                    if buffer[pos] in '{["' or habis or (akhir < len(buffer) and buffer[akhir] in ' \t\r\n,]'):
+                        break
+                except json.JSONDecodeError:
+                    if habis:
+                        raise
+                isi_ulang()
+
+            panjang = len(buffer[pos:akhir].encode('utf-8'))
+            yield item, posisi_byte, panjang
+            pos = akhir
+            posisi_byte += panjang
+            perlu_koma, setelah_koma = True, False
+
+def iter_postingan_facebook(nama_file):
+    """Menghasilkan postingan FB yang lolos filter; teks asli diganti referensi lokasi di file."""
+    for item, offset, panjang in iter_item_array_json(nama_file):
+        judul_aktivitas = item.get('title', '').lower()
+        if 'mengomentari' in judul_aktivitas or 'membalas' in judul_aktivitas:
+            continue
+
+        if 'data' in item:
+            for urutan, d in enumerate(item['data']):
+                if 'post' in d and isinstance(d['post'], str):
+                    teks_bersih = bersihkan_teks(d['post'])
+                    if len(teks_bersih) > 10: 
+                        yield {
+                            'teks_bersih': teks_bersih,
+                            'tanggal': item.get('timestamp', 0),
+                            'sumber': (nama_file, offset, panjang, urutan)
+                        }
+
 def muat_data_facebook(daftar_file):
     postingan_fb = []
     for nama_file in daftar_file:
         print(f"--> Membaca data Facebook dari: {nama_file}")
         try:
-            with open(nama_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            for item in data:
-                judul_aktivitas = item.get('title', '').lower()
-                if 'mengomentari' in judul_aktivitas or 'membalas' in judul_aktivitas:
-                    continue
-
-                if 'data' in item:
-                    for d in item['data']:
-                        if 'post' in d and isinstance(d['post'], str):
-                            teks_asli = d['post']
-                            teks_bersih = bersihkan_teks(teks_asli)
-                            
-                            if len(teks_bersih) > 10: 
-                                postingan_fb.append({
-                                    'teks_asli': teks_asli,
-                                    'teks_bersih': teks_bersih,
-                                    'tanggal': item.get('timestamp', 0) 
-                                })
+            postingan_fb.extend(iter_postingan_facebook(nama_file))
         except Exception as e:
             print(f"--> Error membaca JSON Facebook {nama_file}: {e}")
     return postingan_fb
 
-def periksa_kemiripan(teks_fb, daftar_teks_blogger):
+def lengkapi_teks_asli(daftar_postingan):
+    """Mengisi 'teks_asli' dengan membaca ulang item JSON sumbernya, tiap file dibuka sekali."""
+    per_file = defaultdict(list)
+    for postingan in daftar_postingan:
+        if 'teks_asli' not in postingan:
+            per_file[postingan['sumber'][0]].append(postingan)
+
+    for nama_file, daftar in per_file.items():
+        daftar.sort(key=lambda p: p['sumber'][1])
+        with open(nama_file, 'rb') as f:
+            for postingan in daftar:
+                _, offset, panjang, urutan = postingan['sumber']
+                f.seek(offset)
+                item = json.loads(f.read(panjang))
+                postingan['teks_asli'] = item['data'][urutan]['post']
+
+def lolos_batas_panjang(panjang_a, panjang_b):
+    # Sama dengan real_quick_ratio: jumlah karakter cocok tidak mungkin melebihi teks terpendek
+    return 2.0 * min(panjang_a, panjang_b) / (panjang_a + panjang_b) >= BATAS_KEMIRIPAN
+
+def periksa_kemiripan(teks_fb, daftar_teks_blogger, statistik=None):
+    if statistik is None:
+        statistik = Counter()
     for teks_blog in daftar_teks_blogger:
         if not teks_blog or not teks_fb:
             continue
             
         if teks_fb in teks_blog or teks_blog in teks_fb:
             return True
-            
-        rasio = SequenceMatcher(None, teks_fb, teks_blog).ratio()
-        if rasio >= BATAS_KEMIRIPAN:
+
+        # Penyaring murah berupa batas atas ratio(), jadi tidak pernah menolak pasangan yang lolos
+        if not lolos_batas_panjang(len(teks_fb), len(teks_blog)):
+            statistik['batas_panjang'] += 1
+            continue
+        pembanding = SequenceMatcher(None, teks_fb, teks_blog)
+        if pembanding.quick_ratio() < BATAS_KEMIRIPAN:
+            statistik['quick_ratio'] += 1
+            continue
+
+        statistik['ratio'] += 1
+        if pembanding.ratio() >= BATAS_KEMIRIPAN:
             return True
     return False
 
-def jalankan_komparasi():
+class PemeriksaBrute:
+    """Mode brute: setiap pasangan diperiksa lewat periksa_kemiripan (batas panjang, quick_ratio, lalu ratio)."""
+
+    def __init__(self, daftar_teks_blogger):
+        self.daftar_teks = list(daftar_teks_blogger)
+
+    def periksa(self, teks_fb, statistik=None):
+        return periksa_kemiripan(teks_fb, self.daftar_teks, statistik)
+
+def cetak_statistik_penyaring(statistik):
+    print(f"--> Penyaring: {statistik['batas_panjang']} pasangan ditolak batas panjang, "
+          f"{statistik['quick_ratio']} ditolak quick_ratio, "
+          f"{statistik['ratio']} dihitung ratio() penuh.")
+
+def buat_shingle(teks, k=UKURAN_SHINGLE):
+    if len(teks) <= k:
+        return {teks}
+    return {teks[i:i + k] for i in range(len(teks) - k + 1)}
+
+class IndeksLSH:
+    """Indeks MinHash + LSH atas teks Blogger yang sudah dibersihkan.
+
+    Indeks hanya menyaring kandidat; keputusan akhir tetap memakai uji substring
+    dan SequenceMatcher dengan BATAS_KEMIRIPAN seperti periksa_kemiripan.
+    """
+
+    def __init__(self, daftar_teks_blogger, jumlah_band=JUMLAH_BAND, baris_per_band=BARIS_PER_BAND, seed=SEED_MINHASH):
+        self.daftar_teks = list(daftar_teks_blogger)
+        self.jumlah_band = jumlah_band
+        self.baris_per_band = baris_per_band
+        jumlah_hash = jumlah_band * baris_per_band
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=jumlah_hash, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=jumlah_hash, dtype=np.uint64)
+
+        self._ember = [defaultdict(list) for _ in range(jumlah_band)]
+        # Indeks terbalik shingle -> id postingan, untuk kasus teks FB termuat utuh di Blogger
+        self._posting = defaultdict(list)
+        # Satu shingle "jangkar" (paling jarang) per postingan, untuk kasus teks Blogger termuat di FB
+        self._jangkar = defaultdict(list)
+
+        daftar_shingle = []
+        for idx, teks in enumerate(self.daftar_teks):
+            shingle = buat_shingle(teks)
+            daftar_shingle.append(shingle)
+            for s in shingle:
+                self._posting[s].append(idx)
+            for band, kunci in enumerate(self._kunci_band(shingle)):
+                self._ember[band][kunci].append(idx)
+
+        for idx, shingle in enumerate(daftar_shingle):
+            jangkar = min(shingle, key=lambda s: len(self._posting[s]))
+            self._jangkar[jangkar].append(idx)
+
+    def _signature(self, shingle):
+        nilai = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle), dtype=np.uint64, count=len(shingle))
+        hasil = (np.outer(self._a, nilai) + self._b[:, None]) % _PRIMA_MERSENNE & _MASK_32
+        return hasil.min(axis=1)
+
+    def _kunci_band(self, shingle):
+        sig = self._signature(shingle)
+        r = self.baris_per_band
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.jumlah_band)]
+
+    def kandidat(self, teks_fb):
+        """Mengembalikan (kandidat_substring, kandidat_fuzzy) berupa daftar id postingan Blogger."""
+        shingle = buat_shingle(teks_fb)
+
+        substring = set()
+        terjarang = min(shingle, key=lambda s: len(self._posting.get(s, ())))
+        substring.update(self._posting.get(terjarang, ()))
+        for s in shingle:
+            substring.update(self._jangkar.get(s, ()))
+
+        skor = defaultdict(int)
+        for band, kunci in enumerate(self._kunci_band(shingle)):
+            for idx in self._ember[band].get(kunci, ()):
+                skor[idx] += 1
+        # Band yang cocok paling banyak -> perkiraan Jaccard tertinggi -> diverifikasi lebih dulu
+        fuzzy = sorted(skor, key=skor.get, reverse=True)
+        return substring, fuzzy
+
+    def iter_cocok(self, teks_fb, statistik=None):
+        """Menghasilkan id postingan yang lolos verifikasi, substring lebih dulu (id bisa berulang)."""
+        if statistik is None:
+            statistik = Counter()
+        if not teks_fb:
+            return
+        substring, fuzzy = self.kandidat(teks_fb)
+        for idx in substring:
+            statistik['substring'] += 1
+            teks_blog = self.daftar_teks[idx]
+            if teks_fb in teks_blog or teks_blog in teks_fb:
+                yield idx
+        for idx in fuzzy:
+            teks_blog = self.daftar_teks[idx]
+            if not lolos_batas_panjang(len(teks_fb), len(teks_blog)):
+                statistik['batas_panjang'] += 1
+                continue
+            pembanding = SequenceMatcher(None, teks_fb, teks_blog)
+            if pembanding.quick_ratio() < BATAS_KEMIRIPAN:
+                statistik['quick_ratio'] += 1
+                continue
+            statistik['ratio'] += 1
+            if pembanding.ratio() >= BATAS_KEMIRIPAN:
+                yield idx
+
+    def periksa(self, teks_fb, statistik=None):
+        return next(self.iter_cocok(teks_fb, statistik), None) is not None
+
+    def skor_terbaik(self, teks_fb):
+        """Mengembalikan (id, skor) kandidat Blogger paling mirip; skor 1.0 berarti saling termuat."""
+        if not teks_fb:
+            return None, 0.0
+        substring, fuzzy = self.kandidat(teks_fb)
+        for idx in substring:
+            teks_blog = self.daftar_teks[idx]
+            if teks_fb in teks_blog or teks_blog in teks_fb:
+                return idx, 1.0
+
+        terbaik_id, terbaik_skor = None, 0.0
+        for idx in fuzzy:
+            teks_blog = self.daftar_teks[idx]
+            if 2.0 * min(len(teks_fb), len(teks_blog)) / (len(teks_fb) + len(teks_blog)) <= terbaik_skor:
+                continue
+            pembanding = SequenceMatcher(None, teks_fb, teks_blog)
+            if pembanding.quick_ratio() <= terbaik_skor:
+                continue
+            rasio = pembanding.ratio()
+            if rasio > terbaik_skor:
+                terbaik_id, terbaik_skor = idx, rasio
+        return terbaik_id, terbaik_skor
+
+def evaluasi_recall(daftar_fb, daftar_blogger, indeks, jumlah_sampel, seed=SEED_MINHASH):
+    """Membandingkan hasil indeks LSH dengan jalur brute-force pada sampel postingan FB."""
+    sampel = random.Random(seed).sample(daftar_fb, min(jumlah_sampel, len(daftar_fb)))
+    print(f"--> Evaluasi recall LSH terhadap brute-force pada {len(sampel)} postingan...")
+
+    waktu_mulai = time.perf_counter()
+    hasil_brute = [periksa_kemiripan(fb['teks_bersih'], daftar_blogger) for fb in sampel]
+    durasi_brute = time.perf_counter() - waktu_mulai
+
+    waktu_mulai = time.perf_counter()
+    hasil_lsh = [indeks.periksa(fb['teks_bersih']) for fb in sampel]
+    durasi_lsh = time.perf_counter() - waktu_mulai
+
+    cocok_brute = sum(hasil_brute)
+    cocok_keduanya = sum(1 for b, l in zip(hasil_brute, hasil_lsh) if b and l)
+    recall = cocok_keduanya / cocok_brute if cocok_brute else 1.0
+
+    print(f"--> Cocok (brute-force): {cocok_brute}, cocok (LSH): {sum(hasil_lsh)}")
+    print(f"--> Recall LSH: {recall:.2%}")
+    print(f"--> Waktu brute-force: {durasi_brute:.2f} detik, LSH: {durasi_lsh:.2f} detik")
+    return recall
+
+# Indeks Blogger milik tiap worker, diisi sekali oleh initializer pool
+_KONTEKS_WORKER = {}
+
+def _inisialisasi_worker(indeks):
+    _KONTEKS_WORKER['indeks'] = indeks
+
+def _periksa_chunk(awal, daftar_teks):
+    waktu_mulai = time.perf_counter()
+    indeks = _KONTEKS_WORKER['indeks']
+    statistik = Counter()
+    hasil = [indeks.periksa(teks, statistik) for teks in daftar_teks]
+    return awal, hasil, statistik, os.getpid(), time.perf_counter() - waktu_mulai
+
+def periksa_semua(daftar_teks, indeks, jumlah_worker=1, ukuran_chunk=UKURAN_CHUNK, statistik=None):
+    """Memeriksa banyak teks FB sekaligus; hasil selalu berurutan sesuai daftar_teks."""
+    if jumlah_worker < 1 or ukuran_chunk < 1:
+        raise ValueError("jumlah_worker dan ukuran_chunk harus bilangan bulat positif.")
+    if statistik is None:
+        statistik = Counter()
+    if jumlah_worker == 1 or len(daftar_teks) <= ukuran_chunk:
+        return [indeks.periksa(teks, statistik) for teks in daftar_teks]
+
+    hasil = [None] * len(daftar_teks)
+    laju_worker = defaultdict(lambda: [0, 0.0])
+
+    print(f"--> Memakai {jumlah_worker} worker, {ukuran_chunk} postingan per chunk...")
+    # Indeks hanya dikirim sekali per worker lewat initializer, bukan per tugas
+    with ProcessPoolExecutor(max_workers=jumlah_worker, initializer=_inisialisasi_worker, initargs=(indeks,)) as pool:
+        tugas = [pool.submit(_periksa_chunk, awal, daftar_teks[awal:awal + ukuran_chunk])
+                 for awal in range(0, len(daftar_teks), ukuran_chunk)]
+        for selesai in as_completed(tugas):
+            awal, hasil_chunk, statistik_chunk, pid, durasi = selesai.result()
+            hasil[awal:awal + len(hasil_chunk)] = hasil_chunk
+            statistik.update(statistik_chunk)
+            laju_worker[pid][0] += len(hasil_chunk)
+            laju_worker[pid][1] += durasi
+
+    for pid, (jumlah, durasi) in sorted(laju_worker.items()):
+        laju = jumlah / durasi if durasi > 0 else 0
+        print(f"--> Worker {pid}: {jumlah} postingan dalam {durasi:.2f} detik ({laju:.1f} postingan/detik)")
+    return hasil
+
+def sidik_file(nama_file):
+    info = os.stat(nama_file)
+    return (info.st_mtime_ns, info.st_size)
+
+def cache_kosong():
+    return {'versi': VERSI_CACHE, 'blogger': {}, 'facebook': {}, 'kunci_vonis': None, 'vonis': {}, 'kelompok': None}
+
+def muat_cache(nama_cache=FILE_CACHE, rebuild=False):
+    if rebuild or not os.path.exists(nama_cache):
+        return cache_kosong()
+    try:
+        with open(nama_cache, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get('versi') == VERSI_CACHE:
+            return cache
+        print("--> Versi cache berbeda, cache dibangun ulang.")
+    except Exception as e:
+        print(f"--> Cache tidak bisa dibaca ({e}), cache dibangun ulang.")
+    return cache_kosong()
+
+def simpan_cache(cache, nama_cache=FILE_CACHE):
+    # Tulis ke file sementara dulu agar cache tidak rusak bila proses terhenti
+    nama_sementara = nama_cache + '.tmp'
+    with open(nama_sementara, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(nama_sementara, nama_cache)
+
+def muat_dengan_cache(daftar_file, cache_file, pemuat):
+    """Memakai hasil bersihkan_teks dari cache untuk file yang path, mtime dan ukurannya sama."""
+    hasil = []
+    for nama_file in daftar_file:
+        sidik = sidik_file(nama_file)
+        entri = cache_file.get(nama_file)
+        if entri is None or entri['sidik'] != sidik:
+            entri = {'sidik': sidik, 'isi': pemuat([nama_file])}
+            cache_file[nama_file] = entri
+        hasil.extend(entri['isi'])
+
+    # File yang sudah tidak ada ikut dibuang dari cache
+    for nama_file in set(cache_file) - set(daftar_file):
+        del cache_file[nama_file]
+    return hasil
+
+def kunci_postingan(teks_bersih):
+    return hashlib.sha1(teks_bersih.encode('utf-8')).hexdigest()
+
+def _cari_akar(induk, kunci):
+    while induk[kunci] != kunci:
+        induk[kunci] = induk[induk[kunci]]
+        kunci = induk[kunci]
+    return kunci
+
+def kelompokkan_postingan(daftar_postingan, cache_kelompok=None):
+    """Mengelompokkan postingan FB yang mirip satu sama lain (repost, suntingan, ekspor ganda).
+
+    Pasangan mirip dicari lewat IndeksLSH atas postingan itu sendiri dengan kriteria
+    yang sama seperti komparasi Blogger, ditambah syarat batas panjang agar kalimat
+    pendek yang termuat di banyak postingan tidak merangkai semuanya jadi satu
+    kelompok. Sisi yang sudah ditemukan disimpan di
+    cache_kelompok, jadi pada run berikutnya hanya postingan baru yang dicari.
+    Mengembalikan daftar kelompok (list postingan) sesuai urutan kemunculan.
+    """
+    if cache_kelompok is None:
+        cache_kelompok = {'diproses': set(), 'sisi': set()}
+
+    kunci_semua = [kunci_postingan(p['teks_bersih']) for p in daftar_postingan]
+    kunci_unik = list(dict.fromkeys(kunci_semua))
+    teks_per_kunci = {k: p['teks_bersih'] for k, p in zip(kunci_semua, daftar_postingan)}
+    ada = set(kunci_unik)
+
+    kunci_baru = [k for k in kunci_unik if k not in cache_kelompok['diproses']]
+    print(f"--> Pengelompokan: {len(kunci_unik) - len(kunci_baru)} teks dari cache, {len(kunci_baru)} teks baru dicari pasangannya.")
+
+    sisi = {s for s in cache_kelompok['sisi'] if s[0] in ada and s[1] in ada}
+    if kunci_baru:
+        indeks = IndeksLSH([teks_per_kunci[k] for k in kunci_unik])
+        for kunci in kunci_baru:
+            teks = teks_per_kunci[kunci]
+            for idx in indeks.iter_cocok(teks):
+                pasangan = kunci_unik[idx]
+                if pasangan != kunci and lolos_batas_panjang(len(teks), len(indeks.daftar_teks[idx])):
+                    sisi.add((min(kunci, pasangan), max(kunci, pasangan)))
+
+    cache_kelompok['diproses'] = ada
+    cache_kelompok['sisi'] = sisi
+
+    induk = {k: k for k in kunci_unik}
+    for a, b in sisi:
+        akar_a, akar_b = _cari_akar(induk, a), _cari_akar(induk, b)
+        if akar_a != akar_b:
+            induk[akar_b] = akar_a
+
+    kelompok = {}
+    for kunci, postingan in zip(kunci_semua, daftar_postingan):
+        kelompok.setdefault(_cari_akar(induk, kunci), []).append(postingan)
+    return list(kelompok.values())
+
+def wakil_kelompok(anggota):
+    # Teks terpanjang, biasanya versi paling lengkap
+    return max(anggota, key=lambda p: len(p['teks_bersih']))
+
+def format_tanggal(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+def tulis_laporan_kelompok(file_hasil, daftar_kelompok):
+    with open(file_hasil, 'w', encoding='utf-8') as file_out:
+        for index, anggota in enumerate(daftar_kelompok, 1):
+            wakil = wakil_kelompok(anggota)
+            semua_tanggal = sorted(p['tanggal'] for p in anggota)
+            file_out.write(f"[{index}] Tanggal Asli FB: {format_tanggal(wakil['tanggal'])}\n")
+            file_out.write(f"Jumlah Dalam Kelompok: {len(anggota)}\n")
+            if len(anggota) > 1:
+                daftar_tanggal = ", ".join(format_tanggal(t) for t in semua_tanggal)
+                file_out.write(f"Semua Tanggal FB: {daftar_tanggal}\n")
+            file_out.write(f"Teks Postingan:\n{wakil['teks_asli']}\n")
+            file_out.write("-" * 50 + "\n\n")
+
+def iter_baris_hasil(daftar_kelompok, indeks):
+    """Baris hasil terstruktur: satu per kelompok (atau per postingan bila tidak dikelompokkan)."""
+    for nomor, anggota in enumerate(daftar_kelompok, 1):
+        wakil = wakil_kelompok(anggota)
+        idx_blogger, skor = indeks.skor_terbaik(wakil['teks_bersih'])
+        yield {
+            'nomor': nomor,
+            'tanggal': wakil['tanggal'],
+            'tanggal_baca': format_tanggal(wakil['tanggal']),
+            'jumlah_dalam_kelompok': len(anggota),
+            'semua_tanggal': ";".join(str(t) for t in sorted(p['tanggal'] for p in anggota)),
+            'teks_asli': wakil['teks_asli'],
+            'skor_kemiripan': round(skor, 4),
+            'id_blogger_terdekat': idx_blogger,
+            'cuplikan_blogger_terdekat': indeks.daftar_teks[idx_blogger][:PANJANG_CUPLIKAN] if idx_blogger is not None else '',
+        }
+
+def _iter_batch(iterable, ukuran=UKURAN_BATCH_TULIS):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= ukuran:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def tulis_hasil_terstruktur(file_hasil, format_hasil, baris_iter):
+    """Menulis hasil sebagai JSONL, CSV atau Parquet per batch UKURAN_BATCH_TULIS baris."""
+    if format_hasil == 'jsonl':
+        with open(file_hasil, 'w', encoding='utf-8') as file_out:
+            for batch in _iter_batch(baris_iter):
+                file_out.write("".join(json.dumps(baris, ensure_ascii=False) + "\n" for baris in batch))
+
+    elif format_hasil == 'csv':
+        with open(file_hasil, 'w', encoding='utf-8', newline='') as file_out:
+            # Header selalu ditulis, juga bila tidak ada baris hasil
+            penulis = csv.DictWriter(file_out, fieldnames=[nama for nama, _ in KOLOM_HASIL])
+            penulis.writeheader()
+            for batch in _iter_batch(baris_iter):
+                penulis.writerows(batch)
+
+    elif format_hasil == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Skema tetap, agar batch pertama yang kolomnya kosong semua tidak menentukan tipe
+        skema = pa.schema([(nama, pa.type_for_alias(tipe)) for nama, tipe in KOLOM_HASIL])
+        with pq.ParquetWriter(file_hasil, skema) as penulis:
+            for batch in _iter_batch(baris_iter):
+                penulis.write_table(pa.Table.from_pylist(batch, schema=skema))
+
+def jalankan_komparasi(mode='lsh', sampel_recall=0, rebuild=False, jumlah_worker=1, ukuran_chunk=UKURAN_CHUNK,
+                       benchmark_norm=False, kelompokkan=False, format_hasil='teks'):
     daftar_file_xml = cari_file_xml()
     daftar_file_json = cari_file_json()
     
@@ -102,35 +715,149 @@ def jalankan_komparasi():
         print("--> Data JSON Facebook tidak ditemukan.")
         return
 
-    daftar_blogger = muat_data_blogger(daftar_file_xml)
+    cache = muat_cache(rebuild=rebuild)
+
+    daftar_blogger = muat_dengan_cache(daftar_file_xml, cache['blogger'], muat_data_blogger)
     print(f"--> Berhasil memuat {len(daftar_blogger)} postingan dari Blogger.")
     
-    daftar_fb = muat_data_facebook(daftar_file_json)
+    daftar_fb = muat_dengan_cache(daftar_file_json, cache['facebook'], muat_data_facebook)
     print(f"--> Berhasil memuat {len(daftar_fb)} postingan dari Facebook.")
     
     if not daftar_fb:
         print("--> Data postingan Facebook kosong.")
+        simpan_cache(cache)
+        return
+
+    if benchmark_norm:
+        # Teks asli hanya dimuat di salinan agar tidak ikut tersimpan di cache
+        simpan_cache(cache)
+        salinan_fb = [dict(fb) for fb in daftar_fb]
+        lengkapi_teks_asli(salinan_fb)
+        benchmark_normalisasi([fb['teks_asli'] for fb in salinan_fb])
+        return
+
+    if sampel_recall:
+        print("--> Membangun indeks MinHash/LSH Blogger...")
+        indeks = IndeksLSH(daftar_blogger)
+        evaluasi_recall(daftar_fb, daftar_blogger, indeks, sampel_recall)
+        simpan_cache(cache)
         return
 
+    # Vonis lama hanya berlaku untuk ambang, mode dan isi file Blogger yang sama
+    kunci_vonis = (BATAS_KEMIRIPAN, mode, tuple(sorted((f, cache['blogger'][f]['sidik']) for f in daftar_file_xml)))
+    if cache['kunci_vonis'] != kunci_vonis:
+        if cache['vonis']:
+            print("--> Ambang kemiripan atau data Blogger berubah, semua postingan diperiksa ulang.")
+        cache['kunci_vonis'] = kunci_vonis
+        cache['vonis'] = {}
+    vonis_lama = cache['vonis']
+
+    kunci_fb = [kunci_postingan(fb['teks_bersih']) for fb in daftar_fb]
+    dari_cache = sum(1 for k in kunci_fb if k in vonis_lama)
+    belum_diperiksa = len(daftar_fb) - dari_cache
+    print(f"--> {dari_cache} postingan memakai hasil cache, {belum_diperiksa} postingan baru diperiksa.")
+
+    indeks = None
+    if belum_diperiksa:
+        if mode == 'lsh':
+            print("--> Membangun indeks MinHash/LSH Blogger...")
+            indeks = IndeksLSH(daftar_blogger)
+        else:
+            indeks = PemeriksaBrute(daftar_blogger)
+
     print("--> Membandingkan data...")
-    
+
+    perlu_diperiksa = {}
+    for fb, kunci in zip(daftar_fb, kunci_fb):
+        if kunci not in vonis_lama and kunci not in perlu_diperiksa:
+            perlu_diperiksa[kunci] = fb['teks_bersih']
+    if perlu_diperiksa:
+        statistik = Counter()
+        hasil_periksa = periksa_semua(list(perlu_diperiksa.values()), indeks, jumlah_worker, ukuran_chunk, statistik)
+        vonis_lama.update(zip(perlu_diperiksa, hasil_periksa))
+        cetak_statistik_penyaring(statistik)
+
+    vonis_baru = {}
     postingan_baru = []
-    for fb in daftar_fb:
-        sudah_ada = periksa_kemiripan(fb['teks_bersih'], daftar_blogger)
+    for fb, kunci in zip(daftar_fb, kunci_fb):
+        sudah_ada = vonis_lama[kunci]
+        vonis_baru[kunci] = sudah_ada
         if not sudah_ada:
             postingan_baru.append(fb)
+
+    cache['vonis'] = vonis_baru
+
+    file_hasil = f"daftar_belum_diposting.{EKSTENSI_HASIL[format_hasil]}"
+    if kelompokkan:
+        # Sisi kelompok hanya bergantung pada ambang kemiripan, bukan pada data Blogger
+        cache_kelompok = cache.get('kelompok')
+        if not cache_kelompok or cache_kelompok['batas'] != BATAS_KEMIRIPAN:
+            cache_kelompok = {'batas': BATAS_KEMIRIPAN, 'diproses': set(), 'sisi': set()}
+            cache['kelompok'] = cache_kelompok
+        daftar_kelompok = kelompokkan_postingan(postingan_baru, cache_kelompok)
+    simpan_cache(cache)
             
-    file_hasil = 'daftar_belum_diposting.txt'
-    print(f"--> Menyimpan hasil: Ditemukan {len(postingan_baru)} postingan yang belum ada di Blogger.")
-    
-    with open(file_hasil, 'w', encoding='utf-8') as file_out:
-        for index, item in enumerate(postingan_baru, 1):
-            tanggal_baca = datetime.datetime.fromtimestamp(item['tanggal']).strftime('%Y-%m-%d %H:%M:%S')
-            file_out.write(f"[{index}] Tanggal Asli FB: {tanggal_baca}\n")
-            file_out.write(f"Teks Postingan:\n{item['teks_asli']}\n")
-            file_out.write("-" * 50 + "\n\n")
+    lengkapi_teks_asli(postingan_baru)
+
+    if kelompokkan:
+        print(f"--> Menyimpan hasil: {len(postingan_baru)} postingan belum ada di Blogger, "
+              f"terkelompok menjadi {len(daftar_kelompok)} postingan unik.")
+    else:
+        print(f"--> Menyimpan hasil: Ditemukan {len(postingan_baru)} postingan yang belum ada di Blogger.")
+
+    if format_hasil != 'teks':
+        # Postingan terdekat cukup dicari di antara kandidat LSH, juga pada mode brute,
+        # karena mencari yang benar-benar terdekat berarti menghitung semua pasangan lagi
+        if not isinstance(indeks, IndeksLSH):
+            indeks = IndeksLSH(daftar_blogger)
+        if not kelompokkan:
+            daftar_kelompok = [[item] for item in postingan_baru]
+        try:
+            tulis_hasil_terstruktur(file_hasil, format_hasil, iter_baris_hasil(daftar_kelompok, indeks))
+        except ImportError as e:
+            print(f"--> Format {format_hasil} membutuhkan paket tambahan: {e}")
+            return
+    elif kelompokkan:
+        tulis_laporan_kelompok(file_hasil, daftar_kelompok)
+    else:
+        with open(file_hasil, 'w', encoding='utf-8') as file_out:
+            for index, item in enumerate(postingan_baru, 1):
+                file_out.write(f"[{index}] Tanggal Asli FB: {format_tanggal(item['tanggal'])}\n")
+                file_out.write(f"Teks Postingan:\n{item['teks_asli']}\n")
+                file_out.write("-" * 50 + "\n\n")
             
     print(f"--> Selesai! Silakan buka file '{file_hasil}'.")
 
+def bilangan_positif(teks):
+    """Tipe argparse untuk bilangan bulat >= 1."""
+    try:
+        nilai = int(teks)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{teks}' bukan bilangan bulat")
+    if nilai < 1:
+        raise argparse.ArgumentTypeError(f"harus >= 1, bukan {nilai}")
+    return nilai
+
 if __name__ == '__main__':
-    jalankan_komparasi()
+    parser = argparse.ArgumentParser(description="Bandingkan postingan Facebook dengan arsip Blogger.")
+    parser.add_argument('--mode', choices=['lsh', 'brute'], default='lsh',
+                        help="lsh: kandidat dari indeks MinHash/LSH (default), brute: semua pasangan (eksak) dengan penyaring aman")
+    parser.add_argument('--evaluasi-recall', type=int, default=0, metavar='N',
+                        help="hanya ukur recall LSH terhadap brute-force pada N sampel postingan FB")
+    parser.add_argument('--rebuild', action='store_true',
+                        help=f"abaikan cache '{FILE_CACHE}' dan proses ulang semua file")
+    parser.add_argument('--worker', type=bilangan_positif, default=1, metavar='N',
+                        help=f"jumlah proses paralel untuk perbandingan (default 1 = serial, core tersedia: {os.cpu_count() or 1})")
+    parser.add_argument('--ukuran-chunk', type=bilangan_positif, default=UKURAN_CHUNK, metavar='N',
+                        help=f"jumlah postingan FB per tugas worker (default {UKURAN_CHUNK})")
+    parser.add_argument('--benchmark-normalisasi', action='store_true',
+                        help="hanya bandingkan kecepatan normalisasi teks baru dan lama pada postingan FB")
+    parser.add_argument('--kelompokkan', action='store_true',
+                        help="gabungkan postingan FB yang mirip satu sama lain, tulis satu wakil per kelompok")
+    parser.add_argument('--format', choices=FORMAT_HASIL, default='teks',
+                        help="format file hasil; selain teks menyertakan postingan Blogger terdekat dan skornya")
+    args = parser.parse_args()
+    jalankan_komparasi(mode=args.mode, sampel_recall=args.evaluasi_recall, rebuild=args.rebuild,
+                       jumlah_worker=args.worker, ukuran_chunk=args.ukuran_chunk,
+                       benchmark_norm=args.benchmark_normalisasi, kelompokkan=args.kelompokkan,
+                       format_hasil=args.format)
@@ -3,6 +3,14 @@ import glob
 import os
 import xlsxwriter
 from datetime import datetime
+from cache_agregat import agregat
+
+# Hanya kolom yang dipakai laporan yang dibaca dari file data
+KOLOM_DIPAKAI = {
+    'Penjualan': ['No. Faktur', 'Nama Sales', 'Nama Barang', 'Qty', 'Total', 'Netto'],
+    'Pembayaran': ['Metode', 'Jumlah Bayar'],
+    'Saldo Awal': ['Kategori Umur Piutang', 'Sisa Piutang'],
+}
 
 def pilih_file_interaktif():
     """
@@ -70,12 +78,21 @@ def generate_analyst_report():
     if not input_file: 
         return
 
-    # 2. LOAD DATA
+    # 2. LOAD DATA & AGREGASI
+    # Semua angka laporan berupa agregat. Jika file data tidak berubah, agregat diambil dari
+    # cache di disk (dipakai bersama script analisis lain) tanpa memuat sheet sama sekali.
+    def agregat_sheet(sheet, by, nilai):
+        return agregat(input_file, sheet, by, nilai, kolom=KOLOM_DIPAKAI[sheet])
+
     try:
-        print("Membaca data Excel...")
-        df_jual = pd.read_excel(input_file, sheet_name='Penjualan')
-        df_bayar = pd.read_excel(input_file, sheet_name='Pembayaran')
-        df_saldo = pd.read_excel(input_file, sheet_name='Saldo Awal')
+        print("Membaca data & menghitung agregat (memakai cache bila ada)...")
+        ringkasan_jual = agregat_sheet('Penjualan', None, {'Netto': 'sum', 'No. Faktur': 'count'})
+        ringkasan_saldo = agregat_sheet('Saldo Awal', None, {'Sisa Piutang': 'sum'})
+        ringkasan_bayar = agregat_sheet('Pembayaran', None, {'Jumlah Bayar': 'sum'})
+        per_sales = agregat_sheet('Penjualan', 'Nama Sales', {'Netto': 'sum', 'Qty': 'sum'})
+        per_barang = agregat_sheet('Penjualan', 'Nama Barang', {'Qty': 'sum', 'Total': 'sum'})
+        per_metode = agregat_sheet('Pembayaran', 'Metode', {'Jumlah Bayar': 'sum'})
+        per_aging = agregat_sheet('Saldo Awal', 'Kategori Umur Piutang', {'Sisa Piutang': 'sum'})
     except Exception as e:
         print(f"Error membaca file: {e}")
         return
@@ -84,23 +101,23 @@ def generate_analyst_report():
     print("Sedang melakukan kalkulasi statistik...")
     
     # A. KPI Utama
-    total_omzet = df_jual['Netto'].sum()
-    total_transaksi = len(df_jual)
+    total_omzet = ringkasan_jual['Netto']
+    total_transaksi = ringkasan_jual['No. Faktur']
     avg_basket_size = total_omzet / total_transaksi if total_transaksi > 0 else 0
-    total_piutang = df_saldo['Sisa Piutang'].sum()
-    total_terbayar = df_bayar['Jumlah Bayar'].sum()
+    total_piutang = ringkasan_saldo['Sisa Piutang']
+    total_terbayar = ringkasan_bayar['Jumlah Bayar']
 
     # B. Agregasi Salesman (Performance)
-    sales_perf = df_jual.groupby('Nama Sales')[['Netto', 'Qty']].sum().sort_values('Netto', ascending=False)
+    sales_perf = per_sales.sort_values('Netto', ascending=False)
     
     # C. Agregasi Produk (Top 10)
-    prod_perf = df_jual.groupby('Nama Barang')[['Qty', 'Total']].sum().sort_values('Total', ascending=False).head(10)
+    prod_perf = per_barang.sort_values('Total', ascending=False).head(10)
 
     # D. Agregasi Metode Bayar
-    pay_method = df_bayar.groupby('Metode')['Jumlah Bayar'].sum()
+    pay_method = per_metode['Jumlah Bayar']
 
     # E. Agregasi Umur Piutang
-    aging_summary = df_saldo.groupby('Kategori Umur Piutang')['Sisa Piutang'].sum()
+    aging_summary = per_aging['Sisa Piutang']
     # Urutkan aging agar rapi di chart (Custom Sort)
     order_aging = ["-30 Hari", "-25 Hari", "-15 Hari", "0 Hari", "5 Hari", "7 Hari", "30 Hari", "32 Hari", "45 Hari"]
     aging_summary = aging_summary.reindex(order_aging).fillna(0)
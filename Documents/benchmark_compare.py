@@ -0,0 +1,204 @@
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import Compare
+
+# --- KOSA KATA KORPUS SINTETIS ---
+KATA_DASAR = [
+    "selamat", "pagi", "semua", "hari", "ini", "kita", "akan", "belajar", "tentang", "cara", "membuat",
+    "blog", "yang", "baik", "dan", "benar", "semoga", "bermanfaat", "terima", "kasih", "sudah", "membaca",
+    "tulisan", "saya", "kali", "resep", "masakan", "rumah", "sederhana", "enak", "murah", "jalan", "jalan",
+    "ke", "semarang", "kota", "lama", "foto", "kenangan", "keluarga", "teman", "kuliah", "kerja", "libur",
+]
+KALIMAT_NON_LATIN = [
+    "مرحبا بكم في مدونتي الجديدة",
+    "今天天气很好我们去公园散步吧",
+    "Café crème brûlée très bon",
+]
+
+KIND_POST = "http://schemas.google.com/blogger/2008/kind#post"
+KIND_KOMENTAR = "http://schemas.google.com/blogger/2008/kind#comment"
+
+def buat_kalimat(rng, jumlah_kata):
+    return " ".join(rng.choice(KATA_DASAR) if rng.random() < 0.6 else _kata_acak(rng) for _ in range(jumlah_kata))
+
+def _kata_acak(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+
+def ubah_sedikit(rng, teks, porsi=0.08):
+    kata = teks.split()
+    for _ in range(max(1, int(len(kata) * porsi))):
+        kata[rng.randrange(len(kata))] = _kata_acak(rng)
+    return " ".join(kata)
+
+def generate_korpus(folder, jumlah_blogger, jumlah_facebook, rasio_duplikat, seed):
+    """Menulis feed atom Blogger dan your_posts_1.json sintetis ke folder, mengembalikan path keduanya."""
+    rng = random.Random(seed)
+    postingan_blog = [buat_kalimat(rng, rng.randint(30, 400)) for _ in range(jumlah_blogger)]
+
+    file_atom = os.path.join(folder, "feed.atom")
+    with open(file_atom, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        for i, teks in enumerate(postingan_blog):
+            konten = html.escape(f"<p>{teks}</p>")
+            f.write(f'<entry><id>post-{i}</id><category scheme="http://schemas.google.com/g/2005#kind" term="{KIND_POST}"/>'
+                    f'<content type="html">{konten}</content></entry>\n')
+            # Sebagian postingan punya komentar yang harus dilewati loader
+            if rng.random() < 0.3:
+                komentar = html.escape(buat_kalimat(rng, rng.randint(5, 40)))
+                f.write(f'<entry><id>komentar-{i}</id><category scheme="http://schemas.google.com/g/2005#kind" term="{KIND_KOMENTAR}"/>'
+                        f'<content type="html">{komentar}</content></entry>\n')
+        f.write('</feed>\n')
+
+    data_fb = []
+    waktu = 1500000000
+    for _ in range(jumlah_facebook):
+        waktu += rng.randint(600, 86400)
+        if postingan_blog and rng.random() < rasio_duplikat:
+            asal = rng.choice(postingan_blog)
+            pilihan = rng.random()
+            if pilihan < 0.4:
+                teks = asal
+            elif pilihan < 0.8:
+                teks = ubah_sedikit(rng, asal)
+            else:
+                kata = asal.split()
+                teks = " ".join(kata[:max(5, len(kata) // 2)])
+        else:
+            teks = buat_kalimat(rng, rng.randint(10, 250))
+        if rng.random() < 0.1:
+            teks += " " + rng.choice(KALIMAT_NON_LATIN)
+
+        judul = rng.choice(["Pengguna memperbarui statusnya.", "Pengguna mengomentari postingan.", ""])
+        # Ekspor Facebook menyimpan UTF-8 sebagai karakter latin-1
+        teks_ekspor = teks.encode("utf-8").decode("latin-1")
+        data_fb.append({"timestamp": waktu, "title": judul, "data": [{"post": teks_ekspor}]})
+
+    file_json = os.path.join(folder, "your_posts_1.json")
+    with open(file_json, "w", encoding="utf-8") as f:
+        json.dump(data_fb, f)
+    return file_atom, file_json
+
+def ukur_tahap(nama, fungsi, ukur_memori=True):
+    """Menjalankan satu tahap: sekali untuk waktu, sekali lagi dengan tracemalloc untuk memori puncak."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        waktu_mulai = time.perf_counter()
+        hasil = fungsi()
+        durasi = time.perf_counter() - waktu_mulai
+
+        memori_puncak = None
+        if ukur_memori:
+            tracemalloc.start()
+            fungsi()
+            _, memori_puncak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    teks_memori = f", puncak memori {memori_puncak / 1024 / 1024:.1f} MB" if memori_puncak is not None else ""
+    print(f"--> {nama:<28}: {durasi:8.3f} detik{teks_memori}")
+    return hasil, {"detik": round(durasi, 6), "memori_puncak_byte": memori_puncak}
+
+def jalankan_benchmark(jumlah_blogger, jumlah_facebook, rasio_duplikat, sampel_brute, seed, ukur_memori=True):
+    hasil = {
+        "waktu": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parameter": {
+            "jumlah_blogger": jumlah_blogger, "jumlah_facebook": jumlah_facebook, "rasio_duplikat": rasio_duplikat,
+            "sampel_brute": sampel_brute, "seed": seed, "batas_kemiripan": Compare.BATAS_KEMIRIPAN,
+        },
+        "tahap": {},
+    }
+    tahap = hasil["tahap"]
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"--> Membuat korpus sintetis: {jumlah_blogger} postingan Blogger, {jumlah_facebook} postingan FB...")
+        file_atom, file_json = generate_korpus(folder, jumlah_blogger, jumlah_facebook, rasio_duplikat, seed)
+
+        daftar_blogger, tahap["muat_data_blogger"] = ukur_tahap(
+            "muat_data_blogger", lambda: Compare.muat_data_blogger([file_atom]), ukur_memori)
+        daftar_fb, tahap["muat_data_facebook"] = ukur_tahap(
+            "muat_data_facebook", lambda: Compare.muat_data_facebook([file_json]), ukur_memori)
+
+        with open(file_json, encoding="utf-8") as f:
+            teks_mentah = [d["post"] for item in json.load(f) for d in item["data"]]
+        _, tahap["bersihkan_teks"] = ukur_tahap(
+            "bersihkan_teks", lambda: [Compare.bersihkan_teks(t) for t in teks_mentah], ukur_memori)
+
+    tahap["muat_data_blogger"]["jumlah"] = len(daftar_blogger)
+    tahap["muat_data_facebook"]["jumlah"] = len(daftar_fb)
+    tahap["bersihkan_teks"]["jumlah"] = len(teks_mentah)
+
+    daftar_teks_fb = [fb["teks_bersih"] for fb in daftar_fb]
+    sampel = random.Random(seed).sample(daftar_teks_fb, min(sampel_brute, len(daftar_teks_fb)))
+
+    vonis_brute, tahap["periksa_kemiripan"] = ukur_tahap(
+        "periksa_kemiripan (sampel)", lambda: [Compare.periksa_kemiripan(t, daftar_blogger) for t in sampel], ukur_memori)
+    tahap["periksa_kemiripan"]["jumlah"] = len(sampel)
+
+    indeks_lsh, tahap["bangun_indeks_lsh"] = ukur_tahap(
+        "bangun IndeksLSH", lambda: Compare.IndeksLSH(daftar_blogger), ukur_memori)
+    _, tahap["periksa_indeks_lsh"] = ukur_tahap(
+        "IndeksLSH.periksa (semua)", lambda: [indeks_lsh.periksa(t) for t in daftar_teks_fb], ukur_memori)
+    tahap["periksa_indeks_lsh"]["jumlah"] = len(daftar_teks_fb)
+
+    vonis_lsh = [indeks_lsh.periksa(t) for t in sampel]
+    cocok_brute = sum(vonis_brute)
+    hasil["akurasi"] = {
+        "cocok_brute": cocok_brute,
+        "recall_lsh": sum(1 for b, l in zip(vonis_brute, vonis_lsh) if b and l) / cocok_brute if cocok_brute else 1.0,
+    }
+    print(f"--> Recall LSH terhadap brute-force: {hasil['akurasi']['recall_lsh']:.2%}")
+    return hasil
+
+def bandingkan_dengan(hasil, file_pembanding, toleransi):
+    """Mencetak perbandingan waktu per tahap dengan hasil lama; mengembalikan daftar tahap yang melambat."""
+    with open(file_pembanding, encoding="utf-8") as f:
+        lama = json.load(f)
+    if lama.get("parameter") != hasil["parameter"]:
+        print("--> Peringatan: parameter benchmark pembanding berbeda, perbandingan kurang bermakna.")
+
+    melambat = []
+    for nama, data in hasil["tahap"].items():
+        data_lama = lama.get("tahap", {}).get(nama)
+        if not data_lama or not data_lama["detik"]:
+            continue
+        rasio = data["detik"] / data_lama["detik"]
+        tanda = "  <-- MELAMBAT" if rasio > 1 + toleransi else ""
+        print(f"--> {nama:<28}: {data_lama['detik']:8.3f} -> {data['detik']:8.3f} detik ({rasio:.2f}x){tanda}")
+        if tanda:
+            melambat.append(nama)
+    return melambat
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark tahap-tahap Compare.py pada korpus sintetis.")
+    parser.add_argument('--blogger', type=int, default=1000, help="jumlah postingan Blogger sintetis")
+    parser.add_argument('--facebook', type=int, default=3000, help="jumlah postingan Facebook sintetis")
+    parser.add_argument('--rasio-duplikat', type=float, default=0.3, help="porsi postingan FB yang berasal dari Blogger")
+    parser.add_argument('--sampel-brute', type=int, default=10, help="jumlah postingan FB untuk tahap brute-force")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--tanpa-memori', action='store_true', help="lewati pengukuran memori puncak (lebih cepat)")
+    parser.add_argument('--output', default='hasil_benchmark_compare.json', help="file JSON hasil benchmark")
+    parser.add_argument('--pembanding', help="file JSON hasil benchmark lama untuk mendeteksi regresi")
+    parser.add_argument('--toleransi', type=float, default=0.2, help="batas perlambatan sebelum ditandai (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    hasil = jalankan_benchmark(args.blogger, args.facebook, args.rasio_duplikat, args.sampel_brute, args.seed,
+                               ukur_memori=not args.tanpa_memori)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(hasil, f, indent=2)
+    print(f"--> Hasil benchmark disimpan ke '{args.output}'.")
+
+    if args.pembanding:
+        melambat = bandingkan_dengan(hasil, args.pembanding, args.toleransi)
+        if melambat:
+            print(f"--> Regresi terdeteksi pada: {', '.join(melambat)}")
+            raise SystemExit(1)
@@ -0,0 +1,246 @@
+import os
+import hashlib
+import sqlite3
+import numpy as np
+import pandas as pd
+from umur_piutang import hari_ini, hitung_aging, perbarui_aging, LABEL_UMUR
+
+# --- BUKU PIUTANG (SQLITE) ---
+# Satu baris tagihan per baris sumber (Saldo Awal / Penjualan), dengan akumulasi pembayaran per
+# No. Faktur. Buku hanya menerima baris sheet yang belum pernah diterapkan, jadi run berikutnya atas
+# file yang sama cukup menambahkan baris yang baru ditambahkan ke file, bukan menyusun ulang piutang.
+#
+# Cakupannya satu file data: buku disimpan di samping file itu. File bulan berikutnya punya Saldo
+# Awal sendiri (sisa piutang bulan lalu sudah terbawa di sana), jadi ia memulai buku baru; buku
+# lintas file akan menghitung saldo yang terbawa itu dua kali.
+EKSTENSI_BUKU = '.buku_piutang.sqlite'
+VERSI_BUKU = 3
+BATAS_LUNAS = 100  # sisa piutang <= batas ini dianggap lunas
+
+# Kolom sumber per sheet: (no faktur, tanggal, pelanggan, sales, nilai) / (no faktur, jumlah bayar).
+# Urutan SUMBER_TAGIHAN juga urutan rincian piutang (Saldo Awal dulu, lalu Penjualan).
+SUMBER_TAGIHAN = {
+    'Saldo Awal': ['No. Faktur Lama', 'Tanggal Faktur', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang'],
+    'Penjualan': ['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Netto'],
+}
+SUMBER_BAYAR = {'Pembayaran': ['No. Faktur', 'Jumlah Bayar']}
+
+SKEMA_BUKU = """
+CREATE TABLE IF NOT EXISTS tagihan (
+    sheet_ke INTEGER NOT NULL,
+    baris INTEGER NOT NULL,
+    no_faktur TEXT,
+    tanggal TEXT,
+    nama_pelanggan TEXT,
+    nama_sales TEXT,
+    tagihan_awal INTEGER NOT NULL,
+    jumlah_bayar INTEGER NOT NULL DEFAULT 0,
+    diubah INTEGER NOT NULL,
+    PRIMARY KEY (sheet_ke, baris)
+);
+CREATE INDEX IF NOT EXISTS idx_tagihan_faktur ON tagihan (no_faktur);
+CREATE INDEX IF NOT EXISTS idx_tagihan_sisa ON tagihan (tagihan_awal - jumlah_bayar);
+CREATE INDEX IF NOT EXISTS idx_tagihan_diubah ON tagihan (diubah);
+CREATE TABLE IF NOT EXISTS bayar (
+    no_faktur TEXT PRIMARY KEY,
+    jumlah INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sumber (
+    sheet TEXT PRIMARY KEY,
+    baris INTEGER NOT NULL,
+    sidik TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS status (
+    kunci TEXT PRIMARY KEY,
+    nilai INTEGER NOT NULL
+);
+"""
+
+# Pembayaran berlaku untuk setiap baris tagihan dengan No. Faktur tersebut, termasuk tagihan yang
+# baru tercatat setelah pembayarannya (sama seperti merge per No. Faktur di laporan lama)
+SQL_TAGIHAN = """
+INSERT INTO tagihan (sheet_ke, baris, no_faktur, tanggal, nama_pelanggan, nama_sales, tagihan_awal, jumlah_bayar, diubah)
+VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, COALESCE((SELECT jumlah FROM bayar WHERE bayar.no_faktur = ?3), 0), ?8)
+"""
+SQL_BAYAR = """
+INSERT INTO bayar (no_faktur, jumlah) VALUES (?, ?)
+ON CONFLICT (no_faktur) DO UPDATE SET jumlah = bayar.jumlah + excluded.jumlah
+"""
+SQL_BAYAR_TAGIHAN = "UPDATE tagihan SET jumlah_bayar = jumlah_bayar + ?, diubah = ? WHERE no_faktur = ?"
+SYARAT_TERBUKA = "tagihan_awal - jumlah_bayar > ?"
+URUTAN_RINCIAN = "sheet_ke, baris"
+KOLOM_KUNCI = ['Sheet Ke', 'Baris']
+KOLOM_RINCIAN = """
+    sheet_ke AS "Sheet Ke", baris AS "Baris", no_faktur AS "No. Faktur", tanggal AS "Tanggal",
+    nama_pelanggan AS "Nama Pelanggan", nama_sales AS "Nama Sales",
+    tagihan_awal AS "Tagihan Awal", jumlah_bayar AS "Jumlah Bayar", tagihan_awal - jumlah_bayar AS "Sisa Piutang"
+"""
+
+def path_buku(file_data):
+    """Buku piutang milik satu file data (lihat catatan cakupan di atas)."""
+    return os.path.splitext(file_data)[0] + EKSTENSI_BUKU
+
+def buka_buku(file_data):
+    """Membuka (atau membuat) buku piutang milik file data; versi skema lain dibuat ulang."""
+    conn = sqlite3.connect(path_buku(file_data))
+    if conn.execute("PRAGMA user_version").fetchone()[0] != VERSI_BUKU:
+        conn.executescript("DROP TABLE IF EXISTS faktur; DROP TABLE IF EXISTS tagihan; "
+                           "DROP TABLE IF EXISTS bayar; DROP TABLE IF EXISTS sumber;")
+        conn.execute(f"PRAGMA user_version = {VERSI_BUKU}")
+    conn.executescript(SKEMA_BUKU)
+    return conn
+
+def _sidik(hash_baris, baris):
+    """Sidik baris [0, baris) dari hash per baris (hash_pandas_object). Semua baris ikut, dan urutannya
+    berpengaruh, jadi perubahan apa pun pada baris yang sudah diterapkan memicu susun ulang."""
+    return hashlib.blake2b(hash_baris[:baris].tobytes(), digest_size=16).hexdigest()
+
+def _siapkan(df, kolom, kolom_tanggal=None):
+    """Kolom sumber dengan tipe tetap: semua kolom tanggal datetime64[ns], apa pun sumber bacaannya
+    (Excel memberi [us], Parquet [ns]) agar sidik data yang sama tidak berubah."""
+    df = df[kolom].reset_index(drop=True)
+    if kolom_tanggal:
+        df[kolom_tanggal] = pd.to_datetime(df[kolom_tanggal])
+    for k in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[k]):
+            df[k] = df[k].astype('datetime64[ns]')
+    return df
+
+def _teks_tanggal(seri):
+    teks = seri.dt.strftime('%Y-%m-%d %H:%M:%S')
+    return teks.astype(object).where(seri.notna(), None)
+
+def perbarui_buku(conn, data):
+    """Menerapkan baris baru dari sheet data ({nama sheet: DataFrame}, seperti hasil muat_data) ke buku.
+
+    Sheet dianggap hanya bertambah di bagian akhir: baris yang sudah diterapkan dicocokkan dengan
+    sidiknya, lalu hanya sisanya yang ditulis. Jika baris lama berubah, buku disusun ulang dari awal.
+    Mengembalikan {sheet: jumlah baris baru yang diterapkan}.
+    """
+    sumber = {sheet: _siapkan(data[sheet], kolom, kolom[1]) for sheet, kolom in SUMBER_TAGIHAN.items()}
+    sumber.update({sheet: _siapkan(data[sheet], kolom) for sheet, kolom in SUMBER_BAYAR.items()})
+    hash_baris = {sheet: pd.util.hash_pandas_object(df, index=False).to_numpy() for sheet, df in sumber.items()}
+
+    tercatat = {sheet: (baris, sidik) for sheet, baris, sidik in conn.execute("SELECT sheet, baris, sidik FROM sumber")}
+    mulai = {}
+    for sheet, df in sumber.items():
+        baris, sidik = tercatat.get(sheet, (0, None))
+        if sidik is not None and (baris > len(df) or _sidik(hash_baris[sheet], baris) != sidik):
+            print(f"--> Sheet '{sheet}' berubah sejak buku piutang terakhir diperbarui, buku disusun ulang.")
+            mulai = None
+            break
+        mulai[sheet] = baris
+
+    # Tiap pembaruan mendapat nomor versi; baris tagihan yang disentuh ditandai dengan nomor itu.
+    # Buku yang disusun dari kosong mendapat id baru, jadi snapshot dari buku lama tidak terpakai.
+    id_buku, versi = versi_buku(conn)
+    versi += 1
+    with conn:
+        if mulai is None:
+            for tabel in ('tagihan', 'bayar', 'sumber'):
+                conn.execute(f"DELETE FROM {tabel}")
+        if mulai is None or not tercatat:
+            id_buku = int.from_bytes(os.urandom(7), 'big')
+            mulai = {sheet: 0 for sheet in sumber}
+        conn.executemany("INSERT OR REPLACE INTO status (kunci, nilai) VALUES (?, ?)",
+                         [('id_buku', id_buku), ('versi', versi)])
+
+        diterapkan = {}
+        for sheet_ke, (sheet, kolom) in enumerate(SUMBER_TAGIHAN.items()):
+            baru = sumber[sheet].iloc[mulai[sheet]:]
+            if len(baru):
+                no, tanggal, pelanggan, sales, nilai = (baru[k] for k in kolom)
+                conn.executemany(SQL_TAGIHAN, zip([sheet_ke] * len(baru), baru.index.tolist(), no.tolist(),
+                                                  _teks_tanggal(tanggal).tolist(), pelanggan.tolist(), sales.tolist(),
+                                                  nilai.astype('int64').tolist(), [versi] * len(baru)))
+            diterapkan[sheet] = len(baru)
+        for sheet, (kolom_no, kolom_bayar) in SUMBER_BAYAR.items():
+            baru = sumber[sheet].iloc[mulai[sheet]:]
+            if len(baru):
+                per_faktur = baru.groupby(kolom_no)[kolom_bayar].sum().astype('int64')
+                conn.executemany(SQL_BAYAR, zip(per_faktur.index.tolist(), per_faktur.tolist()))
+                conn.executemany(SQL_BAYAR_TAGIHAN, zip(per_faktur.tolist(), [versi] * len(per_faktur), per_faktur.index.tolist()))
+            diterapkan[sheet] = len(baru)
+
+        conn.executemany("INSERT OR REPLACE INTO sumber (sheet, baris, sidik) VALUES (?, ?, ?)",
+                         [(sheet, len(df), _sidik(hash_baris[sheet], len(df))) for sheet, df in sumber.items()])
+    return diterapkan
+
+def versi_buku(conn):
+    """(id buku, versi pembaruan terakhir); (None, 0) untuk buku yang belum pernah diperbarui."""
+    status = dict(conn.execute("SELECT kunci, nilai FROM status"))
+    return status.get('id_buku'), status.get('versi', 0)
+
+def faktur_ganda(conn):
+    """No. Faktur yang dipakai lebih dari satu baris tagihan (misal dua pelanggan di Saldo Awal).
+    Baris-baris itu tetap dicatat terpisah; pembayaran No. Faktur tersebut berlaku untuk semuanya."""
+    return pd.read_sql_query('SELECT no_faktur AS "No. Faktur", COUNT(*) AS "Jumlah Baris", '
+                             'COUNT(DISTINCT nama_pelanggan) AS "Jumlah Pelanggan" FROM tagihan '
+                             'GROUP BY no_faktur HAVING COUNT(*) > 1 ORDER BY no_faktur', conn)
+
+def _baca(conn, sql, parameter, per_tanggal):
+    df = pd.read_sql_query(sql, conn, params=parameter)
+    df['Tanggal'] = pd.to_datetime(df['Tanggal'])
+    return hitung_aging(df, per_tanggal)
+
+def piutang_terbuka(conn, per_tanggal=None, batas_lunas=BATAS_LUNAS):
+    """Rincian tagihan yang belum lunas (urut baris sumber: Saldo Awal lalu Penjualan) lengkap dengan umur dan kategorinya.
+    Versi buku dan batas lunas dicatat di attrs agar hasilnya bisa dipakai sebagai snapshot piutang_terbuka_harian."""
+    df = _baca(conn, f"SELECT {KOLOM_RINCIAN} FROM tagihan WHERE {SYARAT_TERBUKA} ORDER BY {URUTAN_RINCIAN}",
+               (batas_lunas,), per_tanggal)
+    id_buku, versi = versi_buku(conn)
+    df.attrs.update(id_buku=id_buku, versi_buku=versi, batas_lunas=batas_lunas)
+    return df
+
+# --- MODE HARIAN ---
+# Rincian run sebelumnya (snapshot, lihat umur_piutang.simpan_snapshot) cukup digeser ke tanggal acuan
+# baru; dari buku hanya dibaca baris tagihan yang berubah sejak versi snapshot (tagihan baru atau
+# kena pembayaran baru). Baris itu menggantikan baris lamanya, yang sudah lunas dibuang.
+
+def _kunci(df):
+    return df['Sheet Ke'].to_numpy(dtype='int64') * (1 << 40) + df['Baris'].to_numpy(dtype='int64')
+
+def _snapshot_berlaku(snapshot, conn, per_tanggal, batas_lunas):
+    if snapshot is None or not set(KOLOM_KUNCI) <= set(snapshot.columns):
+        return False
+    attrs = snapshot.attrs
+    id_buku, versi = versi_buku(conn)
+    if id_buku is None or attrs.get('id_buku') != id_buku or attrs.get('batas_lunas') != batas_lunas:
+        return False
+    return attrs.get('versi_buku', versi + 1) <= versi and pd.Timestamp(attrs['per_tanggal']) <= per_tanggal
+
+def piutang_terbuka_harian(conn, snapshot, per_tanggal=None, batas_lunas=BATAS_LUNAS):
+    """Sama dengan piutang_terbuka, tetapi memakai snapshot hasil run sebelumnya bila masih berlaku
+    (buku yang sama, tidak disusun ulang sejak itu, tanggal acuan tidak mundur); selain itu dihitung penuh."""
+    per_tanggal = pd.Timestamp(per_tanggal) if per_tanggal is not None else hari_ini()
+    if not _snapshot_berlaku(snapshot, conn, per_tanggal, batas_lunas):
+        print("--> Rincian piutang dihitung penuh dari buku.")
+        return piutang_terbuka(conn, per_tanggal, batas_lunas)
+
+    berubah = pd.read_sql_query(f"SELECT {KOLOM_RINCIAN} FROM tagihan WHERE diubah > ?", conn,
+                                params=(int(snapshot.attrs['versi_buku']),))
+    berubah['Tanggal'] = pd.to_datetime(berubah['Tanggal'])
+    tetap = snapshot[~np.isin(_kunci(snapshot), _kunci(berubah))]
+    terbuka = berubah[berubah['Sisa Piutang'] > batas_lunas]
+    print(f"--> Rincian piutang dari snapshot {pd.Timestamp(snapshot.attrs['per_tanggal']):%Y-%m-%d}, "
+          f"{len(berubah)} baris tagihan berubah sejak itu.")
+
+    df = perbarui_aging(tetap, per_tanggal, terbuka)
+    df = df.sort_values(KOLOM_KUNCI, ignore_index=True)
+    id_buku, versi = versi_buku(conn)
+    df.attrs.update(per_tanggal=per_tanggal.isoformat(), id_buku=id_buku, versi_buku=versi, batas_lunas=batas_lunas)
+    return df
+
+def top_piutang(conn, jumlah=10, per_tanggal=None, batas_lunas=BATAS_LUNAS):
+    """Tagihan dengan sisa piutang terbesar (memakai index sisa, tidak membaca seluruh buku)."""
+    return _baca(conn, f"SELECT {KOLOM_RINCIAN} FROM tagihan WHERE {SYARAT_TERBUKA} "
+                       f"ORDER BY tagihan_awal - jumlah_bayar DESC, {URUTAN_RINCIAN} LIMIT ?", (batas_lunas, jumlah), per_tanggal)
+
+def rekap_umur_per_sales(conn, per_tanggal=None, batas_lunas=BATAS_LUNAS):
+    """Pivot sisa piutang per sales x kategori umur. Dijumlah di SQLite per (sales, tanggal),
+    jadi yang dibaca hanya sebanyak kombinasi sales dan tanggal faktur."""
+    df = _baca(conn, f'SELECT nama_sales AS "Nama Sales", tanggal AS "Tanggal", '
+                     f'SUM(tagihan_awal - jumlah_bayar) AS "Sisa Piutang" FROM tagihan '
+                     f'WHERE {SYARAT_TERBUKA} GROUP BY nama_sales, tanggal', (batas_lunas,), per_tanggal)
+    pivot = df.pivot_table(index='Nama Sales', columns='Kategori', values='Sisa Piutang', aggfunc='sum', fill_value=0, observed=False)
+    return pivot.reindex(columns=LABEL_UMUR, fill_value=0)
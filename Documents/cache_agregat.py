@@ -0,0 +1,95 @@
+import os
+import hashlib
+import pickle
+from functools import lru_cache
+from muat_data import muat_sheet
+
+# --- CACHE AGREGAT DI DISK ---
+# Hasil groupby disimpan per (hash isi file data, sheet, spesifikasi agregat), sehingga
+# analis_general, sales_analisis dan marketing_analisis berbagi agregat yang sama, dan
+# rerun pada file yang tidak berubah langsung memakai hasil lama tanpa memuat sheet.
+FOLDER_CACHE = '.cache_agregat'
+VERSI_CACHE = 1
+BATAS_UKURAN_CACHE = 256 * 1024 * 1024  # byte; entri paling lama tidak dipakai dibuang lebih dulu
+UKURAN_BACA_HASH = 1 << 20
+
+@lru_cache(maxsize=32)
+def _hash_isi(path, mtime_ns, ukuran):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while blok := f.read(UKURAN_BACA_HASH):
+            h.update(blok)
+    return h.hexdigest()
+
+def hash_isi_file(path):
+    """Hash isi file; dihitung sekali per proses selama mtime & ukuran file tidak berubah."""
+    info = os.stat(path)
+    return _hash_isi(os.path.abspath(path), info.st_mtime_ns, info.st_size)
+
+def kunci_agregat(file_data, sheet, by, nilai):
+    spesifikasi = repr((VERSI_CACHE, sheet, by, sorted(nilai.items())))
+    return hashlib.blake2b(f"{hash_isi_file(file_data)}|{spesifikasi}".encode('utf-8'), digest_size=16).hexdigest()
+
+def folder_cache(file_data):
+    return os.path.join(os.path.dirname(os.path.abspath(file_data)), FOLDER_CACHE)
+
+def _buang_lru(folder, batas_ukuran):
+    """Menghapus entri dengan waktu pakai (mtime) paling lama sampai total ukuran di bawah batas."""
+    entri = []
+    for nama in os.listdir(folder):
+        if nama.endswith('.pkl'):
+            info = os.stat(os.path.join(folder, nama))
+            entri.append((info.st_mtime, info.st_size, nama))
+    total = sum(ukuran for _, ukuran, _ in entri)
+    for _, ukuran, nama in sorted(entri):
+        if total <= batas_ukuran:
+            break
+        os.remove(os.path.join(folder, nama))
+        total -= ukuran
+
+@lru_cache(maxsize=4)
+def _muat_sheet_sekali(file_data, sheet, mtime_ns, kolom):
+    # Satu kali muat per sheet per proses, dipakai bersama oleh semua agregat yang meleset
+    return muat_sheet(file_data, sheet, list(kolom) if kolom else None)
+
+def agregat(file_data, sheet, by, nilai, df=None, kolom=None, batas_ukuran=BATAS_UKURAN_CACHE):
+    """df.groupby(by).agg(nilai) untuk satu sheet file data, dimemo di disk.
+
+    by: nama kolom / list kolom, atau None untuk agregat seluruh sheet (hasil Series).
+    nilai: dict {kolom: fungsi agregasi pandas}, misal {'Netto': 'sum', 'Qty': 'sum'}.
+    df: sheet yang sudah dimuat (opsional). Jika None dan cache meleset, sheet dimuat sendiri
+    sekali per proses; kolom membatasi kolom yang dimuat (pakai daftar yang sama untuk semua
+    agregat satu sheet agar tidak dimuat berulang).
+    """
+    folder = folder_cache(file_data)
+    path = os.path.join(folder, kunci_agregat(file_data, sheet, by, nilai) + '.pkl')
+    try:
+        with open(path, 'rb') as f:
+            hasil = pickle.load(f)
+        # Tandai baru dipakai untuk urutan LRU
+        os.utime(path)
+        return hasil
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Entri rusak atau dari versi pandas/modul lain (bisa AttributeError, ImportError, ...) dianggap meleset
+        print(f"--> Cache agregat '{os.path.basename(path)}' tidak terbaca ({type(e).__name__}), dihitung ulang.")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    if df is None:
+        df = _muat_sheet_sekali(os.path.abspath(file_data), sheet, os.stat(file_data).st_mtime_ns,
+                                tuple(kolom) if kolom else None)
+    hasil = df.agg(nilai) if by is None else df.groupby(by).agg(nilai)
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(hasil, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        _buang_lru(folder, batas_ukuran)
+    except OSError as e:
+        print(f"--> Cache agregat gagal ditulis: {e}")
+    return hasil
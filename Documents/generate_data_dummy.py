@@ -2,96 +2,110 @@ import pandas as pd
 import random
 import os
 import math
+import time
+import argparse
+import itertools
 import numpy as np
+from functools import lru_cache
 from datetime import datetime, timedelta
+from muat_data import simpan_kolumnar
 
-def generate_dynamic_dummy_v9():
-    print("=== GENERATOR DATA DUMMY ===")
-    
-    # --- INPUT USER ---
-    try:
-        bulan = int(input("Masukkan bulan (1-12): "))
-        tahun = 2025
-        total_data = int(input("Masukkan jumlah baris data penjualan: "))
-        
-        # --- FITUR BARU: KONTROL GAP TARGET ---
-        print("\n--- PENGATURAN TARGET ---")
-        print("Agar data realistis, target akan dibuat berdasarkan penjualan yang terjadi.")
-        persen_ach = float(input("Rata-rata % pencapaian yang diinginkan (misal 95 artinya target sedikit diatas omzet): ")) / 100
-        variasi = float(input("Variasi % antar sales (misal 10 artinya pencapaian berkisar +/- 10% dari rata-rata): ")) / 100
-        
-        # Logika Rasio Pelanggan
-        total_pelanggan = int(math.sqrt(total_data) * 3)
-        if total_pelanggan < 5: total_pelanggan = 5 
-        if total_pelanggan > total_data: total_pelanggan = total_data
-        
-        jumlah_sales = int(input("\nBerapa jumlah Salesman? "))
-        list_sales = [input(f"Masukkan nama Salesman ke-{i+1}: ") for i in range(jumlah_sales)]
-            
-    except ValueError:
-        print("Input harus berupa angka!")
-        return
+# --- DATA MASTER BARANG ---
+DAFTAR_BARANG = {
+    "BSM 140 ml": 6300, "BSM 450 ml": 15000, "BSMJ 5.5 kg": 109000, 
+    "BSMJ 11 kg": 214500, "BSMJ 24 kg": 447000, "BRS 140 ml": 6300, 
+    "BRS 400 ml": 13300, "BRSJ 5.5 kg": 109000, "NY 5,5 kg": 103500, 
+    "Hiap HongJ 5,5 kg": 101500, "BSA 600 ml": 13850, "RSM 275 ml": 7900, 
+    "RSM 450 ml": 13200, "RSM 5.5 kg": 103000, "REP 520 ml": 10500, "MKH-K2": 2700,
+    "SCHS-8 gr": 20400, "SCHS-5,7 KG": 76700, "STKC-8 gr": 17800, "STKC-5,7 KG": 67500
+}
 
-    nama_file = f"Data_V9_Dummy_Bulan_{bulan}.xlsx"
-    
-    # --- DATA MASTER BARANG ---
-    daftar_barang = {
-        "BSM 140 ml": 6300, "BSM 450 ml": 15000, "BSMJ 5.5 kg": 109000, 
-        "BSMJ 11 kg": 214500, "BSMJ 24 kg": 447000, "BRS 140 ml": 6300, 
-        "BRS 400 ml": 13300, "BRSJ 5.5 kg": 109000, "NY 5,5 kg": 103500, 
-        "Hiap HongJ 5,5 kg": 101500, "BSA 600 ml": 13850, "RSM 275 ml": 7900, 
-        "RSM 450 ml": 13200, "RSM 5.5 kg": 103000, "REP 520 ml": 10500, "MKH-K2": 2700,
-        "SCHS-8 gr": 20400, "SCHS-5,7 KG": 76700, "STKC-8 gr": 17800, "STKC-5,7 KG": 67500
-    }
+# --- DATABASE NAMA & ALAMAT ---
+PREFIX_USAHA = ["Toko", "Warung", "UD", "CV", "Agen", "Grosir", "Depot", "Kios", "TB", "Rumah Makan", "Catering", "Bakso", "Soto", "Mie Ayam", "Sate"]
+NAMA_SIFAT = ["Lancar", "Jaya", "Abadi", "Makmur", "Sentosa", "Berkah", "Barokah", "Rejeki", "Sumber", "Sido", "Maju", "Sari", "Rasa", "Nikmat"]
+NAMA_ORANG_JAWA = ["Slamet", "Widodo", "Santoso", "Budi", "Hartono", "Sutrisno", "Wahyu", "Agus", "Sri", "Endang", "Bambang", "Yanto", "Eko"]
+SUFFIX_TEMPAT = ["Semarang", "Jaya", "Baru", "Raya", "Putra", "Putri", "Group", "Mandiri", "Tengah", "Timur", "Selatan", "Utara"]
 
-    # --- DATABASE NAMA & ALAMAT ---
-    prefix_usaha = ["Toko", "Warung", "UD", "CV", "Agen", "Grosir", "Depot", "Kios", "TB", "Rumah Makan", "Catering", "Bakso", "Soto", "Mie Ayam", "Sate"]
-    nama_sifat = ["Lancar", "Jaya", "Abadi", "Makmur", "Sentosa", "Berkah", "Barokah", "Rejeki", "Sumber", "Sido", "Maju", "Sari", "Rasa", "Nikmat"]
-    nama_orang_jawa = ["Slamet", "Widodo", "Santoso", "Budi", "Hartono", "Sutrisno", "Wahyu", "Agus", "Sri", "Endang", "Bambang", "Yanto", "Eko"]
-    suffix_tempat = ["Semarang", "Jaya", "Baru", "Raya", "Putra", "Putri", "Group", "Mandiri", "Tengah", "Timur", "Selatan", "Utara"]
-    
-    jalan_semarang_real = [
-        "Jl. Pandanaran", "Jl. Pemuda", "Jl. Gajah Mada", "Jl. Ahmad Yani", "Jl. Pahlawan", "Jl. MH Thamrin",
-        "Jl. Jend. Sudirman", "Jl. Siliwangi", "Jl. Pamularsih Raya", "Jl. Abdulrahman Saleh", "Jl. Kokrosono",
-        "Jl. Majapahit", "Jl. Wolter Monginsidi", "Jl. Fatmawati", "Jl. Soekarno Hatta", "Jl. Brigjen Sudiarto",
-        "Jl. Setiabudi", "Jl. Ngesrep Timur V", "Jl. Tirto Agung", "Jl. Banjarsari", "Jl. Durian Raya",
-        "Jl. Dr. Cipto", "Jl. MT Haryono", "Jl. Mataram", "Jl. Sriwijaya", "Jl. Veteran", "Jl. Kyai Saleh"
-    ]
+JALAN_SEMARANG_REAL = [
+    "Jl. Pandanaran", "Jl. Pemuda", "Jl. Gajah Mada", "Jl. Ahmad Yani", "Jl. Pahlawan", "Jl. MH Thamrin",
+    "Jl. Jend. Sudirman", "Jl. Siliwangi", "Jl. Pamularsih Raya", "Jl. Abdulrahman Saleh", "Jl. Kokrosono",
+    "Jl. Majapahit", "Jl. Wolter Monginsidi", "Jl. Fatmawati", "Jl. Soekarno Hatta", "Jl. Brigjen Sudiarto",
+    "Jl. Setiabudi", "Jl. Ngesrep Timur V", "Jl. Tirto Agung", "Jl. Banjarsari", "Jl. Durian Raya",
+    "Jl. Dr. Cipto", "Jl. MT Haryono", "Jl. Mataram", "Jl. Sriwijaya", "Jl. Veteran", "Jl. Kyai Saleh"
+]
+
+KOLOM_PENJUALAN = [
+    'Tanggal', 'Nama Pelanggan', 'Alamat', 'Nama Sales', 'No. Faktur', 'TOP', 
+    'Nama Barang', 'Qty', 'Harga Satuan', 'Total', 'Diskon', 'Retur', 'Netto'
+]
+PILIHAN_DISKON = [0, 5000, 10000, 25000]
+PILIHAN_TOP = ["14 Hari", "30 Hari"]
+
+# Pola nama pelanggan beserta bobot pemilihannya (pola 1 & 2 dua kali lebih sering dari pola 3)
+POLA_NAMA = [
+    ((PREFIX_USAHA, NAMA_SIFAT, NAMA_ORANG_JAWA), 2),
+    ((PREFIX_USAHA, NAMA_SIFAT, SUFFIX_TEMPAT), 2),
+    ((PREFIX_USAHA, NAMA_ORANG_JAWA, SUFFIX_TEMPAT), 1),
+]
+
+@lru_cache(maxsize=1)
+def ruang_nama_pelanggan():
+    """Semua nama unik yang bisa dibentuk dari POLA_NAMA beserta peluang samplingnya.
+
+    Kata ganda dibuang ("Toko Jaya Jaya" -> "Toko Jaya"), dan nama yang bisa muncul dari
+    beberapa pola hanya dihitung sekali. Urutannya tetap, jadi sampling berseed deterministik.
+    """
+    nama_unik = {}
+    total_bobot = sum(bobot for _, bobot in POLA_NAMA)
+    for bagian, bobot in POLA_NAMA:
+        # Tiap pola mendapat porsi peluang sesuai bobotnya, dibagi rata ke semua kombinasinya
+        peluang = bobot / total_bobot / math.prod(len(b) for b in bagian)
+        for kombinasi in itertools.product(*bagian):
+            kata = " ".join(kombinasi).split()
+            nama = " ".join(dict.fromkeys(kata))
+            nama_unik[nama] = nama_unik.get(nama, 0) + peluang
+    return np.array(list(nama_unik), dtype=object), np.array(list(nama_unik.values()))
+
+def kapasitas_nama_pelanggan():
+    """Jumlah maksimum nama pelanggan unik yang bisa dibuat."""
+    return len(ruang_nama_pelanggan()[0])
+
+def generate_pelanggan(total_pelanggan, list_sales, rng=None):
+    """Membuat nama pelanggan unik beserta alamat dan salesman pemegangnya.
+
+    Nama diambil tanpa pengembalian dari ruang nama yang sudah dienumerasi, jadi selalu unik
+    dan O(n). Permintaan di atas kapasitas dibatasi ke kapasitas dengan peringatan.
+    """
+    if rng is None: rng = np.random.default_rng()
+    semua_nama, peluang = ruang_nama_pelanggan()
+    if total_pelanggan > len(semua_nama):
+        print(f"   -> Peringatan: diminta {total_pelanggan} pelanggan, maksimum nama unik {len(semua_nama)}. "
+              f"Dipakai {len(semua_nama)} pelanggan.")
+        total_pelanggan = len(semua_nama)
+
+    print(f"   -> Menciptakan {total_pelanggan} nama pelanggan realistis (kapasitas {len(semua_nama)})...")
+    nama = semua_nama[rng.choice(len(semua_nama), size=total_pelanggan, replace=False, p=peluang / peluang.sum())]
+
+    jalan = np.array(JALAN_SEMARANG_REAL, dtype=object)[rng.integers(0, len(JALAN_SEMARANG_REAL), total_pelanggan)]
+    nomor = rng.integers(1, 901, total_pelanggan)
+    pakai_kav = rng.random(total_pelanggan) > 0.7
+    kav = rng.integers(1, 6, total_pelanggan)
+    sales = rng.integers(0, len(list_sales), total_pelanggan)
 
-    # --- GENERATE PELANGGAN & SALES MAPPING ---
     pelanggan_data = {}
     pelanggan_sales_map = {}
-    
-    print("   -> Menciptakan nama pelanggan realistis...")
-    tries = 0
-    while len(pelanggan_data) < total_pelanggan:
-        pola = random.choice([1, 1, 2, 2, 3])
-        if pola == 1:
-            nama_baru = f"{random.choice(prefix_usaha)} {random.choice(nama_sifat)} {random.choice(nama_orang_jawa)}"
-        elif pola == 2:
-            nama_baru = f"{random.choice(prefix_usaha)} {random.choice(nama_sifat)} {random.choice(suffix_tempat)}"
+    for i, nama_fix in enumerate(nama):
+        if pakai_kav[i]:
+            pelanggan_data[nama_fix] = f"{jalan[i]} No. {nomor[i]} Kav. {kav[i]}, Semarang"
         else:
-            nama_baru = f"{random.choice(prefix_usaha)} {random.choice(nama_orang_jawa)} {random.choice(suffix_tempat)}"
-            
-        nama_split = nama_baru.split()
-        nama_fix = " ".join(sorted(set(nama_split), key=nama_split.index))
-
-        if nama_fix not in pelanggan_data:
-            jalan = random.choice(jalan_semarang_real)
-            nomor = random.randint(1, 900)
-            if random.random() > 0.7: 
-                alamat_fix = f"{jalan} No. {nomor} Kav. {random.randint(1,5)}, Semarang"
-            else:
-                alamat_fix = f"{jalan} No. {nomor}, Semarang"
-            
-            pelanggan_data[nama_fix] = alamat_fix
-            pelanggan_sales_map[nama_fix] = random.choice(list_sales)
-        tries += 1
-        if tries > 10000: break
-    pelanggan_names = list(pelanggan_data.keys())
+            pelanggan_data[nama_fix] = f"{jalan[i]} No. {nomor[i]}, Semarang"
+        pelanggan_sales_map[nama_fix] = list_sales[sales[i]]
+    return pelanggan_data, pelanggan_sales_map
 
-    # --- 1. SHEET PENJUALAN ---
-    print(f"\nMemulai proses generate {total_data} transaksi...")
+# --- GENERATOR TRANSAKSI PENJUALAN ---
+def generate_penjualan_loop(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, daftar_barang):
+    """Versi lama per baris (random + datetime), disimpan sebagai pembanding benchmark."""
+    pelanggan_names = list(pelanggan_data.keys())
     data_penjualan = []
     inv_counter = 1001
     
@@ -107,122 +121,436 @@ def generate_dynamic_dummy_v9():
         qty = random.randint(1, 50)
         total = harga * qty
         diskon = 0
-        if total > 500000: diskon = random.choice([0, 5000, 10000, 25000])
+        if total > 500000: diskon = random.choice(PILIHAN_DISKON)
         retur = random.choices([0, harga], weights=[97, 3])[0] 
         netto = total - diskon - retur
-        top = random.choice(["14 Hari", "30 Hari"])
+        top = random.choice(PILIHAN_TOP)
         
         data_penjualan.append([tgl, cust_nama, cust_alamat, sales, inv_no, top, barang, qty, harga, total, diskon, retur, netto])
         inv_counter += 1
 
-    df_penjualan = pd.DataFrame(data_penjualan, columns=[
-        'Tanggal', 'Nama Pelanggan', 'Alamat', 'Nama Sales', 'No. Faktur', 'TOP', 
-        'Nama Barang', 'Qty', 'Harga Satuan', 'Total', 'Diskon', 'Retur', 'Netto'
-    ]).sort_values('Tanggal')
+    return pd.DataFrame(data_penjualan, columns=KOLOM_PENJUALAN).sort_values('Tanggal')
 
-    # --- 2. SHEET SALDO AWAL (PIUTANG) ---
-    print("Menyusun data Saldo Awal...")
+def generate_penjualan(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, daftar_barang, rng=None):
+    """Membuat sheet Penjualan sekaligus dengan array NumPy.
+
+    Distribusi tiap kolom sama dengan generate_penjualan_loop (tanggal 1-28, qty 1-50,
+    diskon hanya jika total > 500.000, retur 3%), dan hasilnya bisa diulang lewat rng berseed.
+    """
+    if rng is None: rng = np.random.default_rng()
+    pelanggan_names = np.array(list(pelanggan_data.keys()), dtype=object)
+    pelanggan_alamat = np.array([pelanggan_data[n] for n in pelanggan_names], dtype=object)
+    pelanggan_sales = np.array([pelanggan_sales_map[n] for n in pelanggan_names], dtype=object)
+    nama_barang = np.array(list(daftar_barang.keys()), dtype=object)
+    harga_barang = np.array(list(daftar_barang.values()), dtype=np.int64)
+
+    tgl = np.datetime64(f"{tahun}-{bulan:02d}-01") + rng.integers(0, 28, total_data).astype('timedelta64[D]')
+    idx_cust = rng.integers(0, len(pelanggan_names), total_data)
+    idx_barang = rng.integers(0, len(nama_barang), total_data)
+    harga = harga_barang[idx_barang]
+    qty = rng.integers(1, 51, total_data)
+    total = harga * qty
+    diskon = np.where(total > 500000, rng.choice(np.array(PILIHAN_DISKON, dtype=np.int64), total_data), 0)
+    retur = np.where(rng.random(total_data) < 0.03, harga, 0)
+    netto = total - diskon - retur
+    top = np.array(PILIHAN_TOP, dtype=object)[rng.integers(0, len(PILIHAN_TOP), total_data)]
+    inv_no = pd.Series(np.arange(1001, 1001 + total_data)).astype(str).radd(f"INV/SMG/{tahun}/{bulan:02d}/")
+
+    df_penjualan = pd.DataFrame({
+        'Tanggal': tgl.astype('datetime64[ns]'),
+        'Nama Pelanggan': pelanggan_names[idx_cust],
+        'Alamat': pelanggan_alamat[idx_cust],
+        'Nama Sales': pelanggan_sales[idx_cust],
+        'No. Faktur': inv_no.to_numpy(dtype=object),
+        'TOP': top,
+        'Nama Barang': nama_barang[idx_barang],
+        'Qty': qty, 'Harga Satuan': harga, 'Total': total,
+        'Diskon': diskon, 'Retur': retur, 'Netto': netto,
+    }, columns=KOLOM_PENJUALAN)
+    # Sort stabil agar nomor faktur tetap urut di dalam tanggal yang sama
+    return df_penjualan.sort_values('Tanggal', kind='stable')
+
+# --- GENERATOR TARGET SALES ---
+def buat_target(df_penjualan, list_sales, daftar_barang, persen_ach, variasi, rng=None):
+    """Target per (sales, barang) dihitung mundur dari penjualan aktual, sekaligus untuk semua kombinasi.
+
+    Penjualan aktual diringkas sekali lalu di-reindex ke MultiIndex lengkap sales x barang,
+    sehingga biayanya linear terhadap jumlah kombinasi. Hasilnya pivot dengan baris GRAND TOTAL.
+    """
+    if rng is None: rng = np.random.default_rng()
+    # Pastikan semua kombinasi sales & barang ada targetnya, meski penjualan 0
+    semua_kombinasi = pd.MultiIndex.from_product([list_sales, list(daftar_barang)], names=['Nama Sales', 'Nama Barang'])
+    actual_qty = (df_penjualan.groupby(['Nama Sales', 'Nama Barang'])['Qty'].sum()
+                  .reindex(semua_kombinasi, fill_value=0).to_numpy())
+    # from_product berurutan sales-major, jadi harga barang cukup diulang per salesman
+    harga = np.tile(np.array(list(daftar_barang.values()), dtype=np.int64), len(list_sales))
+    jumlah = len(semua_kombinasi)
+
+    # --- LOGIKA TARGET REALISTIS ---
+    # Agar tidak flat 95% semua, tiap kombinasi diberi noise +/- variasi
+    target_ratio = persen_ach + rng.uniform(-variasi, variasi, jumlah)
+    # Mencegah ratio 0 atau negatif
+    target_ratio = np.where(target_ratio <= 0.1, 0.5, target_ratio)
+
+    # Ada penjualan: Target = Actual / Ratio (jual 100, ratio 0.9 -> target 111)
+    # Tanpa penjualan: target kecil dummy 5-20 (potensi lost sales)
+    target_qty_calc = np.where(actual_qty > 0, (actual_qty / target_ratio).astype(np.int64), rng.integers(5, 21, jumlah))
+
+    # Bulatkan ke kelipatan 5, minimal 5
+    target_qty_final = (np.round(target_qty_calc / 5) * 5).astype(np.int64)
+    target_qty_final[target_qty_final == 0] = 5
+
+    df_raw_target = pd.DataFrame({
+        'Nama Barang': semua_kombinasi.get_level_values('Nama Barang'),
+        'Nama Sales': semua_kombinasi.get_level_values('Nama Sales'),
+        'Target Qty': target_qty_final,
+        'Target Value': target_qty_final * harga,
+    })
+
+    # Pivot Multi-Index
+    df_pivot = df_raw_target.pivot_table(
+        index='Nama Barang', columns='Nama Sales', values=['Target Qty', 'Target Value'], aggfunc='sum', fill_value=0
+    )
+    df_pivot = df_pivot.swaplevel(0, 1, axis=1)
+    df_pivot.sort_index(axis=1, level=0, inplace=True)
+    df_pivot.loc['GRAND TOTAL'] = df_pivot.sum()
+    return df_pivot
+
+# --- GENERATOR SALDO AWAL & PEMBAYARAN ---
+KATEGORI_AGING = ["-30 Hari", "-25 Hari", "-15 Hari", "0 Hari", "5 Hari", "7 Hari", "30 Hari", "32 Hari", "45 Hari"]
+KOLOM_SALDO = ['Tanggal Faktur', 'No. Faktur Lama', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang', 'Kategori Umur Piutang']
+KOLOM_PEMBAYARAN = ['Tanggal Bayar', 'Nama Pelanggan', 'Nama Sales', 'No. Faktur', 'Jumlah Bayar', 'Metode']
+
+def generate_saldo_loop(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, rnd=random):
+    """Versi lama per pelanggan, disimpan sebagai pembanding benchmark."""
     data_saldo = []
     ref_date = datetime(tahun, bulan, 1)
-    kategori_aging_list = ["-30 Hari", "-25 Hari", "-15 Hari", "0 Hari", "5 Hari", "7 Hari", "30 Hari", "32 Hari", "45 Hari"]
     
-    for p_nama in pelanggan_names[:int(total_pelanggan * 0.35)]:
+    for p_nama in pelanggan_saldo:
         sales_saldo = pelanggan_sales_map[p_nama]
-        sisa_piutang = random.randint(5, 150) * 50000
-        aging_choice = random.choice(kategori_aging_list)
+        sisa_piutang = rnd.randint(5, 150) * 50000
+        aging_choice = rnd.choice(KATEGORI_AGING)
         days_offset = int(aging_choice.split()[0])
         standard_top = 30 
         invoice_age_days = standard_top + days_offset
         if invoice_age_days < 1: invoice_age_days = 1
         real_inv_date = ref_date - timedelta(days=invoice_age_days)
-        no_faktur_lama = f"INV/SMG/{real_inv_date.year}/{real_inv_date.month:02d}/{random.randint(100, 999)}"
+        no_faktur_lama = f"INV/SMG/{real_inv_date.year}/{real_inv_date.month:02d}/{rnd.randint(100, 999)}"
         data_saldo.append([real_inv_date, no_faktur_lama, p_nama, sales_saldo, sisa_piutang, aging_choice])
 
-    df_saldo = pd.DataFrame(data_saldo, columns=[
-        'Tanggal Faktur', 'No. Faktur Lama', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang', 'Kategori Umur Piutang'
-    ]).sort_values('Tanggal Faktur')
+    return pd.DataFrame(data_saldo, columns=KOLOM_SALDO).sort_values('Tanggal Faktur')
 
-    # --- 3. SHEET PEMBAYARAN ---
-    print("Menyusun data Pembayaran...")
+def generate_saldo(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, rng=None):
+    """Saldo awal piutang untuk daftar pelanggan, dibuat sekaligus dengan array.
+
+    Umur faktur = TOP standar 30 hari + offset kategori aging (minimal 1 hari) dihitung
+    mundur dari tanggal 1 bulan berjalan, sama seperti generate_saldo_loop.
+    """
+    if rng is None: rng = np.random.default_rng()
+    nama = np.array(pelanggan_saldo, dtype=object)
+    jumlah = len(nama)
+    offset_aging = np.array([int(k.split()[0]) for k in KATEGORI_AGING])
+
+    idx_aging = rng.integers(0, len(KATEGORI_AGING), jumlah)
+    umur_faktur = np.maximum(30 + offset_aging[idx_aging], 1)
+    tgl_faktur = pd.Series(np.datetime64(f"{tahun}-{bulan:02d}-01") - umur_faktur.astype('timedelta64[D]')).astype('datetime64[ns]')
+    no_faktur = tgl_faktur.dt.strftime("INV/SMG/%Y/%m/") + pd.Series(rng.integers(100, 1000, jumlah)).astype(str)
+
+    df_saldo = pd.DataFrame({
+        'Tanggal Faktur': tgl_faktur,
+        'No. Faktur Lama': no_faktur.to_numpy(dtype=object),
+        'Nama Pelanggan': nama,
+        'Nama Sales': np.array([pelanggan_sales_map[n] for n in nama], dtype=object),
+        'Sisa Piutang': rng.integers(5, 151, jumlah) * 50000,
+        'Kategori Umur Piutang': np.array(KATEGORI_AGING, dtype=object)[idx_aging],
+    }, columns=KOLOM_SALDO)
+    return df_saldo.sort_values('Tanggal Faktur', kind='stable')
+
+def generate_pembayaran_loop(tahun, bulan, df_penjualan, df_saldo, rnd=random, rng=None):
+    """Versi lama berbasis iterrows, disimpan sebagai pembanding benchmark."""
     data_pembayaran = []
-    df_pelunasan_current = df_penjualan.sample(frac=0.6)
+    df_pelunasan_current = df_penjualan.sample(frac=0.6, random_state=rng)
     for _, row in df_pelunasan_current.iterrows():
-        hari_tambah = random.randint(1, 14)
+        hari_tambah = rnd.randint(1, 14)
         tgl_b = row['Tanggal'] + timedelta(days=hari_tambah)
         if tgl_b.month == bulan:
-            metode = random.choices(["TRANSFER", "TUNAI"], weights=[70, 30])[0]
+            metode = rnd.choices(["TRANSFER", "TUNAI"], weights=[70, 30])[0]
             data_pembayaran.append([tgl_b, row['Nama Pelanggan'], row['Nama Sales'], row['No. Faktur'], row['Netto'], metode])
     
-    for _, row in df_saldo.sample(frac=0.7).iterrows():
-        tgl_b = datetime(tahun, bulan, random.randint(1, 28))
-        metode = random.choices(["TRANSFER", "TUNAI"], weights=[80, 20])[0]
+    for _, row in df_saldo.sample(frac=0.7, random_state=rng).iterrows():
+        tgl_b = datetime(tahun, bulan, rnd.randint(1, 28))
+        metode = rnd.choices(["TRANSFER", "TUNAI"], weights=[80, 20])[0]
         data_pembayaran.append([tgl_b, row['Nama Pelanggan'], row['Nama Sales'], row['No. Faktur Lama'], row['Sisa Piutang'], metode])
 
-    df_pembayaran = pd.DataFrame(data_pembayaran, columns=[
-        'Tanggal Bayar', 'Nama Pelanggan', 'Nama Sales', 'No. Faktur', 'Jumlah Bayar', 'Metode'
-    ]).sort_values('Tanggal Bayar')
+    return pd.DataFrame(data_pembayaran, columns=KOLOM_PEMBAYARAN).sort_values('Tanggal Bayar')
+
+def generate_pembayaran(tahun, bulan, df_penjualan, df_saldo, rng=None):
+    """Pembayaran bulan berjalan dengan operasi array.
+
+    60% faktur penjualan dibayar 1-14 hari setelah tanggal faktur (hanya yang masih jatuh
+    di bulan yang sama, 70% transfer), ditambah 70% saldo awal yang dilunasi tanggal 1-28
+    (80% transfer).
+    """
+    if rng is None: rng = np.random.default_rng()
+    lunas = df_penjualan.sample(frac=0.6, random_state=rng)
+    tgl_bayar = lunas['Tanggal'] + pd.to_timedelta(rng.integers(1, 15, len(lunas)), unit='D')
+    metode = np.where(rng.random(len(lunas)) < 0.7, "TRANSFER", "TUNAI").astype(object)
+    df_lunas = pd.DataFrame({
+        'Tanggal Bayar': tgl_bayar.to_numpy(),
+        'Nama Pelanggan': lunas['Nama Pelanggan'].to_numpy(),
+        'Nama Sales': lunas['Nama Sales'].to_numpy(),
+        'No. Faktur': lunas['No. Faktur'].to_numpy(),
+        'Jumlah Bayar': lunas['Netto'].to_numpy(),
+        'Metode': metode,
+    })
+    # Cut-off: pembayaran yang jatuh di bulan berikutnya tidak ikut
+    df_lunas = df_lunas[(tgl_bayar.dt.month == bulan).to_numpy()]
+
+    saldo = df_saldo.sample(frac=0.7, random_state=rng)
+    tgl_saldo = np.datetime64(f"{tahun}-{bulan:02d}-01") + rng.integers(0, 28, len(saldo)).astype('timedelta64[D]')
+    df_saldo_lunas = pd.DataFrame({
+        'Tanggal Bayar': tgl_saldo.astype('datetime64[ns]'),
+        'Nama Pelanggan': saldo['Nama Pelanggan'].to_numpy(),
+        'Nama Sales': saldo['Nama Sales'].to_numpy(),
+        'No. Faktur': saldo['No. Faktur Lama'].to_numpy(),
+        'Jumlah Bayar': saldo['Sisa Piutang'].to_numpy(),
+        'Metode': np.where(rng.random(len(saldo)) < 0.8, "TRANSFER", "TUNAI").astype(object),
+    })
+
+    df_pembayaran = pd.concat([df_lunas, df_saldo_lunas], ignore_index=True)
+    return df_pembayaran.sort_values('Tanggal Bayar', kind='stable')
+
+def ringkasan_statistik(df):
+    """Ringkasan distribusi sheet Penjualan untuk membandingkan dua generator."""
+    return {
+        'rata2 tanggal': df['Tanggal'].dt.day.mean(),
+        'rata2 qty': df['Qty'].mean(),
+        'rata2 harga': df['Harga Satuan'].mean(),
+        '% diskon > 0': (df['Diskon'] > 0).mean() * 100,
+        '% retur': (df['Retur'] > 0).mean() * 100,
+        '% TOP 30': (df['TOP'] == "30 Hari").mean() * 100,
+        'rata2 netto': df['Netto'].mean(),
+    }
+
+def ringkasan_saldo(df):
+    """Ringkasan distribusi sheet Saldo Awal."""
+    return {
+        'rata2 piutang': df['Sisa Piutang'].mean(),
+        'rata2 umur': (df['Tanggal Faktur'].max() - df['Tanggal Faktur']).dt.days.mean(),
+        '% aging > 0': df['Kategori Umur Piutang'].str.split().str[0].astype(int).gt(0).mean() * 100,
+    }
+
+def ringkasan_pembayaran(df, df_penjualan, df_saldo):
+    """Ringkasan distribusi sheet Pembayaran, porsi baris relatif terhadap sumbernya."""
+    dari_saldo = df['No. Faktur'].isin(df_saldo['No. Faktur Lama'])
+    return {
+        '% faktur lunas': (~dari_saldo).sum() / len(df_penjualan) * 100,
+        '% saldo lunas': dari_saldo.sum() / len(df_saldo) * 100,
+        '% transfer': (df['Metode'] == "TRANSFER").mean() * 100,
+        'rata2 tgl bayar': df['Tanggal Bayar'].dt.day.mean(),
+        'rata2 bayar': df['Jumlah Bayar'].mean(),
+    }
+
+def _ukur_generator(judul, jumlah, daftar_fungsi, ringkas):
+    """Menjalankan tiap generator sekali, mencetak baris/detik lalu tabel ringkasan distribusinya."""
+    hasil = {}
+    print(f"\n=== {judul} ===")
+    for nama, fungsi in daftar_fungsi:
+        waktu_mulai = time.perf_counter()
+        df = fungsi()
+        durasi = time.perf_counter() - waktu_mulai
+        hasil[nama] = ringkas(df)
+        print(f"--> {nama:<7}: {jumlah} baris sumber dalam {durasi:.3f} detik ({jumlah / durasi:,.0f} baris/detik)")
+
+    print(f"{'Statistik':<16}{'loop':>15}{'vektor':>15}")
+    for kunci in hasil["loop"]:
+        print(f"{kunci:<16}{hasil['loop'][kunci]:>15,.2f}{hasil['vektor'][kunci]:>15,.2f}")
+
+def benchmark_generator(total_data, bulan=1, tahun=2025, seed=2025):
+    """Membandingkan baris/detik generator loop vs vektor dan mencetak ringkasan distribusinya."""
+    list_sales = [f"Sales {i + 1}" for i in range(5)]
+    pelanggan_data, pelanggan_sales_map = generate_pelanggan(hitung_total_pelanggan(total_data), list_sales, np.random.default_rng(seed))
+
+    _ukur_generator("PENJUALAN", total_data, [
+        ("loop", lambda: generate_penjualan_loop(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, DAFTAR_BARANG)),
+        ("vektor", lambda: generate_penjualan(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, DAFTAR_BARANG,
+                                              np.random.default_rng(seed))),
+    ], ringkasan_statistik)
+
+    # Saldo & pembayaran dibandingkan di atas sumber yang sama agar hanya generatornya yang berbeda
+    df_penjualan = generate_penjualan(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, DAFTAR_BARANG,
+                                      np.random.default_rng(seed))
+    pelanggan_saldo = list(pelanggan_data)
+    _ukur_generator("SALDO AWAL", len(pelanggan_saldo), [
+        ("loop", lambda: generate_saldo_loop(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, random.Random(seed))),
+        ("vektor", lambda: generate_saldo(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, np.random.default_rng(seed))),
+    ], ringkasan_saldo)
+
+    df_saldo = generate_saldo(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, np.random.default_rng(seed))
+    _ukur_generator("PEMBAYARAN", len(df_penjualan) + len(df_saldo), [
+        ("loop", lambda: generate_pembayaran_loop(tahun, bulan, df_penjualan, df_saldo, random.Random(seed),
+                                                  np.random.default_rng(seed))),
+        ("vektor", lambda: generate_pembayaran(tahun, bulan, df_penjualan, df_saldo, np.random.default_rng(seed))),
+    ], lambda df: ringkasan_pembayaran(df, df_penjualan, df_saldo))
+
+def hitung_total_pelanggan(total_data):
+    """Logika rasio pelanggan: sekitar 3 x akar jumlah transaksi, minimal 5, maksimal jumlah transaksi."""
+    total_pelanggan = int(math.sqrt(total_data) * 3)
+    if total_pelanggan < 5: total_pelanggan = 5 
+    if total_pelanggan > total_data: total_pelanggan = total_data
+    return total_pelanggan
+
+def buat_dataset(bulan, total_data, list_sales, persen_ach=0.95, variasi=0.10, tahun=2025, seed=None, master=None):
+    """Membuat semua sheet data dummy tanpa input interaktif.
+
+    persen_ach dan variasi berupa pecahan (0.95 = 95%). Satu seed mengendalikan seluruh
+    angka acak, sehingga parameter dan seed yang sama selalu menghasilkan data yang sama.
+    master = (pelanggan_data, pelanggan_sales_map) dari generate_pelanggan untuk memakai
+    basis pelanggan yang sama antar bulan; jika None, pelanggan dibuat baru.
+    Mengembalikan dict DataFrame: penjualan, pembayaran, saldo, target.
+    """
+    if not 1 <= bulan <= 12: raise ValueError("Bulan harus 1-12!")
+    if total_data < 1: raise ValueError("Jumlah baris minimal 1!")
+    if not list_sales: raise ValueError("Minimal harus ada 1 salesman!")
+
+    # Satu Generator NumPy berseed untuk seluruh angka acak
+    rng = np.random.default_rng(seed)
+
+    # --- GENERATE PELANGGAN & SALES MAPPING ---
+    if master is None:
+        total_pelanggan = hitung_total_pelanggan(total_data)
+        pelanggan_data, pelanggan_sales_map = generate_pelanggan(total_pelanggan, list_sales, rng)
+    else:
+        pelanggan_data, pelanggan_sales_map = master
+        total_pelanggan = len(pelanggan_data)
+    pelanggan_names = list(pelanggan_data.keys())
+    daftar_barang = DAFTAR_BARANG
+
+    # --- 1. SHEET PENJUALAN ---
+    print(f"\nMemulai proses generate {total_data} transaksi...")
+    df_penjualan = generate_penjualan(tahun, bulan, total_data, pelanggan_data, pelanggan_sales_map, daftar_barang, rng)
+
+    # --- 2. SHEET SALDO AWAL (PIUTANG) ---
+    print("Menyusun data Saldo Awal...")
+    pelanggan_saldo = pelanggan_names[:int(total_pelanggan * 0.35)]
+    df_saldo = generate_saldo(tahun, bulan, pelanggan_saldo, pelanggan_sales_map, rng)
+
+    # --- 3. SHEET PEMBAYARAN ---
+    print("Menyusun data Pembayaran...")
+    df_pembayaran = generate_pembayaran(tahun, bulan, df_penjualan, df_saldo, rng)
 
     # --- 4. SHEET TARGET SALES REALISTIS ---
     print("Menyusun Target Realistis (Reverse Engineered from Sales)...")
-    
-    # Hitung Actual Sales dulu
-    actual_summary = df_penjualan.groupby(['Nama Sales', 'Nama Barang']).agg({'Qty': 'sum', 'Netto': 'sum'}).reset_index()
-    
-    raw_target_data = []
-    
-    # Pastikan semua kombinasi sales & barang ada targetnya, meski penjualan 0
-    for sales in list_sales:
-        for barang, harga in daftar_barang.items():
-            # Cari apakah ada penjualan
-            match = actual_summary[(actual_summary['Nama Sales'] == sales) & (actual_summary['Nama Barang'] == barang)]
-            
-            if not match.empty:
-                actual_qty = match.iloc[0]['Qty']
-            else:
-                actual_qty = 0
-            
-            # --- LOGIKA TARGET REALISTIS ---
-            # Hitung faktor variasi unik untuk item ini (Random Normal Distribution)
-            # Agar tidak flat 95% semua, kita beri noise +/- variasi
-            noise = np.random.uniform(-variasi, variasi) 
-            target_ratio = persen_ach + noise 
-            
-            # Mencegah ratio 0 atau negatif
-            if target_ratio <= 0.1: target_ratio = 0.5
-
-            if actual_qty > 0:
-                # Jika ada penjualan: Target = Actual / Ratio
-                # Contoh: Jual 100, Ratio 0.9 (90%) -> Target = 111
-                target_qty_calc = int(actual_qty / target_ratio)
-            else:
-                # Jika tidak ada penjualan, buat target kecil dummy (potensi lost sales)
-                target_qty_calc = random.randint(5, 20)
-            
-            # Bulatkan ke puluhan
-            target_qty_final = int(round(target_qty_calc / 5) * 5)
-            if target_qty_final == 0: target_qty_final = 5
-            
-            target_omzet = target_qty_final * harga
-            
-            raw_target_data.append({
-                'Nama Barang': barang,
-                'Nama Sales': sales,
-                'Target Qty': target_qty_final,
-                'Target Value': target_omzet
-            })
-
-    df_raw_target = pd.DataFrame(raw_target_data)
-    
-    # Pivot Multi-Index
-    df_pivot = df_raw_target.pivot_table(
-        index='Nama Barang', columns='Nama Sales', values=['Target Qty', 'Target Value'], aggfunc='sum', fill_value=0
-    )
-    df_pivot = df_pivot.swaplevel(0, 1, axis=1)
-    df_pivot.sort_index(axis=1, level=0, inplace=True)
-    df_pivot.loc['GRAND TOTAL'] = df_pivot.sum()
+    df_pivot = buat_target(df_penjualan, list_sales, daftar_barang, persen_ach, variasi, rng)
+
+    return {'penjualan': df_penjualan, 'pembayaran': df_pembayaran, 'saldo': df_saldo, 'target': df_pivot}
+
+# --- PENULISAN EXCEL ---
+BATAS_BARIS_EXCEL = 1048576
+UKURAN_SAMPEL_LEBAR = 10000
+UKURAN_CHUNK_TULIS = 50000
+KOLOM_ANGKA = ["Total", "Harga", "Netto", "Piutang", "Bayar", "Diskon", "Retur"]
+KOLOM_TENGAH = ["TOP", "Qty", "Umur"]
+
+def _buat_format(workbook):
+    return {
+        'tanggal': workbook.add_format({'num_format': '[$-id-ID]dd mmm yyyy', 'align': 'center'}),
+        'angka': workbook.add_format({'num_format': '#,##0'}),
+        'tengah': workbook.add_format({'align': 'center'}),
+        'header': workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}),
+        'total': workbook.add_format({'bold': True, 'bg_color': '#FFFF00', 'border': 1, 'num_format': '#,##0'}),
+    }
+
+def _lebar_kolom(seri, ukuran_sampel=UKURAN_SAMPEL_LEBAR):
+    """Lebar kolom dari sampel baris agar tidak perlu mengubah seluruh kolom jadi string."""
+    sampel = seri if len(seri) <= ukuran_sampel else seri.sample(ukuran_sampel, random_state=0)
+    panjang = sampel.astype(str).str.len().max() if len(sampel) else 0
+    return max(panjang, len(str(seri.name))) + 3
+
+def _atur_kolom(worksheet, df_ref, fmt):
+    for i, col in enumerate(df_ref.columns):
+        if "Tanggal" in col: worksheet.set_column(i, i, 18, fmt['tanggal'])
+        elif any(x in col for x in KOLOM_ANGKA): worksheet.set_column(i, i, 15, fmt['angka'])
+        elif any(x in col for x in KOLOM_TENGAH): worksheet.set_column(i, i, 15, fmt['tengah'])
+        else: worksheet.set_column(i, i, _lebar_kolom(df_ref[col]))
+
+def _atur_kolom_target(worksheet, df_pivot, fmt):
+    worksheet.set_column(0, 0, 25) 
+    col_start = 1
+    for i, col_tuple in enumerate(df_pivot.columns):
+        sales_name, type_col = col_tuple
+        if 'Qty' in type_col: worksheet.set_column(col_start + i, col_start + i, 12, fmt['angka'])
+        else: worksheet.set_column(col_start + i, col_start + i, 18, fmt['angka'])
+    worksheet.set_row(len(df_pivot) + 2, None, fmt['total'])
+
+def _nilai_excel(seri):
+    """Kolom DataFrame -> list nilai Python siap tulis; tanggal jadi serial Excel (format dari kolom)."""
+    if pd.api.types.is_datetime64_any_dtype(seri):
+        serial = (seri - pd.Timestamp("1899-12-30")) / pd.Timedelta(days=1)
+        return [None if pd.isna(v) else v for v in serial.tolist()]
+    return seri.tolist()
+
+def _tulis_sheet_stream(workbook, nama_sheet, df, fmt, baris_per_sheet=BATAS_BARIS_EXCEL - 1):
+    """Menulis df baris demi baris, dipecah ke sheet bernomor bila melebihi batas baris Excel."""
+    jumlah_sheet = max(1, math.ceil(len(df) / baris_per_sheet))
+    for bagian in range(jumlah_sheet):
+        nama = nama_sheet if jumlah_sheet == 1 else f"{nama_sheet} {bagian + 1}"
+        df_bagian = df.iloc[bagian * baris_per_sheet:(bagian + 1) * baris_per_sheet]
+        worksheet = workbook.add_worksheet(nama)
+        _atur_kolom(worksheet, df_bagian, fmt)
+        worksheet.write_row(0, 0, list(df_bagian.columns), fmt['header'])
+
+        # constant_memory: baris wajib ditulis berurutan, dikonversi per chunk agar memori tetap kecil
+        for mulai in range(0, len(df_bagian), UKURAN_CHUNK_TULIS):
+            chunk = df_bagian.iloc[mulai:mulai + UKURAN_CHUNK_TULIS]
+            for i, baris in enumerate(zip(*(_nilai_excel(chunk[col]) for col in chunk.columns))):
+                worksheet.write_row(1 + mulai + i, 0, baris)
+
+def _tulis_target_stream(workbook, df_pivot, fmt):
+    """Menulis pivot Target Sales dengan tata letak yang sama seperti DataFrame.to_excel (header 3 baris)."""
+    worksheet = workbook.add_worksheet('Target Sales')
+    _atur_kolom_target(worksheet, df_pivot, fmt)
+    worksheet.write(0, 0, df_pivot.columns.names[0], fmt['header'])
+    col = 1
+    for sales_name in df_pivot.columns.get_level_values(0).unique():
+        lebar = (df_pivot.columns.get_level_values(0) == sales_name).sum()
+        if lebar > 1: worksheet.merge_range(0, col, 0, col + lebar - 1, sales_name, fmt['header'])
+        else: worksheet.write(0, col, sales_name, fmt['header'])
+        col += lebar
+    worksheet.write_row(1, 1, list(df_pivot.columns.get_level_values(1)), fmt['header'])
+    worksheet.write(2, 0, df_pivot.index.name, fmt['header'])
+    for i, (barang, nilai) in enumerate(zip(df_pivot.index, df_pivot.to_numpy().tolist())):
+        worksheet.write(3 + i, 0, barang, fmt['header'])
+        worksheet.write_row(3 + i, 1, nilai)
+
+def simpan_excel(dataset, nama_file, stream=False):
+    """Menulis hasil buat_dataset ke satu file Excel berformat.
+
+    stream=True memakai xlsxwriter constant_memory (hanya satu baris di memori) dan memecah
+    sheet yang melebihi 1.048.576 baris ke sheet bernomor. Mode ini dipakai otomatis untuk
+    data yang tidak muat di satu sheet.
+    """
+    df_penjualan, df_pembayaran = dataset['penjualan'], dataset['pembayaran']
+    df_saldo, df_pivot = dataset['saldo'], dataset['target']
+
+    if not stream and max(len(df_penjualan), len(df_pembayaran), len(df_saldo)) >= BATAS_BARIS_EXCEL:
+        print("--> Data melebihi batas baris Excel, beralih ke mode stream (sheet dipecah).")
+        stream = True
+
+    print(f"Menyimpan ke {nama_file}{' (mode stream)' if stream else ''}...")
+    if stream:
+        import xlsxwriter
+        workbook = xlsxwriter.Workbook(nama_file, {'constant_memory': True})
+        # Tanggal pembuatan tetap agar file dari seed yang sama identik per byte
+        workbook.set_properties({'created': datetime(2000, 1, 1)})
+        fmt = _buat_format(workbook)
+        _tulis_sheet_stream(workbook, 'Penjualan', df_penjualan, fmt)
+        _tulis_sheet_stream(workbook, 'Pembayaran', df_pembayaran, fmt)
+        _tulis_sheet_stream(workbook, 'Saldo Awal', df_saldo, fmt)
+        _tulis_target_stream(workbook, df_pivot, fmt)
+        workbook.close()
+        return
 
-    # --- SAVING ---
-    print(f"Menyimpan ke {nama_file}...")
     with pd.ExcelWriter(nama_file, engine='xlsxwriter', datetime_format='[$-id-ID]dd mmm yyyy') as writer:
         df_penjualan.to_excel(writer, sheet_name='Penjualan', index=False)
         df_pembayaran.to_excel(writer, sheet_name='Pembayaran', index=False)
@@ -230,34 +558,227 @@ def generate_dynamic_dummy_v9():
         df_pivot.to_excel(writer, sheet_name='Target Sales')
 
         workbook = writer.book
-        indo_date_fmt = workbook.add_format({'num_format': '[$-id-ID]dd mmm yyyy', 'align': 'center'})
-        num_fmt = workbook.add_format({'num_format': '#,##0'})
-        center_fmt = workbook.add_format({'align': 'center'})
-        header_sub_fmt = workbook.add_format({'bold': True, 'align': 'center', 'bg_color': '#D3D3D3', 'border': 1, 'font_size': 9})
-        total_row_fmt = workbook.add_format({'bold': True, 'bg_color': '#FFFF00', 'border': 1, 'num_format': '#,##0'})
-
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
-            if sheet_name == 'Target Sales':
-                worksheet.set_column(0, 0, 25) 
-                col_start = 1
-                for i, col_tuple in enumerate(df_pivot.columns):
-                    sales_name, type_col = col_tuple
-                    if 'Qty' in type_col: worksheet.set_column(col_start + i, col_start + i, 12, num_fmt)
-                    else: worksheet.set_column(col_start + i, col_start + i, 18, num_fmt)
-                worksheet.set_row(len(df_pivot) + 2, None, total_row_fmt)
-            else:
-                if sheet_name == 'Penjualan': df_ref = df_penjualan
-                elif sheet_name == 'Pembayaran': df_ref = df_pembayaran
-                elif sheet_name == 'Saldo Awal': df_ref = df_saldo
-                for i, col in enumerate(df_ref.columns):
-                    max_len = max(df_ref[col].astype(str).map(len).max(), len(str(col))) + 3
-                    if "Tanggal" in col: worksheet.set_column(i, i, 18, indo_date_fmt)
-                    elif any(x in col for x in ["Total", "Harga", "Netto", "Piutang", "Bayar", "Diskon", "Retur"]): worksheet.set_column(i, i, 15, num_fmt)
-                    elif any(x in col for x in ["TOP", "Qty", "Umur"]): worksheet.set_column(i, i, 15, center_fmt)
-                    else: worksheet.set_column(i, i, max_len)
+        # Tanggal pembuatan tetap agar file dari seed yang sama identik per byte
+        workbook.set_properties({'created': datetime(2000, 1, 1)})
+        fmt = _buat_format(workbook)
 
+        _atur_kolom(writer.sheets['Penjualan'], df_penjualan, fmt)
+        _atur_kolom(writer.sheets['Pembayaran'], df_pembayaran, fmt)
+        _atur_kolom(writer.sheets['Saldo Awal'], df_saldo, fmt)
+        _atur_kolom_target(writer.sheets['Target Sales'], df_pivot, fmt)
+
+def _ukur_penulisan(total_data, seed, stream, nama_file):
+    """Dijalankan di proses terpisah agar RSS puncak tiap mode tidak tercampur."""
+    import contextlib, io, resource
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = buat_dataset(1, total_data, ["Sales 1", "Sales 2", "Sales 3"], seed=seed)
+        rss_awal = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        waktu_mulai = time.perf_counter()
+        simpan_excel(dataset, nama_file, stream)
+        durasi = time.perf_counter() - waktu_mulai
+    rss_puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam KB di Linux
+    return durasi, rss_awal / 1024, rss_puncak / 1024, os.path.getsize(nama_file)
+
+def benchmark_penulisan(total_data, seed=2025):
+    """Membandingkan waktu tulis dan RSS puncak mode standar vs stream, masing-masing di proses baru."""
+    import multiprocessing, tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    with tempfile.TemporaryDirectory() as folder:
+        for stream in (False, True):
+            nama_mode = "stream" if stream else "standar"
+            nama_file = os.path.join(folder, f"benchmark_{nama_mode}.xlsx")
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                durasi, rss_awal, rss_puncak, ukuran = pool.submit(_ukur_penulisan, total_data, seed, stream, nama_file).result()
+            print(f"--> {nama_mode:<8}: {total_data} baris ditulis dalam {durasi:.2f} detik ({total_data / durasi:,.0f} baris/detik), "
+                  f"RSS puncak {rss_puncak:,.0f} MB (+{rss_puncak - rss_awal:,.0f} MB saat menulis), file {ukuran / 1024 / 1024:.1f} MB")
+
+def generate_dataset(bulan, total_data, list_sales, persen_ach=0.95, variasi=0.10, tahun=2025, seed=None, nama_file=None,
+                     stream=False, kolumnar=True):
+    """API library: membuat data dummy lalu menyimpannya ke Excel, mengembalikan path file.
+
+    kolumnar=True juga menulis salinan Parquet per sheet (lihat muat_data.py) setelah Excel,
+    sehingga script analisis bisa memuatnya tanpa mem-parsing xlsx.
+    """
+    if nama_file is None: nama_file = f"Data_V9_Dummy_Bulan_{bulan}.xlsx"
+    dataset = buat_dataset(bulan, total_data, list_sales, persen_ach, variasi, tahun, seed)
+    simpan_excel(dataset, nama_file, stream)
+    if kolumnar:
+        simpan_kolumnar(nama_file, {'Penjualan': dataset['penjualan'], 'Pembayaran': dataset['pembayaran'],
+                                    'Saldo Awal': dataset['saldo'], 'Target Sales': dataset['target']})
     print(f"\nSUKSES! File: {os.path.abspath(nama_file)}")
+    return os.path.abspath(nama_file)
+
+# --- MODE BULK (BANYAK BULAN) ---
+def turunkan_seed(seed, tahun, bulan):
+    """Seed per bulan dari seed induk; hanya bergantung pada (seed, tahun, bulan), bukan urutan batch."""
+    return int(np.random.SeedSequence([seed, tahun, bulan]).generate_state(1, np.uint64)[0])
+
+def daftar_periode(awal, akhir):
+    """'2024-11', '2025-02' -> [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]"""
+    return [(p.year, p.month) for p in pd.period_range(awal, akhir, freq='M')]
+
+def _generate_bulan(tahun, bulan, total_data, list_sales, persen_ach, variasi, seed_bulan, master, nama_file,
+                    stream, kolumnar, kembalikan_data):
+    """Dijalankan di worker: satu bulan dibuat dan ditulis mandiri."""
+    import contextlib, io
+    waktu_mulai = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = buat_dataset(bulan, total_data, list_sales, persen_ach, variasi, tahun, seed_bulan, master)
+        simpan_excel(dataset, nama_file, stream)
+        if kolumnar:
+            simpan_kolumnar(nama_file, {'Penjualan': dataset['penjualan'], 'Pembayaran': dataset['pembayaran'],
+                                        'Saldo Awal': dataset['saldo'], 'Target Sales': dataset['target']})
+    return (tahun, bulan), time.perf_counter() - waktu_mulai, dataset if kembalikan_data else None
+
+def gabungkan_dataset(daftar_dataset):
+    """Dataset gabungan periode: penjualan & pembayaran disambung, saldo awal dari bulan pertama,
+    target dijumlah (termasuk baris GRAND TOTAL)."""
+    target = daftar_dataset[0]['target']
+    for dataset in daftar_dataset[1:]:
+        target = target.add(dataset['target'], fill_value=0)
+    return {
+        'penjualan': pd.concat([d['penjualan'] for d in daftar_dataset], ignore_index=True),
+        'pembayaran': pd.concat([d['pembayaran'] for d in daftar_dataset], ignore_index=True),
+        'saldo': daftar_dataset[0]['saldo'],
+        'target': target.astype(np.int64),
+    }
+
+def generate_bulk(awal, akhir, total_data, list_sales, persen_ach=0.95, variasi=0.10, seed=None, jumlah_worker=1,
+                  folder='.', stream=False, kolumnar=True, gabungan=False):
+    """Membuat data untuk setiap bulan dari awal s/d akhir ('YYYY-MM') secara paralel.
+
+    Master pelanggan & salesman dibuat sekali lalu dipakai semua bulan, sehingga histori antar
+    bulan konsisten. Tiap bulan memakai seed turunan dan ditulis ke file sendiri
+    (Data_V9_Dummy_Bulan_{bulan}_{tahun}.xlsx); gabungan=True juga menulis satu dataset periode penuh.
+    Mengembalikan daftar path file yang ditulis.
+    """
+    periode = daftar_periode(awal, akhir)
+    if not periode: raise ValueError("Periode kosong, pastikan awal <= akhir!")
+    if total_data < 1: raise ValueError("Jumlah baris minimal 1!")
+    if not list_sales: raise ValueError("Minimal harus ada 1 salesman!")
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+        print(f"--> Seed tidak diberikan, memakai seed {seed} (pakai --seed {seed} untuk mengulang)")
+
+    os.makedirs(folder, exist_ok=True)
+    print(f"--> Membuat master pelanggan untuk {len(periode)} bulan...")
+    master = generate_pelanggan(hitung_total_pelanggan(total_data), list_sales, np.random.default_rng(turunkan_seed(seed, 0, 0)))
+
+    tugas = {}
+    for tahun, bulan in periode:
+        nama_file = os.path.join(folder, f"Data_V9_Dummy_Bulan_{bulan}_{tahun}.xlsx")
+        tugas[(tahun, bulan)] = (tahun, bulan, total_data, list_sales, persen_ach, variasi, turunkan_seed(seed, tahun, bulan),
+                                 master, nama_file, stream, kolumnar, gabungan)
+
+    hasil = {}
+    waktu_mulai = time.perf_counter()
+    print(f"--> Memakai {jumlah_worker} worker untuk {len(periode)} bulan x {total_data} baris...")
+    if jumlah_worker <= 1:
+        for argumen in tugas.values():
+            periode_selesai, durasi, dataset = _generate_bulan(*argumen)
+            hasil[periode_selesai] = dataset
+            print(f"--> {periode_selesai[1]:02d}/{periode_selesai[0]} selesai dalam {durasi:.2f} detik")
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jumlah_worker) as pool:
+            futures = [pool.submit(_generate_bulan, *argumen) for argumen in tugas.values()]
+            for future in as_completed(futures):
+                periode_selesai, durasi, dataset = future.result()
+                hasil[periode_selesai] = dataset
+                print(f"--> {periode_selesai[1]:02d}/{periode_selesai[0]} selesai dalam {durasi:.2f} detik")
+
+    daftar_file = [os.path.abspath(argumen[8]) for argumen in tugas.values()]
+    print(f"--> {len(periode)} bulan selesai dalam {time.perf_counter() - waktu_mulai:.2f} detik")
+
+    if gabungan:
+        (tahun_awal, bulan_awal), (tahun_akhir, bulan_akhir) = periode[0], periode[-1]
+        nama_file = os.path.join(folder, f"Data_V9_Dummy_Gabungan_{tahun_awal}{bulan_awal:02d}_{tahun_akhir}{bulan_akhir:02d}.xlsx")
+        dataset = gabungkan_dataset([hasil[p] for p in periode])
+        simpan_excel(dataset, nama_file, stream)
+        if kolumnar:
+            simpan_kolumnar(nama_file, {'Penjualan': dataset['penjualan'], 'Pembayaran': dataset['pembayaran'],
+                                        'Saldo Awal': dataset['saldo'], 'Target Sales': dataset['target']})
+        daftar_file.append(os.path.abspath(nama_file))
+
+    print(f"\nSUKSES! {len(daftar_file)} file ditulis ke {os.path.abspath(folder)}")
+    return daftar_file
+
+def generate_dynamic_dummy_v9():
+    """Mode interaktif lama: parameter diminta lewat input()."""
+    print("=== GENERATOR DATA DUMMY ===")
+    
+    # --- INPUT USER ---
+    try:
+        bulan = int(input("Masukkan bulan (1-12): "))
+        total_data = int(input("Masukkan jumlah baris data penjualan: "))
+        
+        # --- FITUR BARU: KONTROL GAP TARGET ---
+        print("\n--- PENGATURAN TARGET ---")
+        print("Agar data realistis, target akan dibuat berdasarkan penjualan yang terjadi.")
+        persen_ach = float(input("Rata-rata % pencapaian yang diinginkan (misal 95 artinya target sedikit diatas omzet): ")) / 100
+        variasi = float(input("Variasi % antar sales (misal 10 artinya pencapaian berkisar +/- 10% dari rata-rata): ")) / 100
+        
+        jumlah_sales = int(input("\nBerapa jumlah Salesman? "))
+        list_sales = [input(f"Masukkan nama Salesman ke-{i+1}: ") for i in range(jumlah_sales)]
+            
+    except ValueError:
+        print("Input harus berupa angka!")
+        return
+
+    try:
+        generate_dataset(bulan, total_data, list_sales, persen_ach, variasi)
+    except ValueError as e:
+        print(e)
+
+def bilangan_positif(teks):
+    """Tipe argparse untuk bilangan bulat >= 1."""
+    try:
+        nilai = int(teks)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{teks}' bukan bilangan bulat")
+    if nilai < 1:
+        raise argparse.ArgumentTypeError(f"harus >= 1, bukan {nilai}")
+    return nilai
 
 if __name__ == "__main__":
-    generate_dynamic_dummy_v9()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generator data dummy penjualan. Tanpa --bulan, parameter diminta secara interaktif.")
+    parser.add_argument('--bulan', type=int, help="bulan data (1-12)")
+    parser.add_argument('--tahun', type=int, default=2025)
+    parser.add_argument('--baris', type=int, default=1000, help="jumlah baris data penjualan")
+    parser.add_argument('--persen-ach', type=float, default=95, help="rata-rata %% pencapaian target")
+    parser.add_argument('--variasi', type=float, default=10, help="variasi %% pencapaian antar sales")
+    parser.add_argument('--sales', nargs='+', default=["Sales 1", "Sales 2", "Sales 3"], help="nama-nama salesman")
+    parser.add_argument('--seed', type=int, help="seed acak; seed sama = dataset identik")
+    parser.add_argument('--output', help="nama file Excel (default Data_V9_Dummy_Bulan_<bulan>.xlsx)")
+    parser.add_argument('--stream', action='store_true', help="tulis Excel dengan constant_memory; sheet di atas 1.048.576 baris dipecah")
+    parser.add_argument('--tanpa-kolumnar', action='store_true', help="jangan tulis salinan Parquet per sheet")
+    parser.add_argument('--bulk', nargs=2, metavar=('AWAL', 'AKHIR'), help="mode banyak bulan, misal --bulk 2024-01 2025-12")
+    parser.add_argument('--worker', type=bilangan_positif, default=1, metavar='N',
+                        help=f"jumlah proses paralel mode bulk (mesin ini punya {os.cpu_count() or 1} core)")
+    parser.add_argument('--folder', default='.', help="folder output mode bulk")
+    parser.add_argument('--gabungan', action='store_true', help="mode bulk: tulis juga satu dataset gabungan seluruh periode")
+    parser.add_argument('--benchmark', type=int, metavar='BARIS', help="bandingkan kecepatan generator loop vs vektor untuk N baris")
+    parser.add_argument('--benchmark-tulis', type=int, metavar='BARIS', help="bandingkan waktu tulis & RSS puncak Excel standar vs stream")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_generator(args.benchmark)
+    elif args.benchmark_tulis:
+        benchmark_penulisan(args.benchmark_tulis)
+    elif args.bulk:
+        try:
+            generate_bulk(args.bulk[0], args.bulk[1], args.baris, args.sales, args.persen_ach / 100, args.variasi / 100,
+                          args.seed, args.worker, args.folder,
+                          args.stream, not args.tanpa_kolumnar, args.gabungan)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.bulan is not None:
+        try:
+            generate_dataset(args.bulan, args.baris, args.sales, args.persen_ach / 100, args.variasi / 100,
+                             args.tahun, args.seed, args.output, args.stream, not args.tanpa_kolumnar)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        generate_dynamic_dummy_v9()
@@ -3,6 +3,9 @@ import numpy as np
 import os
 import glob
 from datetime import datetime
+from cache_agregat import agregat
+
+KOLOM_PENJUALAN = ['Tanggal', 'Nama Pelanggan', 'No. Faktur', 'Nama Barang', 'Qty', 'Diskon', 'Netto']
 
 class SeniorMarketingAnalyst:
     def __init__(self):
@@ -25,20 +28,29 @@ class SeniorMarketingAnalyst:
     def run_analysis(self):
         if not self.selected_file: return
         
-        # Load Data
-        df = pd.read_excel(self.selected_file, sheet_name='Penjualan')
-        df['Kategori'] = df['Nama Pelanggan'].str.split().str[0]
+        # Agregat dasar (di-cache per isi file): per pelanggan x barang dan per pelanggan
+        def agregat_penjualan(by, nilai):
+            return agregat(self.selected_file, 'Penjualan', by, nilai, kolom=KOLOM_PENJUALAN)
+
+        per_pelanggan_barang = agregat_penjualan(['Nama Pelanggan', 'Nama Barang'], {'Netto': 'sum', 'Qty': 'sum'}).reset_index()
+        per_pelanggan = agregat_penjualan('Nama Pelanggan', {'No. Faktur': 'count', 'Netto': 'sum', 'Diskon': 'sum', 'Tanggal': 'max'})
+        per_pelanggan_barang['Kategori'] = per_pelanggan_barang['Nama Pelanggan'].str.split().str[0]
+        kategori = per_pelanggan.index.str.split().str[0]
 
         # --- LOGIKA ANALISIS ---
-        prof = df.groupby(['Kategori', 'Nama Barang'])['Netto'].sum().reset_index()
+        prof = per_pelanggan_barang.groupby(['Kategori', 'Nama Barang'])['Netto'].sum().reset_index()
         prof = prof.sort_values(['Kategori', 'Netto'], ascending=[True, False]).groupby('Kategori').head(1)
 
-        penetration = pd.pivot_table(df, values='Qty', index='Nama Barang', columns='Kategori', aggfunc='sum', fill_value=0)
+        penetration = pd.pivot_table(per_pelanggan_barang, values='Qty', index='Nama Barang', columns='Kategori', aggfunc='sum', fill_value=0)
 
-        roi = df.groupby('Kategori').agg({'Diskon': 'sum', 'Netto': 'sum', 'No. Faktur': 'count'}).reset_index()
+        roi = per_pelanggan[['Diskon', 'Netto', 'No. Faktur']].groupby(kategori).sum().rename_axis('Kategori').reset_index()
         roi['Rasio_Diskon'] = (roi['Diskon'] / (roi['Netto'] + roi['Diskon'])) * 100
 
-        loyalty = df.groupby('Nama Pelanggan').agg({'No. Faktur': 'count', 'Netto': 'sum', 'Tanggal': lambda x: (datetime.now() - x.max()).days}).rename(columns={'No. Faktur': 'Frekuensi', 'Netto': 'Nilai_Belanja', 'Tanggal': 'Hari_Sejak_Order_Terakhir'})
+        loyalty = pd.DataFrame({
+            'Frekuensi': per_pelanggan['No. Faktur'],
+            'Nilai_Belanja': per_pelanggan['Netto'],
+            'Hari_Sejak_Order_Terakhir': (datetime.now() - pd.to_datetime(per_pelanggan['Tanggal'])).dt.days,
+        })
 
         # Palette Warna Profesional
         colors = ['#4E79A7', '#F28E2B', '#E15759', '#76B7B2', '#59A14F', '#EDC948', '#B07AA1', '#FF9DA7', '#9C755F', '#BAB0AC'] * 3
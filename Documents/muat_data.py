@@ -0,0 +1,185 @@
+import os
+import re
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# --- SALINAN KOLUMNAR (PARQUET) ---
+# Tiap file Data_V9_Dummy_Bulan_X.xlsx boleh punya folder Data_V9_Dummy_Bulan_X.kolumnar/
+# berisi satu file Parquet per sheet. Parquet dibaca dalam milidetik, sedangkan
+# pd.read_excel harus mem-parsing XML seluruh sheet.
+EKSTENSI_KOLUMNAR = '.kolumnar'
+SHEET_DATA = ['Penjualan', 'Pembayaran', 'Saldo Awal', 'Target Sales']
+# Sheet yang di Excel punya header bertingkat dan kolom pertama sebagai index
+OPSI_EXCEL = {'Target Sales': {'header': [0, 1], 'index_col': 0}}
+
+# --- SKEMA KOLOM ---
+# dtype eksplisit agar pembaca Excel tidak perlu menebak tipe tiap sel; kolom tanggal dibiarkan ke parser
+SKEMA_SHEET = {
+    'Penjualan': {
+        'Nama Pelanggan': str, 'Alamat': str, 'Nama Sales': str, 'No. Faktur': str, 'TOP': str, 'Nama Barang': str,
+        'Qty': 'int64', 'Harga Satuan': 'int64', 'Total': 'int64', 'Diskon': 'int64', 'Retur': 'int64', 'Netto': 'int64',
+    },
+    'Pembayaran': {'Nama Pelanggan': str, 'Nama Sales': str, 'No. Faktur': str, 'Jumlah Bayar': 'int64', 'Metode': str},
+    'Saldo Awal': {
+        'No. Faktur Lama': str, 'Nama Pelanggan': str, 'Nama Sales': str, 'Sisa Piutang': 'int64', 'Kategori Umur Piutang': str,
+    },
+}
+
+def folder_kolumnar(file_xlsx):
+    return os.path.splitext(file_xlsx)[0] + EKSTENSI_KOLUMNAR
+
+def path_kolumnar(file_xlsx, sheet_name):
+    return os.path.join(folder_kolumnar(file_xlsx), f"{sheet_name}.parquet")
+
+def pyarrow_tersedia():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def simpan_kolumnar(file_xlsx, daftar_sheet):
+    """Menulis salinan Parquet per sheet di samping file Excel. daftar_sheet: {nama sheet: DataFrame}.
+
+    Butuh pyarrow; jika tidak terpasang, salinan dilewati dan loader tetap memakai Excel.
+    """
+    if not pyarrow_tersedia():
+        print("--> pyarrow tidak terpasang, salinan kolumnar dilewati (pip install pyarrow).")
+        return False
+
+    os.makedirs(folder_kolumnar(file_xlsx), exist_ok=True)
+    for sheet_name, df in daftar_sheet.items():
+        # Sheet biasa tanpa index (sama seperti hasil read_excel), pivot Target tetap dengan index barangnya
+        if sheet_name not in OPSI_EXCEL: df = df.reset_index(drop=True)
+        path = path_kolumnar(file_xlsx, sheet_name)
+        df.to_parquet(path + '.tmp', index=sheet_name in OPSI_EXCEL)
+        os.replace(path + '.tmp', path)
+    return True
+
+def kolumnar_masih_baru(file_xlsx, sheet_name):
+    """True jika salinan Parquet sheet ada dan tidak lebih tua dari file Excel-nya."""
+    path = path_kolumnar(file_xlsx, sheet_name)
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(file_xlsx)
+
+@lru_cache(maxsize=1)
+def engine_excel():
+    """'calamine' (parser Rust, berkali lipat lebih cepat) jika python-calamine terpasang, selain itu default pandas."""
+    try:
+        import python_calamine  # noqa: F401
+        return 'calamine'
+    except ImportError:
+        return None
+
+def _opsi_baca(sheet_name, kolom):
+    opsi = dict(OPSI_EXCEL.get(sheet_name, {}))
+    if sheet_name in OPSI_EXCEL:
+        # Header bertingkat tidak bisa diproyeksikan per nama kolom, sheet dibaca utuh
+        return opsi
+    skema = SKEMA_SHEET.get(sheet_name, {})
+    if kolom is not None:
+        opsi['usecols'] = list(kolom)
+        skema = {k: v for k, v in skema.items() if k in kolom}
+    opsi['dtype'] = skema
+    return opsi
+
+def _seragamkan_tanggal(df):
+    """Kolom tanggal selalu datetime64[ns]: pembaca Excel memberi [us], Parquet [ns]."""
+    kolom_tanggal = [k for k in df.columns if pd.api.types.is_datetime64_any_dtype(df[k]) and df[k].dtype != 'datetime64[ns]']
+    return df.astype({k: 'datetime64[ns]' for k in kolom_tanggal}) if kolom_tanggal else df
+
+def _baca_excel(file_xlsx, sheet_name, kolom=None):
+    """Membaca satu sheet (hanya kolom yang diminta); sheet yang dipecah writer stream
+    ('Penjualan 1', 'Penjualan 2', ...) digabung lagi."""
+    opsi = _opsi_baca(sheet_name, kolom)
+
+    def baca(xls, nama):
+        try:
+            df = pd.read_excel(xls, sheet_name=nama, **opsi)
+        except ValueError:
+            # File lama / diedit manual bisa punya sel kosong di kolom angka: baca tanpa dtype eksplisit
+            df = pd.read_excel(xls, sheet_name=nama, **{k: v for k, v in opsi.items() if k != 'dtype'})
+        # usecols mengikuti urutan sheet, Parquet mengikuti urutan permintaan
+        return df[opsi['usecols']] if 'usecols' in opsi else df
+
+    with pd.ExcelFile(file_xlsx, engine=engine_excel()) as xls:
+        if sheet_name in xls.sheet_names:
+            return _seragamkan_tanggal(baca(xls, sheet_name))
+        pola = re.compile(rf"^{re.escape(sheet_name)} (\d+)$")
+        bagian = sorted((int(m.group(1)), nama) for nama in xls.sheet_names if (m := pola.match(nama)))
+        if not bagian:
+            raise ValueError(f"Sheet '{sheet_name}' tidak ditemukan di {file_xlsx}")
+        return _seragamkan_tanggal(pd.concat([baca(xls, nama) for _, nama in bagian], ignore_index=True))
+
+def _baca_excel_terukur(file_xlsx, sheet_name, kolom):
+    """Dijalankan di worker: membaca satu sheet dan mengembalikan durasinya."""
+    waktu_mulai = time.perf_counter()
+    df = _baca_excel(file_xlsx, sheet_name, kolom)
+    return df, time.perf_counter() - waktu_mulai
+
+def _baca_kolumnar(file_xlsx, sheet_name, kolom):
+    # Salinan yang ditulis versi lama masih bisa menyimpan tanggal [us]
+    if sheet_name in OPSI_EXCEL or kolom is None:
+        return _seragamkan_tanggal(pd.read_parquet(path_kolumnar(file_xlsx, sheet_name)))
+    return _seragamkan_tanggal(pd.read_parquet(path_kolumnar(file_xlsx, sheet_name), columns=list(kolom)))
+
+def _simpan_cache(file_xlsx, sheet_name, df):
+    try:
+        simpan_kolumnar(file_xlsx, {sheet_name: df})
+    except (OSError, ValueError) as e:
+        print(f"--> Salinan kolumnar '{sheet_name}' gagal ditulis: {e}")
+
+def muat_sheet(file_xlsx, sheet_name, kolom=None, tulis_cache=True):
+    """Membaca satu sheet data, memakai salinan Parquet jika lebih baru dari Excel.
+
+    kolom membatasi kolom yang dibaca (berlaku untuk Parquet maupun Excel). Jika salinan
+    belum ada (atau Excel lebih baru), sheet dibaca dari Excel; salinannya hanya dibuat
+    dari pembacaan utuh (kolom=None) agar tidak tersimpan sebagian.
+    """
+    if pyarrow_tersedia() and kolumnar_masih_baru(file_xlsx, sheet_name):
+        return _baca_kolumnar(file_xlsx, sheet_name, kolom)
+
+    df = _baca_excel(file_xlsx, sheet_name, kolom)
+    if tulis_cache and kolom is None and pyarrow_tersedia():
+        _simpan_cache(file_xlsx, sheet_name, df)
+    return df
+
+def muat_data(file_xlsx, daftar_sheet=SHEET_DATA, kolom=None, tulis_cache=True, paralel=True):
+    """Membaca beberapa sheet sekaligus, mengembalikan dict {nama sheet: DataFrame}.
+
+    kolom: dict {nama sheet: daftar kolom} untuk proyeksi; sheet yang tidak disebut dibaca utuh.
+    Sheet yang harus dibaca dari Excel diparsing bersamaan di proses terpisah (paralel=True),
+    karena parser Excel terikat CPU. Waktu muat tiap sheet dicetak.
+    """
+    kolom = kolom or {}
+    waktu_mulai = time.perf_counter()
+    hasil, durasi, sumber = {}, {}, {}
+
+    perlu_excel = []
+    for sheet in daftar_sheet:
+        if pyarrow_tersedia() and kolumnar_masih_baru(file_xlsx, sheet):
+            waktu_sheet = time.perf_counter()
+            hasil[sheet] = _baca_kolumnar(file_xlsx, sheet, kolom.get(sheet))
+            durasi[sheet], sumber[sheet] = time.perf_counter() - waktu_sheet, "Parquet"
+        else:
+            perlu_excel.append(sheet)
+
+    if paralel and len(perlu_excel) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(perlu_excel), os.cpu_count() or 1)) as pool:
+            futures = {sheet: pool.submit(_baca_excel_terukur, file_xlsx, sheet, kolom.get(sheet)) for sheet in perlu_excel}
+            for sheet, future in futures.items():
+                hasil[sheet], durasi[sheet] = future.result()
+    else:
+        for sheet in perlu_excel:
+            hasil[sheet], durasi[sheet] = _baca_excel_terukur(file_xlsx, sheet, kolom.get(sheet))
+
+    for sheet in perlu_excel:
+        sumber[sheet] = f"Excel/{engine_excel() or 'openpyxl'}"
+        if tulis_cache and kolom.get(sheet) is None and pyarrow_tersedia():
+            _simpan_cache(file_xlsx, sheet, hasil[sheet])
+
+    for sheet in daftar_sheet:
+        print(f"    {sheet:<12}: {durasi[sheet]:7.3f} detik, {len(hasil[sheet]):>8} baris x {hasil[sheet].shape[1]} kolom ({sumber[sheet]})")
+    print(f"--> {len(daftar_sheet)} sheet dimuat dalam {time.perf_counter() - waktu_mulai:.3f} detik")
+    return {sheet: hasil[sheet] for sheet in daftar_sheet}
@@ -0,0 +1,243 @@
+import argparse
+import os
+import pickle
+import time
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+# --- MODEL RAMALAN HARIAN ---
+# Holt-Winters aditif (level + tren + musiman hari dalam minggu) untuk banyak seri sekaligus:
+# semua seri (total, per sales, per barang, per segmen, ...) disusun jadi satu matriks
+# [seri x hari] dan rekursinya berjalan satu kali per hari untuk seluruh seri (numpy).
+# Parameter smoothing dipilih per seri dari GRID_PARAMETER dalam pass yang sama: tiap kombinasi
+# jadi baris tambahan, lalu kombinasi dengan galat 1-langkah terkecil yang dipakai.
+HARI_MUSIM = 7
+GRID_PARAMETER = [(alpha, beta, gamma) for alpha in (0.1, 0.3, 0.5) for beta in (0.0, 0.05) for gamma in (0.05, 0.2)]
+HARI_PEMANASAN = 7  # galat hari-hari awal (inisialisasi) tidak ikut dinilai
+HORIZON_DEFAULT = 30
+
+def matriks_harian(df, kolom_seri=None, kolom_tanggal='Tanggal', kolom_nilai='Netto', tanggal=None):
+    """Data transaksi -> (nama seri, DatetimeIndex harian, array [seri x hari]). Hari tanpa transaksi = 0.
+
+    kolom_seri None berarti satu seri 'Total'; tanggal memaksa rentang hari tertentu (dipakai saat update).
+    """
+    hari = pd.to_datetime(df[kolom_tanggal]).dt.normalize()
+    kunci = df[kolom_seri].astype(str) if kolom_seri else pd.Series('Total', index=df.index)
+    tabel = df[kolom_nilai].groupby([kunci.to_numpy(), hari.to_numpy()]).sum().unstack(fill_value=0)
+    if tanggal is None:
+        tanggal = pd.date_range(tabel.columns.min(), tabel.columns.max(), freq='D') if len(tabel.columns) else pd.DatetimeIndex([])
+    tabel = tabel.reindex(columns=tanggal, fill_value=0)
+    return tabel.index.astype(str), pd.DatetimeIndex(tanggal), tabel.to_numpy(dtype='float64')
+
+def _rekursi(Y, hari_minggu, alpha, beta, gamma, level, tren, musim, sse, n, hari_ke):
+    """Menjalankan rekursi untuk kolom-kolom Y; semua argumen state diubah di tempat."""
+    baris = np.arange(len(level))
+    for t in range(Y.shape[1]):
+        h = hari_minggu[t]
+        y = Y[:, t]
+        galat = y - (level + tren + musim[:, h])
+        if hari_ke + t >= HARI_PEMANASAN:
+            sse += galat * galat
+            n += 1
+        level_baru = alpha * (y - musim[:, h]) + (1 - alpha) * (level + tren)
+        tren[:] = beta * (level_baru - level) + (1 - beta) * tren
+        musim[baris, h] = gamma * (y - level_baru) + (1 - gamma) * musim[:, h]
+        level[:] = level_baru
+
+def _awal(Y, hari_minggu):
+    """Level = rata-rata minggu pertama, musiman = rata-rata selisih per hari minggu terhadapnya."""
+    minggu_awal = Y[:, :min(Y.shape[1], 2 * HARI_MUSIM)]
+    level = Y[:, :min(Y.shape[1], HARI_MUSIM)].mean(axis=1)
+    musim = np.zeros((len(Y), HARI_MUSIM))
+    for h in range(HARI_MUSIM):
+        kolom = [t for t in range(minggu_awal.shape[1]) if hari_minggu[t] == h]
+        if kolom:
+            musim[:, h] = minggu_awal[:, kolom].mean(axis=1) - level
+    return level, np.zeros(len(Y)), musim
+
+def latih(nama, tanggal, Y, grid=GRID_PARAMETER):
+    """Melatih model untuk semua seri Y [seri x hari] sekaligus, mengembalikan state model (dict)."""
+    jumlah_seri, jumlah_grid = len(Y), len(grid)
+    hari_minggu = tanggal.dayofweek.to_numpy()
+    param = np.array(grid, dtype='float64')
+    # Baris (seri s, kombinasi g) ada di indeks g * jumlah_seri + s
+    alpha, beta, gamma = (np.repeat(param[:, i], jumlah_seri) for i in range(3))
+    level, tren, musim = (np.tile(x, (jumlah_grid,) + (1,) * (x.ndim - 1)) for x in _awal(Y, hari_minggu))
+    sse, n = np.zeros(jumlah_seri * jumlah_grid), np.zeros(jumlah_seri * jumlah_grid)
+    _rekursi(np.tile(Y, (jumlah_grid, 1)), hari_minggu, alpha, beta, gamma, level, tren, musim, sse, n, 0)
+
+    terbaik = sse.reshape(jumlah_grid, jumlah_seri).argmin(axis=0) * jumlah_seri + np.arange(jumlah_seri)
+    return {
+        'nama': pd.Index(nama), 'tanggal_akhir': tanggal[-1], 'jumlah_hari': len(tanggal),
+        'alpha': alpha[terbaik], 'beta': beta[terbaik], 'gamma': gamma[terbaik],
+        'level': level[terbaik], 'tren': tren[terbaik], 'musim': musim[terbaik],
+        'sse': sse[terbaik], 'n': n[terbaik],
+    }
+
+def perbarui(model, nama, tanggal, Y):
+    """Meneruskan state model dengan hari-hari baru (parameter tetap, tanpa melatih ulang riwayat).
+
+    tanggal harus dimulai tepat sehari setelah tanggal_akhir model. Seri yang belum dikenal model
+    diabaikan; seri model yang tidak muncul dianggap 0 pada hari-hari tersebut.
+    """
+    if len(tanggal) == 0:
+        return model
+    if tanggal[0] != model['tanggal_akhir'] + pd.Timedelta(days=1):
+        raise ValueError(f"Data baru harus mulai {model['tanggal_akhir'] + pd.Timedelta(days=1):%Y-%m-%d}, bukan {tanggal[0]:%Y-%m-%d}.")
+    baru = pd.DataFrame(Y, index=pd.Index(nama)).reindex(model['nama'], fill_value=0).to_numpy()
+    model = {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in model.items()}
+    _rekursi(baru, tanggal.dayofweek.to_numpy(), model['alpha'], model['beta'], model['gamma'],
+             model['level'], model['tren'], model['musim'], model['sse'], model['n'], model['jumlah_hari'])
+    model['tanggal_akhir'] = tanggal[-1]
+    model['jumlah_hari'] += len(tanggal)
+    return model
+
+def ramal(model, horizon=HORIZON_DEFAULT, keyakinan=0.95):
+    """Prediksi harian + interval untuk semua seri: DataFrame (Seri, Tanggal, Prediksi, Batas Bawah, Batas Atas).
+
+    Lebar interval memakai varians galat Holt: sigma^2 * (1 + sum_{j<h} (alpha + j*alpha*beta)^2)
+    (suku musiman diabaikan). Nilai negatif dipotong ke 0 karena penjualan tidak bisa negatif.
+    """
+    langkah = np.arange(1, horizon + 1)
+    tanggal = model['tanggal_akhir'] + pd.to_timedelta(langkah, unit='D')
+    hari_minggu = tanggal.dayofweek.to_numpy()
+
+    prediksi = model['level'][:, None] + model['tren'][:, None] * langkah + model['musim'][:, hari_minggu]
+    sigma = np.sqrt(model['sse'] / np.maximum(model['n'], 1))
+    j = np.arange(horizon)
+    suku = (model['alpha'][:, None] + j * model['alpha'][:, None] * model['beta'][:, None]) ** 2
+    suku[:, 0] = 0
+    lebar = NormalDist().inv_cdf(0.5 + keyakinan / 2) * sigma[:, None] * np.sqrt(1 + np.cumsum(suku, axis=1))
+
+    jumlah_seri = len(model['nama'])
+    return pd.DataFrame({
+        'Seri': np.repeat(model['nama'].to_numpy(), horizon),
+        'Tanggal': np.tile(tanggal, jumlah_seri),
+        'Prediksi': np.clip(prediksi, 0, None).ravel(),
+        'Batas Bawah': np.clip(prediksi - lebar, 0, None).ravel(),
+        'Batas Atas': (prediksi + lebar).ravel(),
+    })
+
+# --- BANYAK GRUP SEKALIGUS ---
+def matriks_grup(df, grup, kolom_tanggal='Tanggal', kolom_nilai='Netto', tanggal=None):
+    """grup: {nama grup: kolom seri atau None untuk total}. Nama seri jadi 'grup|seri'; satu matriks untuk semua."""
+    hari = pd.to_datetime(df[kolom_tanggal]).dt.normalize()
+    if tanggal is None:
+        tanggal = pd.date_range(hari.min(), hari.max(), freq='D')
+    daftar_nama, daftar_Y = [], []
+    for nama_grup, kolom in grup.items():
+        nama, tanggal, Y = matriks_harian(df, kolom, kolom_tanggal, kolom_nilai, tanggal)
+        daftar_nama.append(nama_grup + '|' + nama)
+        daftar_Y.append(Y)
+    return pd.Index(np.concatenate(daftar_nama)), tanggal, np.vstack(daftar_Y)
+
+def pisah_seri(df_ramalan):
+    """Kolom 'Seri' ('grup|seri') dari ramal() dipecah jadi kolom 'Grup' dan 'Seri'."""
+    bagian = df_ramalan['Seri'].str.split('|', n=1, regex=False)
+    return df_ramalan.assign(Grup=bagian.str[0], Seri=bagian.str[1])[['Grup', 'Seri'] + list(df_ramalan.columns[1:])]
+
+# --- STATE TERSIMPAN ---
+# State model disimpan di samping file data bersama checksum riwayat yang sudah diproses. Run
+# berikutnya hanya meneruskan state dengan hari-hari baru selama riwayat lama tidak berubah.
+
+def path_model(file_data):
+    return os.path.splitext(file_data)[0] + '.model_ramalan.pkl'
+
+def _checksum(Y):
+    return float(np.round(Y, 2).sum()), float(np.round(Y * np.arange(1, Y.shape[1] + 1), 2).sum())
+
+def latih_atau_perbarui(file_data, nama, tanggal, Y):
+    """Memakai state tersimpan bila seri sama dan riwayatnya tidak berubah; sisanya dilatih penuh."""
+    path = path_model(file_data)
+    model = None
+    try:
+        with open(path, 'rb') as f:
+            tersimpan = pickle.load(f)
+        lama = tersimpan['model']
+        jumlah_lama = tanggal.get_loc(lama['tanggal_akhir']) + 1 if lama['tanggal_akhir'] in tanggal else 0
+        if (jumlah_lama and lama['nama'].equals(pd.Index(nama)) and tanggal[0] == tersimpan['tanggal_awal']
+                and _checksum(Y[:, :jumlah_lama]) == tersimpan['checksum']):
+            model = perbarui(lama, nama, tanggal[jumlah_lama:], Y[:, jumlah_lama:])
+            print(f"--> Model ramalan diperbarui dengan {len(tanggal) - jumlah_lama} hari baru (tanpa latih ulang).")
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    if model is None:
+        model = latih(nama, tanggal, Y)
+        print(f"--> Model ramalan dilatih: {len(nama)} seri x {len(tanggal)} hari.")
+    try:
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump({'model': model, 'tanggal_awal': tanggal[0], 'checksum': _checksum(Y)}, f)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"--> State model ramalan gagal disimpan: {e}")
+    return model
+
+# --- BACKTEST ---
+def seri_sintetis(jumlah_seri, jumlah_hari, seed=2025):
+    """Seri harian dengan level, tren, pola hari dalam minggu dan noise (untuk backtest tanpa file data)."""
+    rng = np.random.default_rng(seed)
+    tanggal = pd.date_range('2025-01-01', periods=jumlah_hari, freq='D')
+    level = rng.uniform(5e6, 5e7, (jumlah_seri, 1))
+    tren = rng.normal(0, 0.002, (jumlah_seri, 1)) * level * np.arange(jumlah_hari)
+    pola = 1 + rng.normal(0, 0.25, (jumlah_seri, HARI_MUSIM))
+    Y = level * pola[:, tanggal.dayofweek] + tren + rng.normal(0, 0.1, (jumlah_seri, jumlah_hari)) * level
+    return pd.Index([f"Seri {i + 1}" for i in range(jumlah_seri)]), tanggal, np.clip(Y, 0, None)
+
+def ramal_garis_lurus(Y, horizon):
+    """Metode lama sales_analisis: satu np.polyfit garis lurus per seri, diekstrapolasi."""
+    x = np.arange(Y.shape[1])
+    hasil = []
+    for y in Y:
+        m, c = np.polyfit(x, y, 1)
+        hasil.append([m * (x[-1] + i) + c for i in range(1, horizon + 1)])
+    return np.array(hasil)
+
+def backtest(nama, tanggal, Y, horizon, keyakinan=0.95):
+    """Latih pada semua hari kecuali `horizon` terakhir, lalu bandingkan ramalan dengan data aktual."""
+    latih_Y, uji_Y = Y[:, :-horizon], Y[:, -horizon:]
+    latih_tanggal = tanggal[:-horizon]
+    total_aktual = np.abs(uji_Y).sum()
+
+    waktu_mulai = time.perf_counter()
+    model = latih(nama, latih_tanggal, latih_Y)
+    hasil = ramal(model, horizon, keyakinan)
+    durasi_hw = time.perf_counter() - waktu_mulai
+    prediksi = hasil['Prediksi'].to_numpy().reshape(len(nama), horizon)
+    di_interval = ((uji_Y >= hasil['Batas Bawah'].to_numpy().reshape(uji_Y.shape))
+                   & (uji_Y <= hasil['Batas Atas'].to_numpy().reshape(uji_Y.shape))).mean()
+
+    waktu_mulai = time.perf_counter()
+    prediksi_lama = ramal_garis_lurus(latih_Y, horizon)
+    durasi_lama = time.perf_counter() - waktu_mulai
+
+    # Update satu hari dari state vs latih ulang seluruh riwayat
+    model_awal = latih(nama, latih_tanggal[:-1], latih_Y[:, :-1])
+    waktu_mulai = time.perf_counter()
+    perbarui(model_awal, nama, latih_tanggal[-1:], latih_Y[:, -1:])
+    durasi_update = time.perf_counter() - waktu_mulai
+
+    print(f"--> {len(nama)} seri, latih {len(latih_tanggal)} hari, uji {horizon} hari")
+    print(f"--> Holt-Winters : WAPE {np.abs(prediksi - uji_Y).sum() / total_aktual:7.2%}, "
+          f"cakupan interval {keyakinan:.0%}: {di_interval:.1%}, latih+ramal {durasi_hw:.3f} detik")
+    print(f"--> Garis lurus  : WAPE {np.abs(prediksi_lama - uji_Y).sum() / total_aktual:7.2%}, "
+          f"tanpa interval, {durasi_lama:.3f} detik")
+    print(f"--> Update 1 hari dari state: {durasi_update * 1000:.1f} ms (latih penuh {durasi_hw * 1000:.1f} ms)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtest model ramalan harian (Holt-Winters multi-seri vs garis lurus).")
+    parser.add_argument('--file', help="file Data V9 (xlsx); tanpa ini dipakai seri sintetis")
+    parser.add_argument('--seri', type=int, default=500, help="jumlah seri sintetis")
+    parser.add_argument('--hari', type=int, default=180, help="panjang seri sintetis (hari)")
+    parser.add_argument('--horizon', type=int, default=14, help="jumlah hari terakhir yang dipakai sebagai data uji")
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    if args.file:
+        from muat_data import muat_sheet
+        df = muat_sheet(args.file, 'Penjualan', ['Tanggal', 'Nama Sales', 'Nama Barang', 'Netto'])
+        nama, tanggal, Y = matriks_grup(df, {'Total': None, 'Sales': 'Nama Sales', 'Barang': 'Nama Barang'})
+    else:
+        nama, tanggal, Y = seri_sintetis(args.seri, args.hari, args.seed)
+    backtest(nama, tanggal, Y, args.horizon)
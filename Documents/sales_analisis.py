@@ -2,8 +2,29 @@ import pandas as pd
 import numpy as np
 import glob
 import os
+import re
+import argparse
+import heapq
+import time
 import xlsxwriter
 from datetime import datetime, timedelta
+from muat_data import muat_data
+from cache_agregat import agregat
+from umur_piutang import LABEL_UMUR, hari_ini, muat_snapshot, simpan_snapshot
+from buku_piutang import buka_buku, faktur_ganda, perbarui_buku, piutang_terbuka_harian, rekap_umur_per_sales, top_piutang
+from peramalan import latih_atau_perbarui, matriks_grup, pisah_seri, ramal
+
+# Hanya kolom yang dipakai analisa yang dibaca dari file data (Target Sales selalu utuh)
+KOLOM_DIPAKAI = {
+    'Penjualan': ['Tanggal', 'Nama Pelanggan', 'Alamat', 'Nama Sales', 'Nama Barang', 'No. Faktur', 'Qty', 'Total', 'Diskon', 'Netto'],
+    'Pembayaran': ['No. Faktur', 'Jumlah Bayar'],
+    'Saldo Awal': ['Tanggal Faktur', 'No. Faktur Lama', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang'],
+}
+# Seri yang diramal sekaligus: {nama grup: kolom seri, None = total harian}
+GRUP_RAMALAN = {'Total': None, 'Sales': 'Nama Sales', 'Barang': 'Nama Barang', 'Segmen': 'Segmen'}
+HORIZON_RAMALAN = 30
+# Kolom tabel rincian piutang di laporan
+KOLOM_DETAIL = ['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Tagihan Awal', 'Jumlah Bayar', 'Sisa Piutang', 'Kategori']
 
 # --- FUNGSI BANTUAN ---
 
@@ -17,47 +38,101 @@ def pilih_file_target_realistic():
     print(f"--- Menganalisa File: {latest_file} ---")
     return latest_file
 
+# --- ATURAN SEGMEN PASAR ---
+# Dicek berurutan, aturan pertama yang cocok menang. Kata dicocokkan utuh (batas kata),
+# sehingga 'ud' mengenali "UD Maju" tetapi tidak "Budi".
+ATURAN_SEGMEN = [
+    ('Kuliner - Bakso', ['bakso']),
+    ('Kuliner - Sate', ['sate']),
+    ('Kuliner - Soto', ['soto']),
+    ('Kuliner - Mie', ['mie']),
+    ('Retail - Warung', ['warung']),
+    ('Retail - Toko', ['toko']),
+    ('Wholesale/Agen', ['ud', 'cv', 'agen']),
+    ('Horeka', ['catering', 'rumah makan', 'resto']),
+]
+SEGMEN_LAIN = 'Lainnya'
+
+def petakan_unik(series, fungsi):
+    """Menjalankan fungsi (berbasis Series) sekali per nilai berbeda, lalu memetakan hasilnya
+    kembali ke tiap baris lewat kode kategori. Biaya mengikuti jumlah nilai unik, bukan baris."""
+    kode, unik = pd.factorize(series, use_na_sentinel=False)
+    label = pd.Categorical(fungsi(pd.Series(unik, dtype=object)))
+    return pd.Series(pd.Categorical.from_codes(label.codes[kode], dtype=label.dtype), index=series.index, name=series.name)
+
 def segmentasi_pasar(nama):
-    nama = str(nama).lower()
-    if 'bakso' in nama: return 'Kuliner - Bakso'
-    if 'sate' in nama: return 'Kuliner - Sate'
-    if 'soto' in nama: return 'Kuliner - Soto'
-    if 'mie' in nama: return 'Kuliner - Mie'
-    if 'warung' in nama: return 'Retail - Warung'
-    if 'toko' in nama: return 'Retail - Toko'
-    if 'ud' in nama or 'cv' in nama or 'agen' in nama: return 'Wholesale/Agen'
-    if 'catering' in nama or 'rumah makan' in nama or 'resto' in nama: return 'Horeka'
-    return 'Lainnya'
+    """nama: Series nama pelanggan. Mengembalikan array segmen sesuai ATURAN_SEGMEN."""
+    nama = nama.astype(str)
+    kondisi = [nama.str.contains(r'\b(?:' + '|'.join(map(re.escape, kata)) + r')\b', case=False).to_numpy()
+               for _, kata in ATURAN_SEGMEN]
+    return np.select(kondisi, [segmen for segmen, _ in ATURAN_SEGMEN], SEGMEN_LAIN)
 
 def ekstrak_jalan(alamat):
-    try:
-        return alamat.split("No.")[0].strip() if "No." in alamat else alamat.split(",")[0].strip()
-    except: return "Unknown"
+    """alamat: Series alamat. Nama jalan = teks sebelum 'No.' (atau sebelum koma); bukan teks -> 'Unknown'."""
+    sebelum_no = alamat.str.split('No.', n=1, regex=False).str[0]
+    sebelum_koma = alamat.str.split(',', n=1, regex=False).str[0]
+    jalan = sebelum_no.where(alamat.str.contains('No.', regex=False).fillna(False).astype(bool), sebelum_koma)
+    return jalan.str.strip().fillna("Unknown")
+
+# --- PENULIS TABEL ---
+# Tabel laporan ditulis per blok kolom, bukan iterrows + satu ws.write per sel. Semua blok
+# satu sheet dikirim berurutan per baris agar workbook bisa memakai mode constant_memory
+# xlsxwriter (baris yang sudah lewat langsung di-flush ke disk, memori tidak ikut membesar).
+EPOCH_EXCEL = pd.Timestamp("1899-12-30")
 
-def hitung_umur_faktur(tgl_faktur):
-    if pd.isna(tgl_faktur): return 0
-    today = datetime.now() 
-    delta = (today - tgl_faktur).days
-    return delta
+def blok(baris, kolom, data, format_kolom):
+    """Satu blok tabel mulai (baris, kolom). data: DataFrame atau list kolom (Series/list/Index);
+    format_kolom: satu format untuk semua kolom atau list format per kolom."""
+    kolom_data = [data[c] for c in data.columns] if isinstance(data, pd.DataFrame) else list(data)
+    if not isinstance(format_kolom, (list, tuple)):
+        format_kolom = [format_kolom] * len(kolom_data)
+    return baris, kolom, kolom_data, list(format_kolom)
 
-def bucket_umur(hari):
-    if hari <= 0: return "-30 Hari - 0 Hari (Belum JT)"
-    elif hari <= 31: return "1 Hari - 31 Hari"
-    elif hari <= 60: return "32 Hari - 60 Hari"
-    else: return "> 60 Hari (Macet)"
+def header(baris, kolom, judul, fmt):
+    """Blok satu baris berisi teks judul/header."""
+    return blok(baris, kolom, [[j] for j in judul], fmt)
+
+def _penulis_kolom(ws, seri):
+    """(fungsi tulis, list nilai) untuk satu kolom; tanggal ditulis sebagai serial Excel (tampilan dari format).
+    Kolom yang seluruhnya angka/teks memakai write_number/write_string langsung (lewati deteksi tipe per sel)."""
+    if isinstance(seri, pd.Series) and pd.api.types.is_datetime64_any_dtype(seri):
+        serial = ((seri - EPOCH_EXCEL) / pd.Timedelta(days=1)).tolist()
+        if not seri.isna().any():
+            return ws.write_number, serial
+        return ws.write, [None if pd.isna(v) else v for v in serial]
+    if isinstance(seri, pd.Series) and pd.api.types.is_numeric_dtype(seri) and not pd.api.types.is_bool_dtype(seri):
+        return ws.write_number, seri.tolist()
+    nilai = seri.tolist() if isinstance(seri, (pd.Series, pd.Index)) else list(seri)
+    if all(isinstance(v, str) for v in nilai):
+        return ws.write_string, nilai
+    return ws.write, nilai
+
+def tulis_blok(ws, daftar_blok):
+    """Menulis semua blok satu sheet, urut per baris lalu kolom."""
+    def baris_blok(baris, kolom, kolom_data, format_kolom):
+        penulis = [_penulis_kolom(ws, seri) for seri in kolom_data]
+        fungsi = [f for f, _ in penulis]
+        for i, nilai in enumerate(zip(*(v for _, v in penulis))):
+            yield baris + i, kolom, nilai, fungsi, format_kolom
+
+    for r, k, nilai, fungsi, format_kolom in heapq.merge(*(baris_blok(*b) for b in daftar_blok), key=lambda x: x[:2]):
+        for j, (tulis, v, fmt) in enumerate(zip(fungsi, nilai, format_kolom)):
+            tulis(r, k + j, v, fmt)
 
 # --- MAIN LOGIC ---
 
-def run_analyst_v3():
+def run_analyst_v3(per_tanggal=None):
+    """per_tanggal: tanggal acuan umur piutang (default hari ini); tanggal tetap membuat laporan bisa diulang."""
+    # Satu tanggal acuan untuk seluruh laporan, agar rincian, rekap, dan top piutang tidak berbeda hari saat lewat tengah malam
+    per_tanggal = pd.Timestamp(per_tanggal).normalize() if per_tanggal is not None else hari_ini()
     input_file = pilih_file_target_realistic()
     if not input_file: return
 
     print("1. Membaca & Membersihkan Data...")
     try:
-        df_jual = pd.read_excel(input_file, sheet_name='Penjualan')
-        df_bayar = pd.read_excel(input_file, sheet_name='Pembayaran')
-        df_saldo = pd.read_excel(input_file, sheet_name='Saldo Awal')
-        df_target_raw = pd.read_excel(input_file, sheet_name='Target Sales', header=[0,1], index_col=0)
+        data = muat_data(input_file, kolom=KOLOM_DIPAKAI)
+        df_jual = data['Penjualan']
+        df_target_raw = data['Target Sales']
     except Exception as e:
         print(f"Error load data: {e}")
         return
@@ -68,34 +143,33 @@ def run_analyst_v3():
     print("2. Menyusun Dashboard & Forecasting...")
     
     df_jual['Tanggal'] = pd.to_datetime(df_jual['Tanggal'])
-    daily_sales = df_jual.groupby('Tanggal')['Netto'].sum().reset_index()
+    # Agregat yang sama dipakai laporan lain; dimemo per isi file di cache_agregat
+    daily_sales = agregat(input_file, 'Penjualan', 'Tanggal', {'Netto': 'sum'}, df=df_jual).reset_index()
     
     total_omzet = df_jual['Netto'].sum()
     total_transaksi = len(df_jual)
     avg_trx = total_omzet / total_transaksi if total_transaksi > 0 else 0
     
-    daily_sales['Day_Num'] = (daily_sales['Tanggal'] - daily_sales['Tanggal'].min()).dt.days
-    X = daily_sales['Day_Num'].values
-    y = daily_sales['Netto'].values
-    
-    df_forecast = pd.DataFrame()
+    # Semua seri (total, per sales, per barang, per segmen) diramal dalam satu model musiman harian;
+    # state model tersimpan di samping file data dan hanya diteruskan dengan hari-hari baru
+    df_jual['Segmen'] = petakan_unik(df_jual['Nama Pelanggan'], segmentasi_pasar)
+    df_ramalan = pd.DataFrame(columns=['Grup', 'Seri', 'Tanggal', 'Prediksi', 'Batas Bawah', 'Batas Atas'])
+    df_forecast = df_ramalan
     trend_desc = "Netral"
     
-    if len(X) > 1:
-        m, c = np.polyfit(X, y, 1)
-        trend_desc = "POSITIF (NAIK)" if m > 0 else "NEGATIF (TURUN)"
-        last_real_date = daily_sales['Tanggal'].max()
-        future_dates = [last_real_date + timedelta(days=i) for i in range(1, 31)]
-        future_vals = [(m * (X[-1] + i)) + c for i in range(1, 31)]
-        df_forecast = pd.DataFrame({'Tanggal': future_dates, 'Prediksi': future_vals})
+    if len(daily_sales) > 1:
+        nama_seri, tanggal_seri, Y = matriks_grup(df_jual, GRUP_RAMALAN)
+        model = latih_atau_perbarui(input_file, nama_seri, tanggal_seri, Y)
+        trend_desc = "POSITIF (NAIK)" if model['tren'][model['nama'].get_loc('Total|Total')] > 0 else "NEGATIF (TURUN)"
+        df_ramalan = pisah_seri(ramal(model, HORIZON_RAMALAN))
+        df_forecast = df_ramalan[df_ramalan['Grup'] == 'Total']
 
     # =========================================================================
     # B. ANALISIS PASAR & JALAN
     # =========================================================================
     print("3. Analisis Pasar (Segmentasi & Jalan)...")
     
-    df_jual['Segmen'] = df_jual['Nama Pelanggan'].apply(segmentasi_pasar)
-    segment_value = df_jual.groupby('Segmen')['Netto'].sum().reset_index().sort_values('Netto', ascending=False)
+    segment_value = df_jual.groupby('Segmen', observed=True)['Netto'].sum().reset_index().sort_values('Netto', ascending=False)
     
     top_segment = segment_value.iloc[0]['Segmen']
     top_contribution = (segment_value.iloc[0]['Netto'] / total_omzet) * 100
@@ -107,8 +181,8 @@ def run_analyst_v3():
     )
 
     # --- RESTORE: ANALISIS JALAN ---
-    df_jual['Jalan'] = df_jual['Alamat'].apply(ekstrak_jalan)
-    geo_sales = df_jual.groupby('Jalan')['Netto'].sum().reset_index().sort_values('Netto', ascending=False).head(10)
+    df_jual['Jalan'] = petakan_unik(df_jual['Alamat'], ekstrak_jalan)
+    geo_sales = df_jual.groupby('Jalan', observed=True)['Netto'].sum().reset_index().sort_values('Netto', ascending=False).head(10)
 
     # =========================================================================
     # C. EVALUASI TIM (INSENTIF & CHART TARGET)
@@ -122,11 +196,12 @@ def run_analyst_v3():
     
     sales_kpi_data = []
     sales_names = df_target_raw.columns.get_level_values(0).unique()
+    per_sales = agregat(input_file, 'Penjualan', 'Nama Sales', {'Netto': 'sum', 'Qty': 'sum'}, df=df_jual)['Netto']
     
     for sales in sales_names:
         try:
             tgt_val = df_target_raw[sales]['Target Value'].sum()
-            act_val = df_jual[df_jual['Nama Sales'] == sales]['Netto'].sum()
+            act_val = per_sales.get(sales, 0)
             ach_pct = act_val / tgt_val if tgt_val > 0 else 0
             
             insentif_rp = 0
@@ -162,31 +237,24 @@ def run_analyst_v3():
     # =========================================================================
     print("5. Kalkulasi Detail Piutang...")
     
-    df_old = df_saldo[['No. Faktur Lama', 'Tanggal Faktur', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang']].copy()
-    df_old.columns = ['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Tagihan Awal']
-    
-    df_new = df_jual[['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Netto']].copy()
-    df_new.columns = ['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Tagihan Awal']
-    
-    df_ar_master = pd.concat([df_old, df_new], ignore_index=True)
-    pay_per_inv = df_bayar.groupby('No. Faktur')['Jumlah Bayar'].sum().reset_index()
-    
-    df_ar_final = pd.merge(df_ar_master, pay_per_inv, on='No. Faktur', how='left').fillna(0)
-    df_ar_final['Sisa Piutang'] = df_ar_final['Tagihan Awal'] - df_ar_final['Jumlah Bayar']
-    df_ar_final = df_ar_final[df_ar_final['Sisa Piutang'] > 100].copy()
-    
-    df_ar_final['Tanggal'] = pd.to_datetime(df_ar_final['Tanggal'])
-    df_ar_final['Umur Hari'] = df_ar_final['Tanggal'].apply(hitung_umur_faktur)
-    df_ar_final['Kategori'] = df_ar_final['Umur Hari'].apply(bucket_umur)
-    
-    pivot_bucket = df_ar_final.pivot_table(index='Nama Sales', columns='Kategori', values='Sisa Piutang', aggfunc='sum', fill_value=0)
-    buckets = ["-30 Hari - 0 Hari (Belum JT)", "1 Hari - 31 Hari", "32 Hari - 60 Hari", "> 60 Hari (Macet)"]
-    for b in buckets:
-        if b not in pivot_bucket.columns: pivot_bucket[b] = 0
-    pivot_bucket = pivot_bucket[buckets]
+    # Buku piutang tersimpan di samping file data: hanya baris sheet yang baru yang diterapkan.
+    # Rincian run sebelumnya (snapshot aging) digeser ke tanggal acuan dan hanya baris yang berubah dibaca ulang.
+    buku = buka_buku(input_file)
+    try:
+        diterapkan = perbarui_buku(buku, data)
+        print("--> Buku piutang diperbarui: " + ", ".join(f"{sheet} +{n}" for sheet, n in diterapkan.items()))
+        ganda = faktur_ganda(buku)
+        if len(ganda):
+            print(f"--> Peringatan: {len(ganda)} No. Faktur dipakai lebih dari satu baris tagihan "
+                  f"({(ganda['Jumlah Pelanggan'] > 1).sum()} di antaranya milik pelanggan berbeda), dicatat terpisah.")
+        df_ar_final = piutang_terbuka_harian(buku, muat_snapshot(input_file), per_tanggal)
+        simpan_snapshot(input_file, df_ar_final)
+        pivot_bucket = rekap_umur_per_sales(buku, per_tanggal)
+        top_10_ar = top_piutang(buku, 10, per_tanggal)
+    finally:
+        buku.close()
+    buckets = LABEL_UMUR
     pivot_bucket['TOTAL'] = pivot_bucket.sum(axis=1)
-    
-    top_10_ar = df_ar_final.sort_values('Sisa Piutang', ascending=False).head(10)
 
     # =========================================================================
     # WRITING TO EXCEL
@@ -194,7 +262,8 @@ def run_analyst_v3():
     output_file = f"Laporan_Analisis_Sales_V3_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
     print(f"6. Menyimpan Laporan: {output_file}...")
     
-    writer = pd.ExcelWriter(output_file, engine='xlsxwriter')
+    # constant_memory: rincian piutang bisa ratusan ribu baris, tiap baris langsung di-flush
+    writer = pd.ExcelWriter(output_file, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}})
     wb = writer.book
     
     # Styles
@@ -208,49 +277,46 @@ def run_analyst_v3():
     # --- SHEET 1: DASHBOARD ---
     ws1 = wb.add_worksheet('Dashboard')
     ws1.set_column('A:B', 22)
-    ws1.set_column('D:E', 22)
-    
-    ws1.write('A1', 'KPI DASHBOARD', fmt_head)
-    ws1.write('A2', 'Total Omzet', fmt_head)
-    ws1.write('B2', total_omzet, fmt_curr)
-    ws1.write('A3', 'Total Transaksi', fmt_head)
-    ws1.write('B3', total_transaksi, fmt_num)
-    
-    ws1.write('D1', 'REALISASI & FORECAST', fmt_head)
-    ws1.write('D2', 'Tanggal', fmt_head)
-    ws1.write('E2', 'Realisasi', fmt_head)
-    ws1.write('F2', 'Forecast', fmt_head)
-    
-    row_idx = 2
-    for i, r in daily_sales.iterrows():
-        ws1.write(row_idx, 3, r['Tanggal'], fmt_date)
-        ws1.write(row_idx, 4, r['Netto'], fmt_curr)
-        row_idx += 1
-    
-    for i, r in df_forecast.iterrows():
-        ws1.write(row_idx, 3, r['Tanggal'], fmt_date)
-        ws1.write(row_idx, 5, r['Prediksi'], fmt_curr)
-        row_idx += 1
+    ws1.set_column('D:H', 22)
+    
+    row_idx = 2 + len(daily_sales)
+    blok_dashboard = [
+        header(0, 0, ['KPI DASHBOARD'], fmt_head),
+        blok(1, 0, [['Total Omzet', 'Total Transaksi']], fmt_head),
+        blok(1, 1, [[total_omzet]], fmt_curr),
+        blok(2, 1, [[total_transaksi]], fmt_num),
+        header(0, 3, ['REALISASI & FORECAST'], fmt_head),
+        header(1, 3, ['Tanggal', 'Realisasi', 'Forecast', 'Batas Bawah', 'Batas Atas'], fmt_head),
+        blok(2, 3, [daily_sales['Tanggal'], daily_sales['Netto']], [fmt_date, fmt_curr]),
+    ]
+    if len(df_forecast):
+        blok_dashboard.append(blok(row_idx, 3, [df_forecast['Tanggal']], fmt_date))
+        blok_dashboard.append(blok(row_idx, 5, df_forecast[['Prediksi', 'Batas Bawah', 'Batas Atas']], fmt_curr))
+        row_idx += len(df_forecast)
+    tulis_blok(ws1, blok_dashboard)
         
     chart1 = wb.add_chart({'type': 'line'})
     chart1.add_series({'name': 'Realisasi', 'categories': ['Dashboard', 2, 3, row_idx-1, 3], 'values': ['Dashboard', 2, 4, row_idx-1, 4], 'line': {'color': 'blue'}})
     chart1.add_series({'name': 'Forecast', 'categories': ['Dashboard', 2, 3, row_idx-1, 3], 'values': ['Dashboard', 2, 5, row_idx-1, 5], 'line': {'color': 'red', 'dash_type': 'dash'}})
-    ws1.insert_chart('H2', chart1, {'x_scale': 1.8, 'y_scale': 1.2})
+    chart1.add_series({'name': 'Batas Bawah', 'categories': ['Dashboard', 2, 3, row_idx-1, 3], 'values': ['Dashboard', 2, 6, row_idx-1, 6], 'line': {'color': '#F1948A', 'dash_type': 'round_dot'}})
+    chart1.add_series({'name': 'Batas Atas', 'categories': ['Dashboard', 2, 3, row_idx-1, 3], 'values': ['Dashboard', 2, 7, row_idx-1, 7], 'line': {'color': '#F1948A', 'dash_type': 'round_dot'}})
+    ws1.insert_chart('J2', chart1, {'x_scale': 1.8, 'y_scale': 1.2})
 
     # --- SHEET 2: ANALISIS PASAR ---
     ws2 = wb.add_worksheet('Analisis Pasar')
     ws2.set_column('A:B', 25)
     ws2.set_column('E:F', 22) # Kolom untuk Jalan
     
-    ws2.write('A1', 'SEGMENTASI PELANGGAN', fmt_head)
-    ws2.write('A2', 'Segmen', fmt_head)
-    ws2.write('B2', 'Omzet', fmt_head)
-    
-    r_seg = 2
-    for i, row in segment_value.iterrows():
-        ws2.write(r_seg, 0, row['Segmen'], fmt_num)
-        ws2.write(r_seg, 1, row['Netto'], fmt_curr)
-        r_seg += 1
+    r_seg = 2 + len(segment_value)
+    tulis_blok(ws2, [
+        header(0, 0, ['SEGMENTASI PELANGGAN'], fmt_head),
+        header(1, 0, ['Segmen', 'Omzet'], fmt_head),
+        blok(2, 0, [segment_value['Segmen'], segment_value['Netto']], [fmt_num, fmt_curr]),
+        # --- RESTORED: TABEL JALAN ---
+        header(0, 4, ['TOP 10 AREA (JALAN)'], fmt_head),
+        header(1, 4, ['Nama Jalan', 'Total Omzet'], fmt_head),
+        blok(2, 4, [geo_sales['Jalan'], geo_sales['Netto']], [fmt_num, fmt_curr]),
+    ])
         
     chart2 = wb.add_chart({'type': 'pie'})
     chart2.add_series({
@@ -261,17 +327,6 @@ def run_analyst_v3():
     })
     ws2.insert_chart('A15', chart2)
     
-    # --- RESTORED: TABEL JALAN ---
-    ws2.write('E1', 'TOP 10 AREA (JALAN)', fmt_head)
-    ws2.write('E2', 'Nama Jalan', fmt_head)
-    ws2.write('F2', 'Total Omzet', fmt_head)
-    
-    r_geo = 2
-    for i, row in geo_sales.iterrows():
-        ws2.write(r_geo, 4, row['Jalan'], fmt_num)
-        ws2.write(r_geo, 5, row['Netto'], fmt_curr)
-        r_geo += 1
-        
     ws2.merge_range('E15:H18', rekomendasi_txt, fmt_txt_wrap)
 
     # --- SHEET 3: EVALUASI TIM ---
@@ -279,16 +334,11 @@ def run_analyst_v3():
     ws3.set_column('A:H', 18)
     
     headers = ['Salesman', 'Target', 'Realisasi', 'Ach %', 'Rate Bonus', 'Total Bonus (Rp)', 'Avg Diskon']
-    for i, h in enumerate(headers): ws3.write(0, i, h, fmt_head)
-        
-    for i, row in df_kpi_team.iterrows():
-        ws3.write(i+1, 0, row['Nama Sales'], fmt_num)
-        ws3.write(i+1, 1, row['Target'], fmt_curr)
-        ws3.write(i+1, 2, row['Realisasi'], fmt_curr)
-        ws3.write(i+1, 3, row['Ach %'], fmt_pct)
-        ws3.write(i+1, 4, row['Rate Bonus'], fmt_num)
-        ws3.write(i+1, 5, row['Total Bonus (Rp)'], fmt_curr)
-        ws3.write(i+1, 6, row['Avg Diskon'], fmt_pct)
+    blok_tim = [header(0, 0, headers, fmt_head)]
+    if len(df_kpi_team):
+        kolom_kpi = ['Nama Sales', 'Target', 'Realisasi', 'Ach %', 'Rate Bonus', 'Total Bonus (Rp)', 'Avg Diskon']
+        blok_tim.append(blok(1, 0, df_kpi_team[kolom_kpi], [fmt_num, fmt_curr, fmt_curr, fmt_pct, fmt_num, fmt_curr, fmt_pct]))
+    tulis_blok(ws3, blok_tim)
     
     # --- RESTORED: CHART TARGET VS REALISASI ---
     chart3 = wb.add_chart({'type': 'column'})
@@ -312,32 +362,24 @@ def run_analyst_v3():
     ws4.set_column('B:E', 18)
     ws4.set_column('F:F', 20)
     
-    ws4.write('A1', 'REKAP PIUTANG PER SALES', fmt_head)
-    ws4.write('A2', 'Nama Sales', fmt_head)
-    ws4.write('B2', 'Belum JT (-30 s/d 0)', fmt_head)
-    ws4.write('C2', '1 s/d 31 Hari', fmt_head)
-    ws4.write('D2', '32 s/d 60 Hari', fmt_head)
-    ws4.write('E2', '> 60 Hari (Macet)', fmt_head)
-    ws4.write('F2', 'TOTAL PIUTANG', fmt_head)
-    
-    r_piv = 2
-    for sales, row in pivot_bucket.iterrows():
-        ws4.write(r_piv, 0, sales, fmt_num)
-        ws4.write(r_piv, 1, row['-30 Hari - 0 Hari (Belum JT)'], fmt_curr)
-        ws4.write(r_piv, 2, row['1 Hari - 31 Hari'], fmt_curr)
-        ws4.write(r_piv, 3, row['32 Hari - 60 Hari'], fmt_curr)
-        ws4.write(r_piv, 4, row['> 60 Hari (Macet)'], fmt_curr)
-        ws4.write(r_piv, 5, row['TOTAL'], fmt_curr)
-        r_piv += 1
-        
     total_buckets = pivot_bucket[buckets].sum()
-    ws4.write('H2', 'Kategori', fmt_head)
-    ws4.write('I2', 'Total Nilai', fmt_head)
-    r_h = 2
-    for cat, val in total_buckets.items():
-        ws4.write(r_h, 7, cat, fmt_num)
-        ws4.write(r_h, 8, val, fmt_curr)
-        r_h += 1
+    r_h = 2 + len(total_buckets)
+    r_top = 16 + len(top_10_ar)
+    start_row = r_top + 5
+    tulis_blok(ws4, [
+        header(0, 0, ['REKAP PIUTANG PER SALES'], fmt_head),
+        header(1, 0, ['Nama Sales', 'Belum JT (-30 s/d 0)', '1 s/d 31 Hari', '32 s/d 60 Hari', '> 60 Hari (Macet)', 'TOTAL PIUTANG'], fmt_head),
+        blok(2, 0, [pivot_bucket.index] + [pivot_bucket[b] for b in buckets] + [pivot_bucket['TOTAL']], [fmt_num] + [fmt_curr] * 5),
+        header(1, 7, ['Kategori', 'Total Nilai'], fmt_head),
+        blok(2, 7, [total_buckets.index, total_buckets], [fmt_num, fmt_curr]),
+        header(14, 0, ['TOP 10 FAKTUR PIUTANG TERTINGGI'], fmt_head),
+        header(15, 0, ['No Faktur', 'Tanggal', 'Customer', 'Sales', 'Sisa Piutang', 'Umur (Hari)'], fmt_head),
+        blok(16, 0, top_10_ar[['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Sisa Piutang', 'Umur Hari']],
+             [fmt_num, fmt_date, fmt_num, fmt_num, fmt_curr, fmt_num]),
+        header(start_row, 0, ['RINCIAN LENGKAP SEMUA PIUTANG'], fmt_head),
+        header(start_row + 1, 0, KOLOM_DETAIL, fmt_head),
+        blok(start_row + 2, 0, df_ar_final[KOLOM_DETAIL], [fmt_num, fmt_date, fmt_num, fmt_num, fmt_curr, fmt_curr, fmt_curr, fmt_num]),
+    ])
         
     chart_ar = wb.add_chart({'type': 'pie'})
     chart_ar.add_series({
@@ -347,46 +389,94 @@ def run_analyst_v3():
         'data_labels': {'percentage': True, 'category_name': True, 'leader_lines': True, 'separator': '\n'}
     })
     ws4.insert_chart('H10', chart_ar)
-    
-    ws4.write('A15', 'TOP 10 FAKTUR PIUTANG TERTINGGI', fmt_head)
-    ws4.write('A16', 'No Faktur', fmt_head)
-    ws4.write('B16', 'Tanggal', fmt_head)
-    ws4.write('C16', 'Customer', fmt_head)
-    ws4.write('D16', 'Sales', fmt_head)
-    ws4.write('E16', 'Sisa Piutang', fmt_head)
-    ws4.write('F16', 'Umur (Hari)', fmt_head)
-    
-    r_top = 16
-    for i, row in top_10_ar.iterrows():
-        ws4.write(r_top, 0, row['No. Faktur'], fmt_num)
-        ws4.write(r_top, 1, row['Tanggal'], fmt_date)
-        ws4.write(r_top, 2, row['Nama Pelanggan'], fmt_num)
-        ws4.write(r_top, 3, row['Nama Sales'], fmt_num)
-        ws4.write(r_top, 4, row['Sisa Piutang'], fmt_curr)
-        ws4.write(r_top, 5, row['Umur Hari'], fmt_num)
-        r_top += 1
 
-    start_row = r_top + 5
-    ws4.write(start_row, 0, 'RINCIAN LENGKAP SEMUA PIUTANG', fmt_head)
-    cols_detail = ['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Tagihan Awal', 'Jumlah Bayar', 'Sisa Piutang', 'Kategori']
-    for i, c in enumerate(cols_detail): ws4.write(start_row+1, i, c, fmt_head)
-        
-    r_det = start_row + 2
-    for i, row in df_ar_final.iterrows():
-        ws4.write(r_det, 0, row['No. Faktur'], fmt_num)
-        ws4.write(r_det, 1, row['Tanggal'], fmt_date)
-        ws4.write(r_det, 2, row['Nama Pelanggan'], fmt_num)
-        ws4.write(r_det, 3, row['Nama Sales'], fmt_num)
-        ws4.write(r_det, 4, row['Tagihan Awal'], fmt_curr)
-        ws4.write(r_det, 5, row['Jumlah Bayar'], fmt_curr)
-        ws4.write(r_det, 6, row['Sisa Piutang'], fmt_curr)
-        ws4.write(r_det, 7, row['Kategori'], fmt_num)
-        r_det += 1
+    # --- SHEET 5: FORECAST (SEMUA SERI) ---
+    ws5 = wb.add_worksheet('Forecast')
+    ws5.set_column('A:B', 22)
+    ws5.set_column('C:F', 18)
+    tulis_blok(ws5, [
+        header(0, 0, [f'FORECAST {HORIZON_RAMALAN} HARI (INTERVAL 95%)'], fmt_head),
+        header(1, 0, ['Grup', 'Seri', 'Tanggal', 'Prediksi', 'Batas Bawah', 'Batas Atas'], fmt_head),
+        blok(2, 0, df_ramalan, [fmt_num, fmt_num, fmt_date, fmt_curr, fmt_curr, fmt_curr]),
+    ])
 
     writer.close()
     print("==========================================")
     print(f"LAPORAN SALES V3 SELESAI. File: {output_file}")
     print("==========================================")
 
+# --- BENCHMARK PENULISAN RINCIAN PIUTANG ---
+
+def _buat_detail_dummy(jumlah_baris, seed):
+    rng = np.random.default_rng(seed)
+    tagihan = rng.integers(10, 5000, jumlah_baris) * 1000
+    bayar = (tagihan * rng.uniform(0, 0.9, jumlah_baris)).astype('int64')
+    return pd.DataFrame({
+        'No. Faktur': [f"INV/2025/{i:07d}" for i in range(jumlah_baris)],
+        'Tanggal': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 120, jumlah_baris), unit='D'),
+        'Nama Pelanggan': rng.choice([f"Toko Pelanggan {i}" for i in range(2000)], jumlah_baris),
+        'Nama Sales': rng.choice(["Sales 1", "Sales 2", "Sales 3"], jumlah_baris),
+        'Tagihan Awal': tagihan, 'Jumlah Bayar': bayar, 'Sisa Piutang': tagihan - bayar,
+        'Kategori': pd.Categorical(rng.choice(LABEL_UMUR, jumlah_baris), categories=LABEL_UMUR),
+    })
+
+def _tulis_detail_loop(ws, df, start_row, fmt):
+    """Cara lama (iterrows + satu ws.write per sel), disimpan sebagai pembanding benchmark."""
+    r_det = start_row
+    for i, row in df.iterrows():
+        ws.write(r_det, 0, row['No. Faktur'], fmt['num'])
+        ws.write(r_det, 1, row['Tanggal'], fmt['date'])
+        ws.write(r_det, 2, row['Nama Pelanggan'], fmt['num'])
+        ws.write(r_det, 3, row['Nama Sales'], fmt['num'])
+        ws.write(r_det, 4, row['Tagihan Awal'], fmt['curr'])
+        ws.write(r_det, 5, row['Jumlah Bayar'], fmt['curr'])
+        ws.write(r_det, 6, row['Sisa Piutang'], fmt['curr'])
+        ws.write(r_det, 7, row['Kategori'], fmt['num'])
+        r_det += 1
+
+def _ukur_tulis_detail(jumlah_baris, seed, mode, nama_file):
+    """Dijalankan di proses terpisah agar RSS puncak tiap mode tidak tercampur."""
+    import resource
+    df = _buat_detail_dummy(jumlah_baris, seed)
+    rss_awal = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    waktu_mulai = time.perf_counter()
+    wb = xlsxwriter.Workbook(nama_file, {'constant_memory': mode == 'blok'})
+    fmt = {
+        'num': wb.add_format({'num_format': '#,##0', 'border': 1}),
+        'curr': wb.add_format({'num_format': 'Rp #,##0', 'border': 1}),
+        'date': wb.add_format({'num_format': 'dd-mm-yyyy', 'border': 1, 'align': 'center'}),
+    }
+    ws = wb.add_worksheet('Piutang (AR)')
+    if mode == 'blok':
+        tulis_blok(ws, [blok(0, 0, df[KOLOM_DETAIL], [fmt['num'], fmt['date'], fmt['num'], fmt['num'], fmt['curr'], fmt['curr'], fmt['curr'], fmt['num']])])
+    else:
+        _tulis_detail_loop(ws, df, 0, fmt)
+    wb.close()
+    durasi = time.perf_counter() - waktu_mulai
+    # ru_maxrss dalam KB di Linux
+    return durasi, rss_awal / 1024, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def benchmark_tulis_detail(jumlah_baris, seed=2025):
+    """Membandingkan penulisan rincian piutang: loop per sel lama vs blok + constant_memory."""
+    import multiprocessing, tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"--> Benchmark penulisan rincian piutang: {jumlah_baris} faktur x {len(KOLOM_DETAIL)} kolom")
+    with tempfile.TemporaryDirectory() as folder:
+        for mode in ('loop', 'blok'):
+            nama_file = os.path.join(folder, f"benchmark_{mode}.xlsx")
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                durasi, rss_awal, rss_puncak = pool.submit(_ukur_tulis_detail, jumlah_baris, seed, mode, nama_file).result()
+            print(f"--> {mode:<5}: {durasi:7.2f} detik ({jumlah_baris / durasi:,.0f} baris/detik), "
+                  f"RSS puncak {rss_puncak:,.0f} MB (+{rss_puncak - rss_awal:,.0f} MB saat menulis)")
+
 if __name__ == "__main__":
-    run_analyst_v3()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analisa sales V3 dari file Data V9 terbaru.")
+    parser.add_argument('--per-tanggal', help="tanggal acuan umur piutang (YYYY-MM-DD), default hari ini")
+    parser.add_argument('--benchmark-tulis', type=int, metavar='FAKTUR',
+                        help="bandingkan penulisan rincian piutang (loop per sel vs blok) untuk sejumlah faktur dummy")
+    args = parser.parse_args()
+    if args.benchmark_tulis:
+        benchmark_tulis_detail(args.benchmark_tulis)
+    else:
+        run_analyst_v3(args.per_tanggal)
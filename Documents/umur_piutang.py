@@ -0,0 +1,96 @@
+import os
+import numpy as np
+import pandas as pd
+
+# --- KATEGORI UMUR PIUTANG ---
+# Umur hari dimasukkan ke bucket (batas bawah, batas atas]; ubah kedua daftar ini untuk bucket lain.
+BATAS_UMUR = [-np.inf, 0, 31, 60, np.inf]
+LABEL_UMUR = ["-30 Hari - 0 Hari (Belum JT)", "1 Hari - 31 Hari", "32 Hari - 60 Hari", "> 60 Hari (Macet)"]
+
+def hari_ini():
+    return pd.Timestamp.today().normalize()
+
+def hitung_umur(tanggal, per_tanggal):
+    """Umur hari tiap faktur per tanggal acuan (vektor); tanggal kosong dianggap umur 0."""
+    tanggal = pd.to_datetime(tanggal)
+    return (pd.Timestamp(per_tanggal) - tanggal).dt.days.fillna(0).astype('int64')
+
+def kategori_umur(umur_hari, batas=BATAS_UMUR, label=LABEL_UMUR):
+    return pd.cut(umur_hari, bins=batas, labels=label)
+
+def hitung_aging(df, per_tanggal=None, kolom_tanggal='Tanggal', batas=BATAS_UMUR, label=LABEL_UMUR):
+    """Menambah kolom 'Umur Hari' dan 'Kategori' ke salinan df, per tanggal acuan tetap
+    (default: hari ini). Tanggal acuan yang sama selalu memberi hasil yang sama.
+
+    Umur hanya bergantung pada tanggal faktur, jadi dihitung sekali per tanggal unik lalu
+    dipetakan balik ke tiap baris.
+    """
+    per_tanggal = pd.Timestamp(per_tanggal) if per_tanggal is not None else hari_ini()
+    df = df.copy()
+    df[kolom_tanggal] = pd.to_datetime(df[kolom_tanggal])
+    kode, tanggal_unik = pd.factorize(df[kolom_tanggal], use_na_sentinel=False)
+    umur_unik = hitung_umur(pd.Series(tanggal_unik), per_tanggal)
+    df['Umur Hari'] = umur_unik.to_numpy()[kode]
+    df['Kategori'] = pd.Categorical.from_codes(kategori_umur(umur_unik, batas, label).cat.codes.to_numpy()[kode],
+                                               dtype=pd.CategoricalDtype(label, ordered=True))
+    df.attrs['per_tanggal'] = per_tanggal.isoformat()
+    return df
+
+# --- MODE HARIAN (INKREMENTAL) ---
+# Snapshot aging kemarin (mis. buku piutang tersimpan) tidak perlu dihitung ulang: umur cukup
+# digeser sejumlah selisih hari dan hanya faktur yang melewati batas bucket yang dikategorikan
+# ulang. Faktur baru dihitung sendiri lalu ditambahkan; faktur lunas dibuang oleh pemanggil.
+
+def geser_aging(snapshot, per_tanggal, kolom_tanggal='Tanggal', batas=BATAS_UMUR, label=LABEL_UMUR):
+    """Menggeser snapshot hasil hitung_aging ke tanggal acuan yang lebih baru (tanggal kosong tetap umur 0)."""
+    per_tanggal = pd.Timestamp(per_tanggal)
+    selisih = (per_tanggal - pd.Timestamp(snapshot.attrs['per_tanggal'])).days
+    if selisih < 0:
+        raise ValueError("Tanggal acuan lebih lama dari snapshot, hitung ulang dengan hitung_aging.")
+
+    hasil = snapshot.copy()
+    umur_lama = snapshot['Umur Hari'].to_numpy()
+    umur_baru = np.where(snapshot[kolom_tanggal].isna().to_numpy(), umur_lama, umur_lama + selisih)
+    lewat = np.zeros(len(hasil), dtype=bool)
+    for b in batas[1:-1]:
+        lewat |= (umur_lama <= b) & (umur_baru > b)
+
+    kode = pd.Categorical(snapshot['Kategori'], categories=label).codes.copy()
+    kode[lewat] = kategori_umur(umur_baru[lewat], batas, label).codes
+    hasil['Umur Hari'] = umur_baru
+    hasil['Kategori'] = pd.Categorical.from_codes(kode, dtype=pd.CategoricalDtype(label, ordered=True))
+    hasil.attrs['per_tanggal'] = per_tanggal.isoformat()
+    return hasil
+
+def perbarui_aging(snapshot, per_tanggal=None, baru=None, kolom_tanggal='Tanggal', batas=BATAS_UMUR, label=LABEL_UMUR):
+    """Mode harian: snapshot (hasil hitung_aging/perbarui_aging sebelumnya) digeser ke per_tanggal,
+    lalu baris baru diaging dan ditambahkan. Hasil sama dengan hitung_aging atas gabungannya."""
+    per_tanggal = pd.Timestamp(per_tanggal) if per_tanggal is not None else hari_ini()
+    hasil = geser_aging(snapshot, per_tanggal, kolom_tanggal, batas, label)
+    if baru is not None and len(baru):
+        hasil = pd.concat([hasil, hitung_aging(baru, per_tanggal, kolom_tanggal, batas, label)], ignore_index=True)
+        hasil.attrs['per_tanggal'] = per_tanggal.isoformat()
+    return hasil
+
+def path_snapshot(file_data):
+    return os.path.splitext(file_data)[0] + '.umur_piutang.parquet'
+
+def muat_snapshot(file_data):
+    """Snapshot aging terakhir untuk file data, atau None jika belum ada / tidak terbaca."""
+    path = path_snapshot(file_data)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"--> Snapshot umur piutang tidak bisa dibaca, dihitung ulang: {e}")
+        return None
+
+def simpan_snapshot(file_data, df_aging):
+    """Menyimpan hasil aging; tanggal acuan (attrs) ikut tersimpan di metadata Parquet."""
+    path = path_snapshot(file_data)
+    try:
+        df_aging.reset_index(drop=True).to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"--> Snapshot umur piutang gagal ditulis: {e}")
@@ -0,0 +1,145 @@
+"""Mode harian rincian piutang (snapshot aging + baris buku yang berubah) harus sama dengan
+piutang_terbuka yang dihitung penuh dari buku, dan buku harus disusun ulang bila baris lama berubah."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Documents'))
+
+import buku_piutang as bp  # noqa: E402
+from umur_piutang import muat_snapshot, simpan_snapshot  # noqa: E402
+
+JUMLAH_JUAL, JUMLAH_SALDO, JUMLAH_BAYAR = 3000, 200, 2000
+
+
+def buat_data(seed=7):
+    rng = np.random.default_rng(seed)
+    pelanggan = np.array([f"Toko {i}" for i in range(150)], dtype=object)
+    sales = np.array(["Sales 1", "Sales 2", "Sales 3"], dtype=object)
+    jual = pd.DataFrame({
+        'No. Faktur': [f"INV/{i}" for i in range(JUMLAH_JUAL)],
+        'Tanggal': pd.Timestamp('2025-03-01') + pd.to_timedelta(np.sort(rng.integers(0, 28, JUMLAH_JUAL)), unit='D'),
+        'Nama Pelanggan': rng.choice(pelanggan, JUMLAH_JUAL),
+        'Nama Sales': rng.choice(sales, JUMLAH_JUAL),
+        'Netto': rng.integers(1, 200, JUMLAH_JUAL) * 5000,
+    })
+    # Nomor faktur lama sengaja bentrok (dua pelanggan dengan No. Faktur sama)
+    saldo = pd.DataFrame({
+        'No. Faktur Lama': [f"OLD/{i}" for i in rng.integers(0, 150, JUMLAH_SALDO)],
+        'Tanggal Faktur': pd.Timestamp('2025-02-28') - pd.to_timedelta(rng.integers(1, 80, JUMLAH_SALDO), unit='D'),
+        'Nama Pelanggan': rng.choice(pelanggan, JUMLAH_SALDO),
+        'Nama Sales': rng.choice(sales, JUMLAH_SALDO),
+        'Sisa Piutang': rng.integers(5, 150, JUMLAH_SALDO) * 50000,
+    })
+    # Pembayaran penuh, sebagian, dan untuk faktur yang baru muncul belakangan
+    sumber = rng.integers(0, JUMLAH_JUAL, JUMLAH_BAYAR)
+    bayar = pd.DataFrame({
+        'No. Faktur': np.concatenate([jual['No. Faktur'].to_numpy()[sumber[:-100]],
+                                      saldo['No. Faktur Lama'].to_numpy()[rng.integers(0, JUMLAH_SALDO, 100)]]),
+        'Jumlah Bayar': np.concatenate([jual['Netto'].to_numpy()[sumber[:-100]] // rng.choice([1, 2], JUMLAH_BAYAR - 100),
+                                        rng.integers(1, 100, 100) * 50000]),
+    })
+    return {'Penjualan': jual, 'Saldo Awal': saldo, 'Pembayaran': bayar.sample(frac=1, random_state=seed, ignore_index=True)}
+
+
+def potong(data, porsi):
+    return {sheet: df.iloc[:int(len(df) * porsi)] for sheet, df in data.items()}
+
+
+def satuan_tanggal(data, unit):
+    return {sheet: df.astype({k: f'datetime64[{unit}]' for k in df.columns if pd.api.types.is_datetime64_any_dtype(df[k])})
+            for sheet, df in data.items()}
+
+
+def rincian_lama(data):
+    """Cara laporan lama: semua baris tagihan, dikurangi total pembayaran per No. Faktur."""
+    lama = data['Saldo Awal'].set_axis(['No. Faktur', 'Tanggal', 'Nama Pelanggan', 'Nama Sales', 'Tagihan Awal'], axis=1)
+    baru = data['Penjualan'].set_axis(lama.columns, axis=1)
+    bayar = data['Pembayaran'].groupby('No. Faktur')['Jumlah Bayar'].sum()
+    df = pd.concat([lama, baru], ignore_index=True)
+    df['Sisa Piutang'] = df['Tagihan Awal'] - df['No. Faktur'].map(bayar).fillna(0).astype('int64')
+    return df[df['Sisa Piutang'] > bp.BATAS_LUNAS].reset_index(drop=True)
+
+
+@pytest.fixture
+def file_data(tmp_path):
+    return str(tmp_path / 'Data_V9_Test.xlsx')
+
+
+def test_rincian_sama_dengan_cara_lama(file_data):
+    data = buat_data()
+    conn = bp.buka_buku(file_data)
+    bp.perbarui_buku(conn, potong(data, 0.5))
+    bp.perbarui_buku(conn, data)
+    df = bp.piutang_terbuka(conn, '2025-04-01')
+    lama = rincian_lama(data)
+    assert df['No. Faktur'].tolist() == lama['No. Faktur'].tolist()
+    assert df['Nama Pelanggan'].tolist() == lama['Nama Pelanggan'].tolist()
+    assert df['Sisa Piutang'].tolist() == lama['Sisa Piutang'].tolist()
+    assert len(bp.faktur_ganda(conn)) > 0
+
+
+def test_mode_harian_sama_dengan_hitung_penuh(file_data, capsys):
+    data = buat_data()
+    conn = bp.buka_buku(file_data)
+    langkah = [(0.3, '2025-03-10'), (0.5, '2025-03-10'), (0.6, '2025-03-31'), (0.9, '2025-04-02'), (1.0, '2025-05-15'),
+               (1.0, '2025-05-15')]
+    for porsi, per_tanggal in langkah:
+        bp.perbarui_buku(conn, potong(data, porsi))
+        harian = bp.piutang_terbuka_harian(conn, muat_snapshot(file_data), per_tanggal)
+        pd.testing.assert_frame_equal(harian, bp.piutang_terbuka(conn, per_tanggal))
+        simpan_snapshot(file_data, harian)
+    # Hanya run pertama yang dihitung penuh, sisanya memakai snapshot
+    assert capsys.readouterr().out.count("dari snapshot") == len(langkah) - 1
+    assert muat_snapshot(file_data).attrs['versi_buku'] == bp.versi_buku(conn)[1]
+
+
+def test_snapshot_tidak_berlaku_dihitung_penuh(file_data, capsys):
+    data = buat_data()
+    conn = bp.buka_buku(file_data)
+    bp.perbarui_buku(conn, potong(data, 0.8))
+    simpan_snapshot(file_data, bp.piutang_terbuka(conn, '2025-04-01'))
+    snapshot = muat_snapshot(file_data)
+
+    # Tanggal acuan mundur
+    capsys.readouterr()
+    bp.piutang_terbuka_harian(conn, snapshot, '2025-03-20')
+    assert "dihitung penuh" in capsys.readouterr().out
+
+    # Baris lama berubah -> buku disusun ulang dengan id baru, snapshot lama tidak terpakai
+    diubah = {sheet: df.copy() for sheet, df in potong(data, 0.8).items()}
+    diubah['Penjualan'].loc[diubah['Penjualan'].index[1234], 'Netto'] += 5000
+    bp.perbarui_buku(conn, diubah)
+    assert "disusun ulang" in capsys.readouterr().out
+    harian = bp.piutang_terbuka_harian(conn, snapshot, '2025-04-02')
+    assert "dihitung penuh" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(harian, bp.piutang_terbuka(conn, '2025-04-02'))
+
+
+def test_buku_baru_tidak_memakai_snapshot_buku_lama(file_data, capsys):
+    data = buat_data()
+    conn = bp.buka_buku(file_data)
+    bp.perbarui_buku(conn, data)
+    snapshot = bp.piutang_terbuka(conn, '2025-04-01')
+    conn.close()
+    os.remove(bp.path_buku(file_data))
+
+    conn = bp.buka_buku(file_data)
+    bp.perbarui_buku(conn, potong(data, 0.5))
+    capsys.readouterr()
+    bp.piutang_terbuka_harian(conn, snapshot, '2025-04-01')
+    assert "dihitung penuh" in capsys.readouterr().out
+
+
+def test_satuan_tanggal_berbeda_tidak_menyusun_ulang(file_data, capsys):
+    data = buat_data()
+    conn = bp.buka_buku(file_data)
+    # Excel (calamine) memberi datetime64[us], salinan Parquet datetime64[ns]
+    bp.perbarui_buku(conn, satuan_tanggal(data, 'us'))
+    capsys.readouterr()
+    diterapkan = bp.perbarui_buku(conn, satuan_tanggal(data, 'ns'))
+    assert "disusun ulang" not in capsys.readouterr().out
+    assert diterapkan == {sheet: 0 for sheet in diterapkan}
@@ -0,0 +1,44 @@
+"""Entri cache agregat yang tidak bisa dimuat, apa pun jenis errornya, harus dianggap meleset."""
+import os
+import pickle
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Documents'))
+
+import cache_agregat as ca  # noqa: E402
+
+NILAI = {'Netto': 'sum'}
+
+
+@pytest.fixture
+def data(tmp_path):
+    file_data = tmp_path / 'Data_V9_Test.xlsx'
+    file_data.write_bytes(b'isi file data')
+    df = pd.DataFrame({'Nama Sales': ['Sales 1', 'Sales 2', 'Sales 1'], 'Netto': [100, 200, 300]})
+    return str(file_data), df
+
+
+def path_entri(file_data):
+    return os.path.join(ca.folder_cache(file_data), ca.kunci_agregat(file_data, 'Penjualan', 'Nama Sales', NILAI) + '.pkl')
+
+
+@pytest.mark.parametrize('isi', [
+    b'',                                                     # EOFError
+    b'bukan pickle',                                         # UnpicklingError
+    pickle.dumps(pd.DataFrame()).replace(b'pandas', b'pandaz'),  # ModuleNotFoundError
+    b'\x80\x04\x95\x10\x00\x00\x00\x00\x00\x00\x00\x8c\x08builtins\x94\x8c\x03tak\x94\x93\x94.',  # AttributeError
+])
+def test_entri_rusak_dihitung_ulang(data, isi):
+    file_data, df = data
+    harapan = df.groupby('Nama Sales').agg(NILAI)
+    pd.testing.assert_frame_equal(ca.agregat(file_data, 'Penjualan', 'Nama Sales', NILAI, df=df), harapan)
+
+    with open(path_entri(file_data), 'wb') as f:
+        f.write(isi)
+    pd.testing.assert_frame_equal(ca.agregat(file_data, 'Penjualan', 'Nama Sales', NILAI, df=df), harapan)
+    # Entri rusak sudah diganti hasil baru yang terbaca
+    with open(path_entri(file_data), 'rb') as f:
+        pd.testing.assert_frame_equal(pickle.load(f), harapan)
@@ -0,0 +1,106 @@
+"""Generator vektor (generate_saldo / generate_pembayaran) harus menghasilkan distribusi
+yang sama dengan versi loop lama pada seed tetap."""
+import os
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Documents'))
+
+from generate_data_dummy import (  # noqa: E402
+    DAFTAR_BARANG, KATEGORI_AGING, generate_pelanggan, generate_penjualan, generate_pembayaran,
+    generate_pembayaran_loop, generate_saldo, generate_saldo_loop,
+)
+
+TAHUN, BULAN, SEED = 2025, 1, 2025
+JUMLAH_PENJUALAN = 20000
+JUMLAH_PELANGGAN = 5000
+TOLERANSI_PORSI = 0.02  # selisih porsi maksimum antara loop dan vektor (2 poin persen)
+
+
+@pytest.fixture(scope='module')
+def sumber():
+    list_sales = [f"Sales {i + 1}" for i in range(5)]
+    pelanggan_data, pelanggan_sales_map = generate_pelanggan(JUMLAH_PELANGGAN, list_sales, np.random.default_rng(SEED))
+    df_penjualan = generate_penjualan(TAHUN, BULAN, JUMLAH_PENJUALAN, pelanggan_data, pelanggan_sales_map, DAFTAR_BARANG,
+                                      np.random.default_rng(SEED))
+    return list(pelanggan_data), pelanggan_sales_map, df_penjualan
+
+
+@pytest.fixture(scope='module')
+def saldo(sumber):
+    pelanggan, sales_map, _ = sumber
+    return {
+        'loop': generate_saldo_loop(TAHUN, BULAN, pelanggan, sales_map, random.Random(SEED)),
+        'vektor': generate_saldo(TAHUN, BULAN, pelanggan, sales_map, np.random.default_rng(SEED)),
+    }
+
+
+@pytest.fixture(scope='module')
+def pembayaran(sumber, saldo):
+    _, _, df_penjualan = sumber
+    df_saldo = saldo['vektor']
+    return {
+        'loop': generate_pembayaran_loop(TAHUN, BULAN, df_penjualan, df_saldo, random.Random(SEED),
+                                         np.random.default_rng(SEED)),
+        'vektor': generate_pembayaran(TAHUN, BULAN, df_penjualan, df_saldo, np.random.default_rng(SEED)),
+    }
+
+
+def _pisah_sumber(df_bayar, df_saldo):
+    dari_saldo = df_bayar['No. Faktur'].isin(df_saldo['No. Faktur Lama'])
+    return df_bayar[~dari_saldo], df_bayar[dari_saldo]
+
+
+def test_porsi_pembayaran(sumber, saldo, pembayaran):
+    _, _, df_penjualan = sumber
+    porsi = {}
+    for nama, df in pembayaran.items():
+        faktur, dari_saldo = _pisah_sumber(df, saldo['vektor'])
+        porsi[nama] = (len(faktur) / len(df_penjualan), len(dari_saldo) / len(saldo['vektor']))
+    assert porsi['vektor'][0] == pytest.approx(porsi['loop'][0], abs=TOLERANSI_PORSI)
+    assert porsi['vektor'][1] == pytest.approx(porsi['loop'][1], abs=TOLERANSI_PORSI)
+    assert porsi['vektor'][1] == pytest.approx(0.7, abs=0.01)
+
+
+def test_porsi_metode(saldo, pembayaran):
+    for nama, df in pembayaran.items():
+        faktur, dari_saldo = _pisah_sumber(df, saldo['vektor'])
+        assert (faktur['Metode'] == "TRANSFER").mean() == pytest.approx(0.7, abs=TOLERANSI_PORSI), nama
+        assert (dari_saldo['Metode'] == "TRANSFER").mean() == pytest.approx(0.8, abs=TOLERANSI_PORSI), nama
+        assert set(df['Metode']) == {"TRANSFER", "TUNAI"}
+
+
+def test_rentang_hari_bayar(sumber, saldo, pembayaran):
+    _, _, df_penjualan = sumber
+    tanggal_faktur = df_penjualan.set_index('No. Faktur')['Tanggal']
+    rentang = {}
+    for nama, df in pembayaran.items():
+        faktur, dari_saldo = _pisah_sumber(df, saldo['vektor'])
+        selisih = (faktur['Tanggal Bayar'] - faktur['No. Faktur'].map(tanggal_faktur)).dt.days
+        rentang[nama] = (selisih.min(), selisih.max())
+        assert dari_saldo['Tanggal Bayar'].dt.day.between(1, 28).all(), nama
+    assert rentang['vektor'] == rentang['loop'] == (1, 14)
+
+
+def test_cut_off_bulan(pembayaran):
+    for nama, df in pembayaran.items():
+        assert (df['Tanggal Bayar'].dt.month == BULAN).all(), nama
+        assert (df['Tanggal Bayar'].dt.year == TAHUN).all(), nama
+
+
+def test_bucket_aging_saldo(saldo):
+    ref = pd.Timestamp(TAHUN, BULAN, 1)
+    porsi = {}
+    for nama, df in saldo.items():
+        offset = df['Kategori Umur Piutang'].str.split().str[0].astype(int)
+        umur = (ref - df['Tanggal Faktur']).dt.days
+        assert (umur == np.maximum(30 + offset, 1)).all(), nama
+        assert df['Sisa Piutang'].between(5 * 50000, 150 * 50000).all(), nama
+        porsi[nama] = df['Kategori Umur Piutang'].value_counts(normalize=True).reindex(KATEGORI_AGING, fill_value=0)
+    selisih = (porsi['vektor'] - porsi['loop']).abs()
+    assert selisih.max() < TOLERANSI_PORSI + 0.005
+    assert (porsi['vektor'] - 1 / len(KATEGORI_AGING)).abs().max() < TOLERANSI_PORSI
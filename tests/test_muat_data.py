@@ -0,0 +1,46 @@
+"""Sheet yang dibaca dari Excel dan dari salinan Parquet-nya harus menghasilkan DataFrame yang identik."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Documents'))
+
+import muat_data as md  # noqa: E402
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def file_data(tmp_path):
+    rng = np.random.default_rng(3)
+    jumlah = 500
+    df = pd.DataFrame({
+        'Tanggal Bayar': pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 28, jumlah), unit='D'),
+        'Nama Pelanggan': [f"Toko {i}" for i in rng.integers(0, 50, jumlah)],
+        'Nama Sales': rng.choice(["Sales 1", "Sales 2"], jumlah),
+        'No. Faktur': [f"INV/{i}" for i in range(jumlah)],
+        'Jumlah Bayar': rng.integers(1, 200, jumlah) * 5000,
+        'Metode': rng.choice(["TRANSFER", "TUNAI"], jumlah),
+    })
+    path = str(tmp_path / 'Data_V9_Test.xlsx')
+    df.to_excel(path, sheet_name='Pembayaran', index=False)
+    return path
+
+
+def test_excel_sama_dengan_parquet(file_data):
+    assert not md.kolumnar_masih_baru(file_data, 'Pembayaran')
+    dari_excel = md.muat_sheet(file_data, 'Pembayaran')
+    assert md.kolumnar_masih_baru(file_data, 'Pembayaran')
+    dari_parquet = md.muat_sheet(file_data, 'Pembayaran')
+    assert dari_excel['Tanggal Bayar'].dtype == 'datetime64[ns]'
+    pd.testing.assert_frame_equal(dari_excel, dari_parquet)
+
+
+def test_proyeksi_kolom_sama(file_data):
+    kolom = ['No. Faktur', 'Tanggal Bayar', 'Jumlah Bayar']
+    dari_excel = md.muat_sheet(file_data, 'Pembayaran', kolom, tulis_cache=False)
+    md.muat_sheet(file_data, 'Pembayaran')
+    pd.testing.assert_frame_equal(dari_excel, md.muat_sheet(file_data, 'Pembayaran', kolom))